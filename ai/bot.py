@@ -1,5 +1,8 @@
 # ai/bot.py
 import random
+import time
+from collections import defaultdict
+
 import chess
 
 from qlc.rules import Rules
@@ -24,7 +27,7 @@ class Bot:
                 from_sq = rc_to_square(r, c)
 
                 ok = False
-                for br in getattr(board_obj, "branches", []):
+                for br in getattr(board_obj, "iter_branches", tuple)():
                     b = br.board
                     p = b.piece_at(from_sq)
                     if p and p.color == want_color and p.color == b.turn:
@@ -53,4 +56,88 @@ class Bot:
                     return
 
         s, e = self.rng.choice(candidates)
-        board_obj.apply_move(s, e)
\ No newline at end of file
+        board_obj.apply_move(s, e)
+
+    # Search (dipakai engine teks, lihat ai/uci.py)
+    def search(self, qb, movetime=None, max_splits=8):
+        """
+        Pilih action terbaik buat sisi yang jalan di QuantumBoard `qb` tanpa mengubah qb.
+        Tiap kandidat (move, plus beberapa split) dicoba di tempat (qb.push / qb.pop)
+        lalu dinilai pakai evaluate(); berhenti kalau movetime (detik) habis. Return action tuple
+        ("move", from, to) / ("split", from, a, b), atau None kalau gak ada langkah.
+        """
+        deadline = None if movetime is None else time.perf_counter() + movetime
+        candidates = self._candidates(qb, max_splits)
+        if not candidates:
+            return None
+
+        color = qb.turn()
+        best, best_score = candidates[0], None
+        for action in candidates:
+            qb.push(action)
+            try:
+                score = evaluate(qb, color)
+            finally:
+                qb.pop()
+            if best_score is None or score > best_score:
+                best, best_score = action, score
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return best
+
+    def _candidates(self, qb, max_splits):
+        """Move urut massa probabilitas (acak buat yang seri), lalu split non-capture."""
+        mass = qb.legal_moves_distribution()
+        moves = [chess.Move.from_uci(u) for u in mass]
+        self.rng.shuffle(moves)
+        moves.sort(key=lambda mv: -mass[mv.uci()])
+
+        actions = []
+        quiet_by_from = defaultdict(list)
+        board = qb.most_likely_board()
+        for mv in moves:
+            if mv.promotion not in (None, chess.QUEEN):
+                continue
+            actions.append(("move", mv.from_square, mv.to_square))
+            if not board.is_capture(mv) and mv.to_square not in quiet_by_from[mv.from_square]:
+                quiet_by_from[mv.from_square].append(mv.to_square)
+
+        splits = []
+        for from_sq, dests in quiet_by_from.items():
+            if len(dests) >= 2:
+                a, b = self.rng.sample(dests, 2)
+                splits.append(("split", from_sq, a, b))
+        self.rng.shuffle(splits)
+        return actions + splits[:max_splits]
+
+
+PIECE_VALUES = {
+    chess.PAWN: 1.0,
+    chess.KNIGHT: 3.0,
+    chess.BISHOP: 3.2,
+    chess.ROOK: 5.0,
+    chess.QUEEN: 9.0,
+    chess.KING: 100.0,  # raja bisa dimakan di varian ini
+}
+
+
+def evaluate(qb, color):
+    """Material expected (dibobot probabilitas branch) dari sisi `color`; game selesai = +-1000."""
+    status = qb.status
+    if status.over:
+        if status.result == "1/2-1/2":
+            return 0.0
+        white_wins = status.result == "1-0"
+        return 1000.0 if white_wins == (color == chess.WHITE) else -1000.0
+
+    total = 0.0
+    for br in qb.iter_branches():
+        b = br.board
+        p = qb._prob(br.amp)
+        score = 0.0
+        for pt, value in PIECE_VALUES.items():
+            score += value * (
+                chess.popcount(b.pieces_mask(pt, chess.WHITE)) - chess.popcount(b.pieces_mask(pt, chess.BLACK))
+            )
+        total += p * score
+    return total if color == chess.WHITE else -total
@@ -0,0 +1,206 @@
+"""
+Export posisi self-play (headless) jadi dataset training buat model evaluasi.
+
+Tiap sample = posisi SEBELUM satu langkah:
+- branch_planes  u1  (K, 12, 8, 8)  bitplane top-K branch paling mungkin (sisanya nol)
+- branch_probs   f4  (K,)           probabilitas branch tsb (0 buat slot kosong)
+- marginals      f4  (12, 8, 8)     bitplane semua branch dibobot probabilitas
+- side_to_move   u1  ()             1 = putih
+- move           i2  (4,)           [kind, from, to_a, to_b]; kind 0 = move, 1 = split, to_b -1 buat move
+- result         i1  ()             hasil akhir dari sisi putih: 1 / 0 / -1 (game belum selesai = 0)
+
+Urutan plane sama dengan quantum.packed.PLANE_SYMBOLS ("PNBRQKpnbrqk"), dan
+plane[rank][file] = square rank*8+file (rank 0 = rank 1).
+
+Output: shard-NNNNN-<field>.npy (bisa di-load pakai np.load(..., mmap_mode="r"))
+plus index.json. Memori kepakai maksimal satu shard + satu game.
+
+    python -m ai.dataset --games 1000 --out data/selfplay
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ai.bot import Bot
+from quantum.adapter import QuantumBoardAdapter
+from quantum.packed import BRANCH_DTYPE, PLANE_SYMBOLS, probabilities
+
+PLANES = 12
+RESULT_VALUES = {"1-0": 1, "0-1": -1, "1/2-1/2": 0, "*": 0}
+ACTION_KINDS = {"move": 0, "split": 1}
+
+
+def sample_fields(top_k: int) -> Dict[str, tuple]:
+    """Nama field -> (dtype, shape per sample)."""
+    return {
+        "branch_planes": (np.uint8, (top_k, PLANES, 8, 8)),
+        "branch_probs": (np.float32, (top_k,)),
+        "marginals": (np.float32, (PLANES, 8, 8)),
+        "side_to_move": (np.uint8, ()),
+        "move": (np.int16, (4,)),
+        "result": (np.int8, ()),
+    }
+
+
+def bitplanes(recs: np.ndarray) -> np.ndarray:
+    """Record packed -> bitplane (N, 12, 8, 8) u1."""
+    raw = np.ascontiguousarray(recs["pieces"]).astype("<u8").view(np.uint8)
+    bits = np.unpackbits(raw.reshape(len(recs), PLANES, 8), axis=-1, bitorder="little")
+    return bits.reshape(len(recs), PLANES, 8, 8)
+
+
+def encode_position(qb, top_k: int) -> Dict[str, np.ndarray]:
+    """Encode state QuantumBoard (tanpa move/result)."""
+    # Per chunk (SpillingQuantumBoard gak ditarik semua ke RAM): top_k terbaik sejauh ini + marginal berjalan
+    top_recs = np.zeros(0, dtype=BRANCH_DTYPE)
+    marginals = np.zeros((PLANES, 8, 8), dtype=np.float64)
+    for chunk in qb.packed_chunks():
+        probs = probabilities(chunk)
+        marginals += np.tensordot(probs, bitplanes(chunk), axes=1)
+        top_recs = np.concatenate([top_recs, chunk[np.argsort(-probs, kind="stable")[:top_k]]])
+        top_recs = top_recs[np.argsort(-probabilities(top_recs), kind="stable")[:top_k]]
+
+    branch_planes = np.zeros((top_k, PLANES, 8, 8), dtype=np.uint8)
+    branch_probs = np.zeros(top_k, dtype=np.float32)
+    branch_planes[: len(top_recs)] = bitplanes(top_recs)
+    branch_probs[: len(top_recs)] = probabilities(top_recs)
+
+    return {
+        "branch_planes": branch_planes,
+        "branch_probs": branch_probs,
+        "marginals": marginals.astype(np.float32),
+        "side_to_move": np.uint8(1 if qb.turn() else 0),
+    }
+
+
+def encode_action(action) -> np.ndarray:
+    kind, *squares = action
+    squares = list(squares) + [-1] * (3 - len(squares))
+    return np.array([ACTION_KINDS[kind]] + squares, dtype=np.int16)
+
+
+class ShardWriter:
+    """
+    Nampung sample sampai shard_size, lalu tulis satu shard (.npy per field).
+    Sample masuk per game (add_game), karena result baru ketahuan di akhir game.
+    """
+    def __init__(self, out_dir: str, *, top_k: int = 8, shard_size: int = 4096):
+        self.out_dir = out_dir
+        self.top_k = int(top_k)
+        self.shard_size = int(shard_size)
+        self.fields = sample_fields(self.top_k)
+        self.shards: List[dict] = []
+        self.total = 0
+        self.games = 0
+        self._new_buffer()
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _new_buffer(self) -> None:
+        self._buf = {
+            name: np.zeros((self.shard_size,) + shape, dtype=dtype)
+            for name, (dtype, shape) in self.fields.items()
+        }
+        self._fill = 0
+
+    def add_game(self, samples: List[Dict[str, np.ndarray]], result: str) -> None:
+        value = RESULT_VALUES.get(result, 0)
+        for sample in samples:
+            for name, arr in sample.items():
+                self._buf[name][self._fill] = arr
+            self._buf["result"][self._fill] = value
+            self._fill += 1
+            if self._fill == self.shard_size:
+                self.flush()
+        self.games += 1
+
+    def flush(self) -> None:
+        if not self._fill:
+            return
+        idx = len(self.shards)
+        files = {}
+        for name, arr in self._buf.items():
+            fname = f"shard-{idx:05d}-{name}.npy"
+            np.save(os.path.join(self.out_dir, fname), arr[: self._fill])
+            files[name] = fname
+        self.shards.append({"count": self._fill, "files": files})
+        self.total += self._fill
+        self._fill = 0
+
+    def close(self) -> None:
+        self.flush()
+        index = {
+            "samples": self.total,
+            "games": self.games,
+            "top_k": self.top_k,
+            "plane_symbols": PLANE_SYMBOLS,
+            "fields": {name: {"dtype": np.dtype(dt).str, "shape": list(shape)} for name, (dt, shape) in self.fields.items()},
+            "shards": self.shards,
+        }
+        with open(os.path.join(self.out_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+
+def play_game(writer: ShardWriter, *, seed: Optional[int] = None, max_plies: int = 200, max_branches: int = 64) -> str:
+    """Satu game bot vs bot; semua posisinya masuk writer. Return result string."""
+    board = QuantumBoardAdapter(seed=seed, max_branches=max_branches)
+    bots = {
+        "w": Bot("w", seed=None if seed is None else seed * 2),
+        "b": Bot("b", seed=None if seed is None else seed * 2 + 1),
+    }
+    samples = []
+
+    for _ in range(max_plies):
+        if board.is_game_over():
+            break
+        sample = encode_position(board.qb, writer.top_k)
+        n_actions = len(board.actions)
+        bots[board.turn_color].make_move(board)
+        if len(board.actions) == n_actions:
+            break  # bot gak punya langkah
+        sample["move"] = encode_action(board.actions[-1])
+        samples.append(sample)
+
+    result = board.result()
+    writer.add_game(samples, result)
+    return result
+
+
+def export_selfplay(out_dir: str, games: int, *, seed: Optional[int] = None, top_k: int = 8,
+                    shard_size: int = 4096, max_plies: int = 200, max_branches: int = 64) -> dict:
+    writer = ShardWriter(out_dir, top_k=top_k, shard_size=shard_size)
+    results: Dict[str, int] = {}
+    try:
+        for g in range(games):
+            game_seed = None if seed is None else seed + g
+            res = play_game(writer, seed=game_seed, max_plies=max_plies, max_branches=max_branches)
+            results[res] = results.get(res, 0) + 1
+    finally:
+        writer.close()
+    return {"samples": writer.total, "shards": len(writer.shards), "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export self-play positions as .npy shards")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--shard-size", type=int, default=4096)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--max-branches", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    summary = export_selfplay(
+        args.out, args.games, seed=args.seed, top_k=args.top_k, shard_size=args.shard_size,
+        max_plies=args.max_plies, max_branches=args.max_branches,
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
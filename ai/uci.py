@@ -0,0 +1,239 @@
+"""
+Engine teks ala UCI buat driver eksternal / batch (stdin -> stdout), tanpa pygame.
+
+    python -m ai.uci
+
+Command (satu per baris, boleh dikirim beruntun tanpa nunggu jawaban):
+    uci | isready | ucinewgame | quit
+    setoption name <MaxBranches|MergeKey|Seed|MoveTime> value <x>
+    position startpos|fen <fen> [moves <m1> <m2> ...]
+    move <m1> [<m2> ...]         jalanin action di state sekarang
+    go [movetime <ms>]           -> bestmove <m>  (state gak berubah)
+    marginals [<sq> ...]         -> marginal <sq> <sym>=<p> ...  lalu marginalsok
+    status                       -> status over <0|1> result <r> wking <p> bking <p> branches <n>
+    d                            -> fen <fen paling mungkin> + info branches
+    deltas on|off                -> habis tiap move/split satu baris:
+                                    delta <version> branches <sebelum> <sesudah> changed <sq>:<sym>=<p>,... [<sq>:...]
+                                          [measure <occupied|capture> <sq> <0|1> <p>]... [status <over> <result>]
+
+Notasi action: move biasa = UCI ("e2e4", "e7e8q"), split = from + dua tujuan ("g1f3h3").
+
+Input dibaca thread terpisah ke queue; output ditampung dan di-flush sekaligus
+waktu antrean input kosong, jadi driver bisa pipeline ribuan command.
+"""
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+from typing import List, Optional
+
+import chess
+
+from ai.bot import Bot
+from quantum.quantum_board import MERGE_KEYS, QuantumBoard
+
+ENGINE_NAME = "Quantum Lite Chess"
+
+
+def parse_action(token: str):
+    """'e2e4' / 'e7e8q' -> ("move", from, to, promo); 'g1f3h3' -> ("split", from, a, b)."""
+    token = token.strip().lower()
+    if len(token) == 6:
+        return ("split", chess.parse_square(token[:2]), chess.parse_square(token[2:4]), chess.parse_square(token[4:]))
+    mv = chess.Move.from_uci(token)
+    return ("move", mv.from_square, mv.to_square, mv.promotion)
+
+
+def format_action(action) -> str:
+    if action is None:
+        return "0000"
+    if action[0] == "split":
+        return "".join(chess.square_name(sq) for sq in action[1:4])
+    return chess.Move(action[1], action[2], promotion=action[3] if len(action) > 3 else None).uci()
+
+
+class Engine:
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.options = {"MaxBranches": 64, "MergeKey": "fen", "Seed": None, "MoveTime": 1000}
+        self._pending: List[str] = []
+        self.deltas = False
+        self.new_game()
+
+    # Output (di-buffer)
+    def send(self, line: str) -> None:
+        self._pending.append(line)
+
+    def flush(self) -> None:
+        if self._pending:
+            self.out.write("\n".join(self._pending) + "\n")
+            self.out.flush()
+            self._pending.clear()
+
+    # State
+    def new_game(self, fen: Optional[str] = None) -> None:
+        seed = self.options["Seed"]
+        self.qb = QuantumBoard(
+            fen,
+            seed=seed,
+            max_branches=self.options["MaxBranches"],
+            merge_key=self.options["MergeKey"],
+        )
+        if self.deltas:
+            self.qb.subscribe(self._send_delta)
+        self.bot = Bot(seed=seed)
+
+    def apply(self, token: str) -> None:
+        action = parse_action(token)
+        if action[0] == "split":
+            self.qb.apply_split(*action[1:])
+        else:
+            self.qb.apply_move(action[1], action[2], promotion=action[3])
+
+    # Command
+    def handle(self, line: str) -> bool:
+        """Proses satu baris. Return False kalau engine harus berhenti."""
+        parts = line.split()
+        if not parts:
+            return True
+        cmd, args = parts[0], parts[1:]
+
+        handler = getattr(self, f"cmd_{cmd}", None)
+        if handler is None:
+            self.send(f"info string unknown command: {cmd}")
+            return True
+        try:
+            return handler(args) is not False
+        except (ValueError, IndexError, KeyError) as exc:
+            self.send(f"info string error: {cmd}: {exc}")
+            return True
+
+    def cmd_quit(self, args):
+        return False
+
+    def cmd_uci(self, args):
+        self.send(f"id name {ENGINE_NAME}")
+        self.send("option name MaxBranches type spin default 64 min 1 max 1000000")
+        self.send(f"option name MergeKey type combo default fen {' '.join('var ' + k for k in MERGE_KEYS)}")
+        self.send("option name Seed type string default <empty>")
+        self.send("option name MoveTime type spin default 1000 min 1 max 3600000")
+        self.send("uciok")
+
+    def cmd_isready(self, args):
+        self.send("readyok")
+
+    def cmd_ucinewgame(self, args):
+        self.new_game()
+
+    def cmd_setoption(self, args):
+        # setoption name <nama> value <nilai>
+        text = " ".join(args)
+        name, _, value = text.partition(" value ")
+        name = name.replace("name ", "", 1).strip()
+        value = value.strip()
+        if name == "MaxBranches":
+            self.options[name] = int(value)
+        elif name == "MoveTime":
+            self.options[name] = int(value)
+        elif name == "Seed":
+            self.options[name] = int(value) if value and value != "<empty>" else None
+        elif name == "MergeKey":
+            if value not in MERGE_KEYS:
+                raise ValueError(f"MergeKey must be one of {MERGE_KEYS}")
+            self.options[name] = value
+        else:
+            raise KeyError(name)
+
+    def cmd_position(self, args):
+        moves = []
+        if "moves" in args:
+            i = args.index("moves")
+            args, moves = args[:i], args[i + 1:]
+        if args[0] == "startpos":
+            self.new_game()
+        elif args[0] == "fen":
+            self.new_game(" ".join(args[1:]))
+        else:
+            raise ValueError("expected startpos or fen")
+        for token in moves:
+            self.apply(token)
+
+    def cmd_move(self, args):
+        for token in args:
+            self.apply(token)
+
+    def cmd_go(self, args):
+        movetime = self.options["MoveTime"]
+        if "movetime" in args:
+            movetime = int(args[args.index("movetime") + 1])
+        action = self.bot.search(self.qb, movetime / 1000.0)
+        self.send(f"bestmove {format_action(action)}")
+
+    def cmd_marginals(self, args):
+        squares = [chess.parse_square(a) for a in args] if args else list(chess.SQUARES)
+        for sq in squares:
+            dist = self.qb.square_distribution(sq)
+            if not args and set(dist) == {None}:
+                continue  # tanpa argumen: kotak yang pasti kosong gak ditulis
+            items = sorted(dist.items(), key=lambda kv: -kv[1])
+            body = " ".join(f"{sym or '.'}={p:.6f}" for sym, p in items)
+            self.send(f"marginal {chess.square_name(sq)} {body}")
+        self.send("marginalsok")
+
+    def cmd_status(self, args):
+        st = self.qb.status
+        self.send(
+            f"status over {int(st.over)} result {st.result} "
+            f"wking {st.white_king:.6f} bking {st.black_king:.6f} branches {self.qb.branch_count()}"
+        )
+
+    def cmd_deltas(self, args):
+        on = args[0] == "on"
+        if on and not self.deltas:
+            self.qb.subscribe(self._send_delta)
+        elif not on and self.deltas:
+            self.qb.unsubscribe(self._send_delta)
+        self.deltas = on
+
+    def _send_delta(self, delta) -> None:
+        parts = [f"delta {delta.version} branches {delta.branches_before} {delta.branches_after} changed"]
+        for sq, dist in sorted(delta.squares.items()):
+            items = sorted(dist.items(), key=lambda kv: -kv[1])
+            parts.append(chess.square_name(sq) + ":" + ",".join(f"{sym or '.'}={p:.6f}" for sym, p in items))
+        for m in delta.measurements:
+            parts.append(f"measure {m.kind} {chess.square_name(m.square)} {int(m.outcome)} {m.probability:.6f}")
+        if delta.status is not None:
+            parts.append(f"status {int(delta.status.over)} {delta.status.result}")
+        self.send(" ".join(parts))
+
+    def cmd_d(self, args):
+        self.send(f"fen {self.qb.most_likely_board().fen()}")
+        self.send(f"info branches {self.qb.branch_count()}")
+
+
+def _reader(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    for line in stream:
+        lines.put(line)
+    lines.put(None)  # EOF
+
+
+def main(argv=None) -> None:
+    engine = Engine()
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+    threading.Thread(target=_reader, args=(sys.stdin, lines), daemon=True).start()
+
+    while True:
+        try:
+            line = lines.get_nowait()
+        except queue.Empty:
+            # Input lagi kosong: kirim semua output yang ketahan, lalu tunggu
+            engine.flush()
+            line = lines.get()
+        if line is None or not engine.handle(line):
+            break
+    engine.flush()
+
+
+if __name__ == "__main__":
+    main()
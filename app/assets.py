@@ -1,22 +1,91 @@
 import pygame
 import os
-import io
 import sys
-import cairosvg
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from .config import Config
+from .raster_cache import RasterCache
+from .themes import PIECE_CODES, PIECE_NAMES, ThemeRegistry
+
+# Event yang di-post worker rasterisasi background waktu PNG ukuran baru sudah siap
+ASSETS_READY = pygame.event.custom_type()
+
+
+class TextCache:
+    """
+    LRU cache buat surface teks hasil font.render().
+    Key: (nama font, teks, warna). Kalau penuh, entry paling lama gak dipakai dibuang.
+    """
+    def __init__(self, fonts, max_entries=256):
+        self.fonts = fonts
+        self.max_entries = int(max_entries)
+        self._cache = OrderedDict()
+
+    def render(self, font_name, text, color):
+        key = (font_name, text, tuple(color))
+        surf = self._cache.get(key)
+        if surf is not None:
+            self._cache.move_to_end(key)
+            return surf
+
+        surf = self.fonts[font_name].render(text, True, color)
+        self._cache[key] = surf
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
 
 class AssetManager:
     def __init__(self):
-        self.sprites = {}
         self.background = None
-        self.board_image = None
         self.fonts = {}
-        
+        self.text = TextCache(self.fonts, max_entries=Config.TEXT_CACHE_SIZE)
+        # Label probabilitas "0%".."100%", index = persen
+        self.prob_labels = []
+        self.raster = RasterCache(Config.RASTER_CACHE_DIR, workers=Config.RASTER_WORKERS)
+
+        # Tema cuma di-index di sini; board & atlas piece dirasterisasi waktu pertama dipakai
+        self.themes = ThemeRegistry(Config.BOARDS_PATH, Config.ASSETS_ROOT)
+        self.board_theme = Config.BOARD_THEME
+        self.piece_set = Config.PIECE_SET
+        self._boards = OrderedDict()   # (nama, ukuran board) -> Surface
+        self._atlases = OrderedDict()  # (nama, ukuran kotak) -> (Surface atlas, {kode: Rect})
+        self.themes_loaded = False
+
+        # Resize: versi hasil scale dipakai sementara, sampai PNG tajam dari worker siap
+        self._background_src = None
+        self._scaled_boards = {}
+        self._scaled_atlases = {}
+        self._worker = None
+        self._pending = {}  # (nama board, nama piece set, board size, square size) -> Future
+        self.generation = 0  # naik tiap surface board/piece yang aktif diganti
+
     def load_all(self):
         """Load semua aset"""
+        self.load_menu_assets()
+        self.load_themes()
+
+    def load_menu_assets(self):
+        """Aset yang dibutuhin menu (font, label, background). Cepat, tanpa rasterisasi SVG."""
         try:
             self._load_fonts()
-            self._load_images()
+            self._prerender_prob_labels()
+            self._load_background()
+        except Exception as e:
+            print(f"ERROR loading assets: {e}")
+            sys.exit(1)
+
+    def load_themes(self):
+        """Rasterisasi board & piece set aktif (bisa dipanggil setelah menu tampil)."""
+        try:
+            self._ensure_theme(self.board_theme, self.piece_set)
+            self.themes_loaded = True
             print("Assets loaded successfully.")
         except Exception as e:
             print(f"ERROR loading assets: {e}")
@@ -27,38 +96,247 @@ class AssetManager:
         self.fonts['title'] = pygame.font.SysFont(Config.FONT_MAIN, 42, bold=True)
         self.fonts['small'] = pygame.font.SysFont(Config.FONT_MAIN, 20)
         self.fonts['split'] = pygame.font.SysFont(Config.FONT_MAIN, 18, bold=True)
+        self.fonts['hud'] = pygame.font.SysFont(Config.FONT_MAIN, 14)
+
+    def _prerender_prob_labels(self):
+        font = self.fonts['split']
+        self.prob_labels = [
+            font.render(f"{pct}%", True, Config.COLOR_QUANTUM_TEXT) for pct in range(101)
+        ]
 
-    def _load_images(self):
+    def render_text(self, font_name, text, color):
+        """Surface teks dari cache (render cuma sekali per (font, teks, warna))."""
+        return self.text.render(font_name, text, color)
+
+    def prob_label(self, pct):
+        """Label persen yang sudah di-prerender, pct di-clamp ke 0..100."""
+        return self.prob_labels[max(0, min(100, int(pct)))]
+
+    def _load_background(self):
         # Load bg
         bg_path = os.path.join(Config.ASSETS_PATH, "bg.png")
         if os.path.exists(bg_path):
-            img = pygame.image.load(bg_path)
-            self.background = pygame.transform.scale(img, (Config.WIDTH, Config.HEIGHT))
+            self._background_src = pygame.image.load(bg_path)
+            self.background = pygame.transform.scale(self._background_src, (Config.WIDTH, Config.HEIGHT))
         else:
             # Fallback klo gambar gaada
             self.background = pygame.Surface((Config.WIDTH, Config.HEIGHT))
             self.background.fill((50, 50, 50))
 
-        # Load board svg
-        self.board_image = self._load_svg(Config.BOARD_IMAGE_PATH, (Config.BOARD_SIZE, Config.BOARD_SIZE))
+    # Tema board / piece set
+    @property
+    def board_key(self):
+        """Identitas gambar board/piece aktif (buat invalidasi layer statis di renderer)."""
+        return (self.board_theme, Config.BOARD_SIZE, self.generation)
+
+    @property
+    def board_image(self):
+        key = (self.board_theme, Config.BOARD_SIZE)
+        if key not in self._boards and key in self._scaled_boards:
+            return self._scaled_boards[key]
+        self._ensure_theme(self.board_theme, None)
+        return self._boards[key]
+
+    @property
+    def piece_atlas(self):
+        """(surface atlas, {kode piece: Rect}) buat piece set aktif."""
+        key = (self.piece_set, Config.SQUARE_SIZE)
+        if key not in self._atlases and key in self._scaled_atlases:
+            return self._scaled_atlases[key]
+        self._ensure_theme(None, self.piece_set)
+        return self._atlases[key]
+
+    def blit_piece(self, target, code, pos):
+        atlas, rects = self.piece_atlas
+        area = rects.get(code)
+        if area is not None:
+            target.blit(atlas, pos, area)
+
+    def set_board_theme(self, name):
+        if name not in self.themes.boards:
+            raise KeyError(f"Unknown board theme: {name}")
+        self.board_theme = name
+        self._ensure_theme(name, None)
+
+    def cycle_board_theme(self):
+        self.set_board_theme(self.themes.next_board(self.board_theme))
+        return self.board_theme
+
+    def set_piece_set(self, name):
+        if name not in self.themes.piece_sets:
+            raise KeyError(f"Unknown piece set: {name}")
+        self.piece_set = name
+        self._ensure_theme(None, name)
+
+    # Resize window
+    def resize(self):
+        """
+        Dipanggil setelah Config.resize. Background di-scale ulang langsung; board &
+        piece ukuran baru dirasterisasi di worker background, sementara itu dipakai
+        versi scale dari ukuran lain. Selesai -> event ASSETS_READY, lalu poll().
+        """
+        if self._background_src is not None:
+            self.background = pygame.transform.scale(self._background_src, (Config.WIDTH, Config.HEIGHT))
+        else:
+            self.background = pygame.Surface((Config.WIDTH, Config.HEIGHT))
+            self.background.fill((50, 50, 50))
+
+        if self.themes_loaded:
+            self._prefetch(self.board_theme, self.piece_set)
+        self.generation += 1
+
+    def _prefetch(self, board_name, piece_set_name):
+        board_key = (board_name, Config.BOARD_SIZE)
+        atlas_key = (piece_set_name, Config.SQUARE_SIZE)
+        need_board = board_key not in self._boards
+        need_atlas = atlas_key not in self._atlases
+        if need_board:
+            self._board_fallback(board_key)
+        if need_atlas:
+            self._atlas_fallback(atlas_key)
+        if not (need_board or need_atlas):
+            return
+
+        job = (board_name if need_board else None, piece_set_name if need_atlas else None,
+               Config.BOARD_SIZE, Config.SQUARE_SIZE)
+        if job in self._pending:
+            return
+        # Ukuran yang udah gak relevan (window keburu di-resize lagi) gak usah dikerjain
+        for old_job, fut in list(self._pending.items()):
+            if fut.cancel():
+                del self._pending[old_job]
+
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raster")
+        fut = self._worker.submit(self.raster.ensure, self._theme_requests(*job))
+        fut.add_done_callback(lambda _f: pygame.event.post(pygame.event.Event(ASSETS_READY)))
+        self._pending[job] = fut
+
+    def poll(self):
+        """Pasang hasil rasterisasi background yang sudah selesai. Return True kalau ada yang diganti."""
+        changed = False
+        for job, fut in list(self._pending.items()):
+            if not fut.done():
+                continue
+            del self._pending[job]
+            if fut.cancelled():
+                continue
+            board_name, piece_set_name, board_px, square_px = job
+            self._install(board_name, piece_set_name, board_px, square_px, fut.result())
+            self._scaled_boards.pop((board_name, board_px), None)
+            self._scaled_atlases.pop((piece_set_name, square_px), None)
+            changed = True
+        if changed:
+            self.generation += 1
+        return changed
+
+    def _board_fallback(self, key):
+        """Board ukuran lain (tema sama) di-scale ke ukuran key[1]."""
+        if key in self._scaled_boards:
+            return
+        src = next((surf for (name, _), surf in reversed(self._boards.items()) if name == key[0]), None)
+        if src is not None:
+            self._scaled_boards = {key: pygame.transform.smoothscale(src, (key[1], key[1]))}
+
+    def _atlas_fallback(self, key):
+        if key in self._scaled_atlases:
+            return
+        src = next((a for (name, _), a in reversed(self._atlases.items()) if name == key[0]), None)
+        if src is None:
+            return
+        sq = key[1]
+        cols = len(PIECE_NAMES)
+        atlas = pygame.transform.smoothscale(src[0], (cols * sq, 2 * sq))
+        rects = {code: pygame.Rect((i % cols) * sq, (i // cols) * sq, sq, sq) for i, code in enumerate(PIECE_CODES)}
+        self._scaled_atlases = {key: (atlas, rects)}
+
+    def _theme_requests(self, board_name, piece_set_name, board_px, square_px):
+        requests = []
+        board = self.themes.boards.get(board_name) if board_name is not None else None
+        piece_set = self.themes.piece_sets.get(piece_set_name) if piece_set_name is not None else None
+        if board is not None:
+            requests.append((board.svg_path, (board_px, board_px)))
+        if piece_set is not None:
+            requests += [(path, (square_px, square_px)) for path in piece_set.files.values()]
+        return requests
+
+    def _ensure_theme(self, board_name, piece_set_name):
+        """
+        Rasterisasi board dan/atau piece set yang belum ada di memori (satu batch
+        ke raster cache biar paralel). Tema yang lama gak dipakai di-evict (LRU).
+        """
+        board_key = (board_name, Config.BOARD_SIZE)
+        atlas_key = (piece_set_name, Config.SQUARE_SIZE)
+        need_board = board_name is not None and board_key not in self._boards
+        need_atlas = piece_set_name is not None and atlas_key not in self._atlases
+
+        if board_name is not None and not need_board:
+            self._boards.move_to_end(board_key)
+        if piece_set_name is not None and not need_atlas:
+            self._atlases.move_to_end(atlas_key)
+        if not (need_board or need_atlas):
+            return
+
+        board_name = board_name if need_board else None
+        piece_set_name = piece_set_name if need_atlas else None
+        pngs = self.raster.ensure(
+            self._theme_requests(board_name, piece_set_name, Config.BOARD_SIZE, Config.SQUARE_SIZE)
+        )
+        self._install(board_name, piece_set_name, Config.BOARD_SIZE, Config.SQUARE_SIZE, pngs)
+
+    def _install(self, board_name, piece_set_name, board_px, square_px, pngs):
+        """Load PNG hasil raster cache jadi surface board / atlas dan simpan di cache LRU."""
+        board_size = (board_px, board_px)
+        piece_size = (square_px, square_px)
+        board = self.themes.boards.get(board_name) if board_name is not None else None
+        piece_set = self.themes.piece_sets.get(piece_set_name) if piece_set_name is not None else None
+
+        if board_name is not None:
+            if board is None:
+                print(f"Warning: Unknown board theme {board_name}")
+                surf = pygame.Surface(board_size, pygame.SRCALPHA)
+            else:
+                surf = self._load_png(pngs[(board.svg_path, board_size)], board_size)
+            self._remember(self._boards, (board_name, board_px), surf)
+
+        if piece_set_name is not None:
+            sprites = {}
+            if piece_set is None:
+                print(f"Warning: Unknown piece set {piece_set_name}")
+            else:
+                for code, path in piece_set.files.items():
+                    sprites[code] = self._load_png(pngs[(path, piece_size)], piece_size)
+            self._remember(self._atlases, (piece_set_name, square_px), self._build_atlas(sprites, piece_size))
+
+    def _build_atlas(self, sprites, tile_size):
+        """Gabung 12 sprite jadi satu surface: baris 0 putih, baris 1 hitam."""
+        cols = len(PIECE_NAMES)
+        tw, th = tile_size
+        atlas = pygame.Surface((cols * tw, 2 * th), pygame.SRCALPHA)
+        rects = {}
+        for i, code in enumerate(PIECE_CODES):
+            rect = pygame.Rect((i % cols) * tw, (i // cols) * th, tw, th)
+            sprite = sprites.get(code)
+            if sprite is not None:
+                atlas.blit(sprite, rect)
+            rects[code] = rect
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return atlas, rects
 
-        # Load pieces svg
-        piece_name_map = {"K": "king", "Q": "queen", "R": "rook", "B": "bishop", "N": "knight", "P": "pawn"}
-        for color in ("w", "b"):
-            for p_char, p_name in piece_name_map.items():
-                filename = f"{p_name}-{color}.svg"
-                path = os.path.join(Config.ASSETS_PATH, filename)
-                self.sprites[f"{color}{p_char}"] = self._load_svg(path, (64, 64))
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > Config.THEME_CACHE_SIZE:
+            cache.popitem(last=False)
 
-    def _load_svg(self, path, size):
-        """Helper private untuk konversi SVG ke Surface."""
+    def _load_png(self, png_path, size):
+        """Load PNG hasil raster cache; fallback surface transparan kalau gagal."""
         try:
-            if not os.path.exists(path):
-                raise FileNotFoundError(f"File not found: {path}")
-            
-            png_bytes = cairosvg.svg2png(url=path, output_width=size[0], output_height=size[1])
-            return pygame.image.load(io.BytesIO(png_bytes)).convert_alpha()
+            if png_path is None:
+                raise FileNotFoundError("SVG could not be rasterized")
+            return pygame.image.load(png_path).convert_alpha()
         except Exception as e:
-            print(f"Warning: Failed to load {path}. Error: {e}")
+            print(f"Warning: Failed to load {png_path}. Error: {e}")
             # Return surface transparan kosong buat fallback
-            return pygame.Surface(size, pygame.SRCALPHA)
\ No newline at end of file
+            return pygame.Surface(size, pygame.SRCALPHA)
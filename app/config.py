@@ -4,16 +4,85 @@ class Config:
     # Screen settings
     WIDTH = 1024
     HEIGHT = 768
+    RESIZABLE = True
+    MIN_WIDTH = 640
+    MIN_HEIGHT = 480
     FPS = 60
+    UNFOCUSED_FPS = 5  # batas laju loop waktu window gak fokus
+
+    # Target waktu sampai menu tampil (dicek di startup report)
+    STARTUP_BUDGET_MS = 1500
     
-    # Board settings
+    # Board settings (diturunin dari ukuran window, lihat resize)
+    BOARD_FRACTION = 2 / 3  # sisi board relatif ke sisi window terpendek (768 -> 512)
     BOARD_SIZE = 512
     SQUARE_SIZE = BOARD_SIZE // 8
+
+    # Layout panel relatif ke board: band atas buat panel instruksi (HUD), band bawah buat
+    # scrub bar replay, kolom di kanan board buat log move + teks thinking
+    HUD_BAND = 120
+    BOTTOM_BAND = 90
+    PANEL_MARGIN = 10
+    LOG_WIDTH = 230
+    LOG_HEIGHT = 150
     
     # Paths
-    ASSETS_PATH = r"assets\p1"
-    BOARD_IMAGE_PATH = r"assets\boards\rect-8x8.svg"
+    ASSETS_ROOT = "assets"
+    ASSETS_PATH = os.path.join(ASSETS_ROOT, "p1")
+    BOARDS_PATH = os.path.join(ASSETS_ROOT, "boards")
+
+    # Tema default (nama file SVG board tanpa .svg, nama folder piece set)
+    BOARD_THEME = "rect-8x8"
+    PIECE_SET = "p1"
+    THEME_CACHE_SIZE = 4  # jumlah board/atlas (per tema x ukuran) yang disimpan di memori per jenis
+
+    # Cache PNG hasil rasterisasi SVG (bisa dioverride lewat env QLC_CACHE_DIR)
+    RASTER_CACHE_DIR = os.path.join(
+        os.environ.get("QLC_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "quantum-lite-chess"),
+        "raster",
+    )
+    RASTER_WORKERS = None  # None -> min(8, jumlah CPU)
+
+    # Telemetry per ply (ring buffer); kalau env QLC_TELEMETRY diisi path .csv/.json,
+    # timeline di-export ke situ waktu game selesai / window ditutup
+    TELEMETRY_CAPACITY = 1024
+    TELEMETRY_EXPORT = os.environ.get("QLC_TELEMETRY")
+
+    # Tracing span game loop (app/trace.py), mati kecuali env QLC_TRACE diisi path .json
+    TRACE_CAPACITY = 65536
+    TRACE_EXPORT = os.environ.get("QLC_TRACE")
+
+    # Kunci merge branch: "fen" (persis, termasuk clock) atau "position" (lihat QuantumBoard)
+    MERGE_KEY = "fen"
+
+    # Rekam tiap game ke QLC_RECORD_DIR (JSONL + keyframe, lihat quantum/replay.py)
+    RECORD_DIR = os.environ.get("QLC_RECORD_DIR")
+    KEYFRAME_EVERY = 10
     
+    @classmethod
+    def resize(cls, width, height):
+        """Update ukuran window + board. Return (width, height) setelah di-clamp ke minimum."""
+        cls.WIDTH = max(cls.MIN_WIDTH, int(width))
+        cls.HEIGHT = max(cls.MIN_HEIGHT, int(height))
+        side = min(
+            min(cls.WIDTH, cls.HEIGHT) * cls.BOARD_FRACTION,
+            # Board gak boleh masuk band HUD/scrub bar atau kolom panel kanan
+            cls.HEIGHT - cls.HUD_BAND - cls.BOTTOM_BAND,
+            cls.WIDTH - cls.LOG_WIDTH - 3 * cls.PANEL_MARGIN,
+        )
+        square = max(16, int(side) // 8)
+        cls.SQUARE_SIZE = square
+        cls.BOARD_SIZE = square * 8
+        return cls.WIDTH, cls.HEIGHT
+
+    @classmethod
+    def board_offset(cls):
+        """Pojok kiri atas board: di tengah, digeser kiri/bawah secukupnya biar panel muat."""
+        x = (cls.WIDTH - cls.BOARD_SIZE) // 2
+        x = min(x, cls.WIDTH - cls.BOARD_SIZE - cls.LOG_WIDTH - 2 * cls.PANEL_MARGIN)
+        y = max((cls.HEIGHT - cls.BOARD_SIZE) // 2, cls.HUD_BAND)
+        return max(cls.PANEL_MARGIN, x), y
+
     # Colors
     COLOR_WHITE = (255, 255, 255)
     COLOR_BLACK = (0, 0, 0)
@@ -26,4 +95,7 @@ class Config:
     COLOR_QUANTUM_TEXT = (0, 220, 255)
     
     # Fonts
-    FONT_MAIN = "DejaVu Sans"
\ No newline at end of file
+    FONT_MAIN = "DejaVu Sans"
+
+    # Batas jumlah surface teks yang disimpan di TextCache
+    TEXT_CACHE_SIZE = 256
\ No newline at end of file
@@ -1,161 +1,45 @@
 # app/game.py
+import os
+import time
+
 import pygame
 import sys
 
 from .config import Config
-from .assets import AssetManager
-from qlc.board import Board
-from qlc.rules import Rules
+from .assets import ASSETS_READY, AssetManager
+from .startup import StartupProfiler
+from .trace import NULL_TRACER, Tracer
 from render.renderer import Renderer
 from ai.bot import Bot
+from quantum.telemetry import Telemetry
+from quantum.replay import Recorder, Replay
 
-import chess
-from quantum.quantum_board import QuantumBoard
-
-class UIPiece:
-    """
-    Piece versi UI biar Renderer & Game lama tetap jalan.
-    - symbol: 'P','p','K','k', dll (format python-chess)
-    - prob: probabilitas piece paling dominan di square itu
-    """
-    def __init__(self, symbol: str, prob: float):
-        self.symbol = symbol
-        self.prob = prob
-
-    @property
-    def color(self) -> str:
-        return "w" if self.symbol.isupper() else "b"
-
-    @property
-    def kind(self) -> str:
-        return self.symbol.upper()  # 'p' -> 'P'
-
-    @property
-    def code(self) -> str:
-        return f"{self.color}{self.kind}"
-
-
-class QuantumBoardAdapter:
-    """
-    Membuat QuantumBoard "terlihat" seperti Board lama.
-    """
-    def __init__(self, *, seed: int = 123, max_branches: int = 64):
-        self.qb = QuantumBoard(seed=seed, max_branches=max_branches)
-        self.move_log = []
-
-    @property
-    def turn_color(self) -> str:
-        return "w" if self.qb.turn() == chess.WHITE else "b"
-
-    @property
-    def branches(self):
-        # biar kalo ada kode lain yg iterasi branch
-        return self.qb.branches
-
-    def get_piece(self, r: int, c: int):
-        sq = QuantumBoard.rc_to_square(r, c)
-        dist = self.qb.square_distribution(sq)
-
-        best_sym = None
-        best_p = 0.0
-        for sym, p in dist.items():
-            if sym is None:
-                continue
-            if p > best_p:
-                best_sym, best_p = sym, p
-
-        if best_sym is None or best_p <= 0.0:
-            return None
-        return UIPiece(best_sym, best_p)
-
-    def get_valid_moves(self, r: int, c: int):
-        """
-        Union legal-moves dari semua branch untuk piece di (r,c).
-        python-chess punya board.legal_moves sebagai generator move legal
-        """
-        from_sq = QuantumBoard.rc_to_square(r, c)
-        out = set()
-
-        for br in self.qb.branches:
-            b = br.board
-            p = b.piece_at(from_sq)
-            if p is None or p.color != b.turn:
-                continue
-
-            for mv in b.legal_moves:
-                if mv.from_square == from_sq:
-                    rr, cc = QuantumBoard.square_to_rc(mv.to_square)
-                    out.add((rr, cc))
-
-        return list(out)
-
-    def apply_move(self, start_rc, end_rc):
-        from_sq = QuantumBoard.rc_to_square(*start_rc)
-        to_sq = QuantumBoard.rc_to_square(*end_rc)
-
-        ok = self.qb.apply_move(from_sq, to_sq)
-        if ok:
-            self.move_log.append(f"MOVE {start_rc} -> {end_rc}")
-            return "ok"
-        return "illegal"
-
-    def split_piece(self, start_rc, a_rc, b_rc):
-        from_sq = QuantumBoard.rc_to_square(*start_rc)
-        to_a = QuantumBoard.rc_to_square(*a_rc)
-        to_b = QuantumBoard.rc_to_square(*b_rc)
-
-        ok = self.qb.apply_split(from_sq, to_a, to_b)
-        if ok:
-            self.move_log.append(f"SPLIT {start_rc} -> {a_rc} | {b_rc}")
-        return ok
-
-    def is_game_over(self):
-
-        white_king_prob = self._get_king_probability(chess.WHITE)
-        black_king_prob = self._get_king_probability(chess.BLACK)
-
-        if white_king_prob <= 0 or black_king_prob <= 0:
-            return True
-
-        return self.qb.most_likely_board().is_game_over()
-    
-    def result(self):
-
-        white_king_prob = self._get_king_probability(chess.WHITE)
-        black_king_prob = self._get_king_probability(chess.BLACK)
-
-        if white_king_prob <= 0 and black_king_prob > 0:
-            return "0-1" # Black wins (Raja putih tewas)
-        if black_king_prob <= 0 and white_king_prob > 0:
-            return "1-0" # White wins (Raja hitam tewas)
-        if white_king_prob <= 0 and black_king_prob <= 0:
-            return "1/2-1/2" # Draw (Keduanya tewas)
-
-        # Fallback ke hasil standar python-chess
-        return self.qb.most_likely_board().result()
-    
-    def _get_king_probability(self, color):
-        """Helper untuk menghitung total probabilitas raja warna tertentu."""
-        total_prob = 0.0
-        for br in self.qb.branches:
-            # Hitung probabilitas branch
-            p = (br.amp.real ** 2) + (br.amp.imag ** 2)
-            # Cek apakah king ada di branch ini
-            if br.board.king(color) is not None:
-                total_prob += p
-        return total_prob
+# Re-export biar import lama (from app.game import QuantumBoardAdapter) tetap jalan
+from quantum.adapter import QuantumBoardAdapter, UIPiece
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
-        pygame.display.set_caption("Quantum Lite Chess")
+    def __init__(self, startup=None):
+        self.startup = startup or StartupProfiler()
 
+        # Cuma init modul yang dipakai; pygame.init() juga nyalain audio/joystick
+        with self.startup.phase("pygame display/font init"):
+            pygame.display.init()
+            pygame.font.init()
+            self.screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT), self._display_flags())
+            pygame.display.set_caption("Quantum Lite Chess")
+
+        # Board & piece baru dirasterisasi setelah menu tampil (lihat _finish_startup)
         self.assets = AssetManager()
-        self.assets.load_all()
+        with self.startup.phase("menu assets (fonts, background)"):
+            self.assets.load_menu_assets()
 
         self.renderer = Renderer(self.screen, self.assets)
-        self.board = QuantumBoardAdapter(seed=123, max_branches=64)
+        self.board = None
+        self.telemetry = Telemetry(Config.TELEMETRY_CAPACITY)
+        self.tracer = Tracer(Config.TRACE_CAPACITY) if Config.TRACE_EXPORT else NULL_TRACER
+        if self.tracer.enabled:
+            self.renderer.phase_hook = self.tracer.render_hook
+        self.recorder = None
         self.selected = None
         self.valid_moves = []
         self.player_color = 'w'
@@ -165,10 +49,17 @@ class Game:
         self.split_target1 = None
         self.game_over = False
 
+        # Frame pacing: loop blok di event, redraw cuma kalau _frame_key berubah
+        self.focused = True
+        self._last_frame_key = None
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+
     def start(self):
         while True:
             self._reset_game_state()
             self._choose_side_menu()
+            # Rekaman baru dimulai setelah sisi dipilih (keluar dari menu = gak ada file kosong)
+            self._start_recording()
 
             # White always first
             if self.player_color == "b":
@@ -178,7 +69,11 @@ class Game:
             
     def _reset_game_state(self):
         """Mengembalikan game ke kondisi awal yang bersih."""
-        self.board = QuantumBoardAdapter(seed=None, max_branches=64)
+        self.telemetry.clear()
+        self.board = QuantumBoardAdapter(
+            seed=None, max_branches=64, telemetry=self.telemetry, merge_key=Config.MERGE_KEY
+        )
+        self._stop_recording()
         self.selected = None
         self.valid_moves = []
         self.split_target1 = None
@@ -189,30 +84,45 @@ class Game:
         """Loop game inti"""
         clock = pygame.time.Clock()
         running = True
+        self._last_frame_key = None
 
         while running:
-            clock.tick(30)
+            with self.tracer.span("loop"):
+                running = self._game_loop_iteration(clock)
+
+    def _game_loop_iteration(self, clock):
+        """Satu iterasi loop game: render (kalau perlu), tunggu event, proses input. Return False = balik ke menu."""
+        tracer = self.tracer
+        running = True
 
-            # Render game
+        # Render game (cuma kalau state/seleksi berubah sejak frame terakhir)
+        frame_key = self._frame_key()
+        if frame_key != self._last_frame_key:
             current_result = None
             if hasattr(self.board, "result"):
                 current_result = self.board.result()
 
-            self.renderer.draw_game(
-                self.board,
-                selected=self.selected,
-                valid_moves=self.valid_moves,
-                quantum_mode=self.quantum_mode,
-                split_target1=self.split_target1,
-                player_color=self.player_color,
-                game_over=self.game_over,
-                result_str=current_result
-            )
-
-            # Event handling
-            for event in pygame.event.get():
+            with tracer.span("render"):
+                self.renderer.draw_game(
+                    self.board,
+                    selected=self.selected,
+                    valid_moves=self.valid_moves,
+                    quantum_mode=self.quantum_mode,
+                    split_target1=self.split_target1,
+                    player_color=self.player_color,
+                    game_over=self.game_over,
+                    result_str=current_result
+                )
+            self._last_frame_key = frame_key
+
+        with tracer.span("wait"):
+            events = self._wait_events(clock)
+
+        # Event handling
+        with tracer.span("input"):
+            for event in events:
                 if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
+                    self._shutdown()
 
                 # Esc balik ke menu
                 if event.type == pygame.KEYDOWN:
@@ -224,7 +134,11 @@ class Game:
                             self.selected = None
                             self.valid_moves = []
                             self.split_target1 = None
-                    
+
+                    # Ganti tema board (T)
+                    if event.key == pygame.K_t:
+                        self.assets.cycle_board_theme()
+
                     # Toggle quantum mode (Q)
                     if not self.game_over and event.key == pygame.K_q:
                         self.quantum_mode = not self.quantum_mode
@@ -232,38 +146,86 @@ class Game:
                         self.selected = None
                         self.valid_moves = []
 
+                    # Dump trace sekarang (F12), buat ngecek lag yang barusan kejadian
+                    if event.key == pygame.K_F12:
+                        self._export_trace()
+
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if not self.game_over:
-                        self._handle_click(pygame.mouse.get_pos())
+                        with tracer.span("input.click"):
+                            self._handle_click(pygame.mouse.get_pos())
+        return running
+
+    def _frame_key(self):
+        """Semua yang mempengaruhi tampilan game; frame digambar ulang kalau ini berubah."""
+        return (
+            getattr(self.board, "version", None),
+            self.selected,
+            tuple(self.valid_moves),
+            self.quantum_mode,
+            self.split_target1,
+            self.player_color,
+            self.game_over,
+            self.assets.board_key,
+        )
+
+    def _wait_events(self, clock):
+        """
+        Blok sampai ada event (CPU idle ~0), lalu ambil sisa antrean sekaligus.
+        clock.tick membatasi laju loop ke Config.FPS, atau Config.UNFOCUSED_FPS
+        kalau window lagi gak fokus.
+        """
+        clock.tick(Config.FPS if self.focused else Config.UNFOCUSED_FPS)
+
+        events = [pygame.event.wait()]
+        events.extend(pygame.event.get())
+
+        for event in events:
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # Isi window mungkin hilang (ketutup window lain, restore dari minimize)
+                self.renderer.invalidate()
+                self._last_frame_key = None
+            elif event.type == pygame.VIDEORESIZE:
+                self._resize(event.w, event.h)
+            elif event.type == ASSETS_READY:
+                # PNG tajam ukuran baru dari worker: board_key berubah -> frame digambar ulang
+                if self.assets.poll():
+                    self.renderer.invalidate(layers=True)
+                    self._last_frame_key = None
+        return events
+
+    def _display_flags(self):
+        return pygame.RESIZABLE if Config.RESIZABLE else 0
+
+    def _resize(self, width, height):
+        """Layout diturunin ulang dari ukuran window (lihat Config.resize)."""
+        size = Config.resize(width, height)
+        self.screen = pygame.display.get_surface()
+        if self.screen is None or self.screen.get_size() != size:
+            self.screen = pygame.display.set_mode(size, self._display_flags())
+        self.assets.resize()
+        self.renderer.resize(self.screen)
+        self._last_frame_key = None
 
     def _choose_side_menu(self):
-        title_font = self.assets.fonts['title']
-        instr_font = self.assets.fonts['default'] 
+        clock = pygame.time.Clock()
+        self._last_frame_key = None
 
         while True:
-            # Background
-            self.screen.blit(self.assets.background, (0, 0))
-            
-            # Dark overlay
-            overlay = pygame.Surface((Config.WIDTH, Config.HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 100)) 
-            self.screen.blit(overlay, (0, 0))
-
-            title_text = title_font.render("Quantum Chess", True, (255, 255, 255))
-            instr_text = instr_font.render("Press W or B to choose side", True, (200, 200, 200))
-
-            title_rect = title_text.get_rect(center=(Config.WIDTH // 2, Config.HEIGHT // 2 - 80))
-            instr_rect = instr_text.get_rect(center=(Config.WIDTH // 2, Config.HEIGHT // 2 + 20))
-
-            self.screen.blit(title_text, title_rect)
-            self.screen.blit(instr_text, instr_rect)
-
-            pygame.display.update()
+            if self._last_frame_key != "menu":
+                self.renderer.draw_menu("Quantum Chess", "Press W or B to choose side")
+                self._last_frame_key = "menu"
+            if not self.assets.themes_loaded:
+                self._finish_startup()
 
             # Event Loop
-            for event in pygame.event.get():
+            for event in self._wait_events(clock):
                 if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
+                    self._shutdown()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_w:
                         self.player_color = 'w'
@@ -274,6 +236,13 @@ class Game:
                         self.bot = Bot('w')
                         return
 
+    def _finish_startup(self):
+        """Menu sudah tampil: baru load board/piece (bisa lama kalau raster cache masih dingin)."""
+        self.startup.first_frame()
+        with self.startup.phase("board/piece assets"):
+            self.assets.load_themes()
+        self.startup.finish()
+
     def _handle_click(self, pos):
         if self.game_over:
             return
@@ -282,8 +251,7 @@ class Game:
         if getattr(self.board, "turn_color", None) != self.player_color:
             return
 
-        x_off = (Config.WIDTH - Config.BOARD_SIZE) // 2
-        y_off = (Config.HEIGHT - Config.BOARD_SIZE) // 2
+        x_off, y_off = Config.board_offset()
 
         mx, my = pos
         col = (mx - x_off) // Config.SQUARE_SIZE
@@ -301,7 +269,8 @@ class Game:
                 and (r, c) != self.split_target1
                 and self.board.get_piece(r, c) is None
             ):
-                ok = self.board.split_piece(self.selected, self.split_target1, (r, c))
+                with self.tracer.span("board.split_piece"):
+                    ok = self.board.split_piece(self.selected, self.split_target1, (r, c))
                 if ok:
                     self._end_player_turn() # Refactor ke method baru
                 return
@@ -319,7 +288,8 @@ class Game:
                         self.split_target1 = (r, c)
                     return
 
-                status = self.board.apply_move(self.selected, (r, c))
+                with self.tracer.span("board.apply_move"):
+                    status = self.board.apply_move(self.selected, (r, c))
                 if status == "ok":
                     self._end_player_turn()
                 return
@@ -332,7 +302,8 @@ class Game:
         # Select piece
         if piece and piece.color == self.player_color:
             self.selected = (r, c)
-            self.valid_moves = self.board.get_valid_moves(r, c)
+            with self.tracer.span("board.get_valid_moves"):
+                self.valid_moves = self.board.get_valid_moves(r, c)
             self.split_target1 = None
 
     def _end_player_turn(self):
@@ -350,7 +321,9 @@ class Game:
 
     def _check_game_over_condition(self):
         """Cek status board dan update flag game_over."""
-        if hasattr(self.board, "is_game_over") and self.board.is_game_over():
+        with self.tracer.span("game_over_check"):
+            over = hasattr(self.board, "is_game_over") and self.board.is_game_over()
+        if over:
             self.game_over = True
             self.selected = None
             self.valid_moves = []
@@ -359,27 +332,138 @@ class Game:
                 res = self.board.result()
                 print(f"GAME OVER DETECTED: {res}")
                 self.board.move_log.append(f"GAME OVER: {res}")
+            self._export_telemetry()
+            self._export_trace()
             return True
         return False
 
+    def _start_recording(self):
+        self._stop_recording()
+        if Config.RECORD_DIR:
+            os.makedirs(Config.RECORD_DIR, exist_ok=True)
+            path = os.path.join(Config.RECORD_DIR, time.strftime("game-%Y%m%d-%H%M%S.jsonl"))
+            self.recorder = Recorder(path, self.board.qb, keyframe_every=Config.KEYFRAME_EVERY)
+            self.board.recorder = self.recorder
+
+    def _stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def _shutdown(self):
+        self._export_telemetry()
+        self._export_trace()
+        self._stop_recording()
+        pygame.quit(); sys.exit()
+
+    def _export_telemetry(self):
+        if Config.TELEMETRY_EXPORT and len(self.telemetry):
+            self.telemetry.export(Config.TELEMETRY_EXPORT)
+            print(f"Telemetry written to {Config.TELEMETRY_EXPORT}")
+
+    def _export_trace(self):
+        if self.tracer.enabled and len(self.tracer):
+            self.tracer.export(Config.TRACE_EXPORT)
+            print(f"Trace written to {Config.TRACE_EXPORT} ({len(self.tracer)} spans)")
+
     def _bot_turn(self):
+        with self.tracer.span("bot_turn"):
+            self._bot_turn_loop()
+
+    def _bot_turn_loop(self):
         # Loop bot turn
         while not self.game_over and self.bot and getattr(self.board, "turn_color", None) != self.player_color:
-            self.renderer.draw_game(
-                self.board,
-                selected=self.selected,
-                valid_moves=self.valid_moves,
-                quantum_mode=self.quantum_mode,
-                split_target1=self.split_target1,
-                thinking=True,
-                player_color=self.player_color,
-            )
-             
-            pygame.display.flip()
+            with self.tracer.span("render"):
+                self.renderer.draw_game(
+                    self.board,
+                    selected=self.selected,
+                    valid_moves=self.valid_moves,
+                    quantum_mode=self.quantum_mode,
+                    split_target1=self.split_target1,
+                    thinking=True,
+                    player_color=self.player_color,
+                )
+
             # pygame.time.delay(250) # Kurangi delay biar ga lag
 
-            self.bot.make_move(self.board)
+            with self.tracer.span("bot.make_move"):
+                self.bot.make_move(self.board)
 
             # Cek game over setelah bot gerak
             if self._check_game_over_condition():
-                break
\ No newline at end of file
+                break
+
+    def replay(self, path):
+        """
+        Mode replay rekaman: Kiri/Kanan = 1 ply, PgUp/PgDn = 1 keyframe,
+        Home/End = awal/akhir, klik/drag scrub bar buat lompat, ESC keluar.
+        """
+        replay = Replay(path)
+        total = len(replay)
+        self.renderer.draw_menu("Quantum Chess", "Loading replay…")
+        if not self.assets.themes_loaded:
+            self._finish_startup()
+
+        hud = (
+            f"REPLAY  {os.path.basename(path)}",
+            "Left/Right: step   PgUp/PgDn: jump keyframe",
+            "Home/End: start/end   click/drag bar: seek",
+            "ESC: quit",
+        )
+        clock = pygame.time.Clock()
+        ply = total
+        dragging = False
+        self._last_frame_key = None
+        pygame.event.set_allowed(pygame.MOUSEMOTION)
+        # Satu view buat seluruh sesi; lepas dari delta selama seek (action di antaranya gak perlu delta)
+        view = QuantumBoardAdapter(qb=replay.seek(ply))
+
+        try:
+            while True:
+                if self._last_frame_key != ("replay", ply, self.assets.board_key):
+                    # Seek = keyframe terdekat + maksimal keyframe_every-1 action
+                    view.rebind(replay.seek(ply))
+                    view.move_log = replay.logs[:ply]
+                    self.renderer.draw_game(view, player_color="w", hud=hud)
+                    self.renderer.draw_scrub_bar(
+                        ply, total, replay.keyframe_every,
+                        f"Ply {ply}/{total}   result {view.result()}",
+                    )
+                    self._last_frame_key = ("replay", ply, self.assets.board_key)
+
+                # Semua event di antrean diproses dulu; seek cuma ke target terakhir
+                for event in self._wait_events(clock):
+                    if event.type == pygame.QUIT:
+                        self._shutdown()
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            return
+                        if event.key == pygame.K_t:
+                            self.assets.cycle_board_theme()
+                        step = {
+                            pygame.K_RIGHT: 1,
+                            pygame.K_LEFT: -1,
+                            pygame.K_PAGEDOWN: replay.keyframe_every,
+                            pygame.K_PAGEUP: -replay.keyframe_every,
+                        }.get(event.key)
+                        if step is not None:
+                            ply = max(0, min(total, ply + step))
+                        elif event.key == pygame.K_HOME:
+                            ply = 0
+                        elif event.key == pygame.K_END:
+                            ply = total
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        if self.renderer.scrub_bar_rect().collidepoint(event.pos):
+                            dragging = True
+                            ply = self._scrub_ply(event.pos[0], total)
+                    elif event.type == pygame.MOUSEMOTION and dragging:
+                        ply = self._scrub_ply(event.pos[0], total)
+                    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                        dragging = False
+        finally:
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
+
+    def _scrub_ply(self, x, total):
+        track = self.renderer.scrub_track_rect()
+        frac = (x - track.x) / max(1, track.width - 1)
+        return max(0, min(total, round(frac * total)))
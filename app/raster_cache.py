@@ -0,0 +1,90 @@
+"""
+Cache PNG hasil rasterisasi SVG di disk.
+
+Key cache = (path SVG, hash isi file, ukuran output). Warm start cuma baca PNG
+dari disk; cairosvg baru di-import kalau ada cache miss, dan miss dirasterisasi
+paralel di thread pool.
+
+Modul ini sengaja gak import pygame biar bisa dipakai dari worker/tool headless.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+Size = Tuple[int, int]
+RasterKey = Tuple[str, Size]
+
+
+def _rasterize(svg_path: str, size: Size, out_path: str) -> Optional[str]:
+    """Render SVG -> PNG di out_path. Return out_path, atau None kalau gagal."""
+    try:
+        import cairosvg  # lazy: warm start gak butuh cairo sama sekali
+
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        cairosvg.svg2png(url=svg_path, write_to=tmp_path, output_width=size[0], output_height=size[1])
+        # Tulis atomik biar proses lain gak kebaca PNG setengah jadi
+        os.replace(tmp_path, out_path)
+        return out_path
+    except Exception as e:
+        print(f"Warning: Failed to rasterize {svg_path}. Error: {e}")
+        return None
+
+
+class RasterCache:
+    def __init__(self, cache_dir: str, *, workers: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.hits = 0
+        self.misses = 0
+
+    def cache_path(self, svg_path: str, size: Size) -> str:
+        """Path PNG di cache buat (svg_path, isi file, size)."""
+        with open(svg_path, "rb") as f:
+            content_hash = hashlib.sha1(f.read()).hexdigest()
+
+        norm_path = os.path.normcase(os.path.normpath(svg_path))
+        key = f"{norm_path}|{content_hash}|{size[0]}x{size[1]}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+        stem = os.path.splitext(os.path.basename(svg_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{size[0]}x{size[1]}-{digest}.png")
+
+    def ensure(self, requests: Iterable[RasterKey]) -> Dict[RasterKey, Optional[str]]:
+        """
+        Pastikan semua (svg_path, size) ada di cache.
+        Return {(svg_path, size): png_path | None}; None kalau SVG gak ada / gagal dirender.
+        """
+        out: Dict[RasterKey, Optional[str]] = {}
+        missing = []
+
+        for svg_path, size in requests:
+            key = (svg_path, tuple(size))
+            if key in out:
+                continue
+            if not os.path.exists(svg_path):
+                print(f"Warning: Failed to load {svg_path}. Error: File not found: {svg_path}")
+                out[key] = None
+                continue
+
+            png_path = self.cache_path(svg_path, key[1])
+            if os.path.exists(png_path):
+                self.hits += 1
+                out[key] = png_path
+            else:
+                self.misses += 1
+                missing.append((key, png_path))
+
+        if missing:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                futures = {
+                    key: pool.submit(_rasterize, key[0], key[1], png_path)
+                    for key, png_path in missing
+                }
+                for key, fut in futures.items():
+                    out[key] = fut.result()
+
+        return out
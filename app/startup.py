@@ -0,0 +1,69 @@
+"""
+Pengukuran waktu startup: import per modul, load aset, dan waktu sampai frame pertama.
+
+Dipakai main.py (flag --startup-report atau env QLC_STARTUP_REPORT=1) supaya
+startup bisa dijaga di bawah Config.STARTUP_BUDGET_MS.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    def __init__(self, *, report: bool = False, budget_ms: Optional[float] = None, t0: Optional[float] = None):
+        self.report_enabled = report
+        self.budget_ms = budget_ms
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.imports: List[Tuple[str, float]] = []
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame_ms: Optional[float] = None
+
+    def _elapsed_ms(self, since: float) -> float:
+        return (time.perf_counter() - since) * 1000.0
+
+    def import_module(self, name: str):
+        """
+        Import modul sambil catat waktunya. Waktu yang tercatat itu inkremental:
+        dependency yang sudah ke-import duluan gak dihitung lagi.
+        """
+        already = name in sys.modules
+        t = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports.append((name, 0.0 if already else self._elapsed_ms(t)))
+        return module
+
+    @contextmanager
+    def phase(self, label: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((label, self._elapsed_ms(t)))
+
+    def first_frame(self) -> None:
+        """Dipanggil setelah frame pertama tampil. Cuma yang pertama yang dicatat."""
+        if self.first_frame_ms is None:
+            self.first_frame_ms = self._elapsed_ms(self.t0)
+
+    def finish(self) -> None:
+        """Startup selesai: print report kalau diminta."""
+        if self.report_enabled:
+            print(self.format_report())
+
+    def format_report(self) -> str:
+        lines = ["Startup report:"]
+        for name, ms in self.imports:
+            lines.append(f"  import {name:<28} {ms:8.1f} ms")
+        for label, ms in self.phases:
+            lines.append(f"  {label:<35} {ms:8.1f} ms")
+
+        if self.first_frame_ms is not None:
+            lines.append(f"  {'time to first frame':<35} {self.first_frame_ms:8.1f} ms")
+            if self.budget_ms is not None:
+                status = "OK" if self.first_frame_ms <= self.budget_ms else "OVER BUDGET"
+                lines.append(f"  {'budget':<35} {self.budget_ms:8.1f} ms  [{status}]")
+        return "\n".join(lines)
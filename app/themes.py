@@ -0,0 +1,78 @@
+"""
+Registry tema board & piece set.
+
+Registry cuma nge-index file SVG yang ada (tanpa rasterisasi). Rasterisasi
+dilakukan AssetManager waktu tema pertama kali dipakai.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+PIECE_NAMES = {"K": "king", "Q": "queen", "R": "rook", "B": "bishop", "N": "knight", "P": "pawn"}
+# Urutan sprite di atlas: baris 0 putih, baris 1 hitam
+PIECE_CODES = [f"{color}{p_char}" for color in ("w", "b") for p_char in PIECE_NAMES]
+
+
+@dataclass(frozen=True)
+class BoardTheme:
+    name: str
+    svg_path: str
+
+    @property
+    def playable(self) -> bool:
+        # Game-nya 8x8, board lain (hex, circular, dst) cuma di-index
+        return "8x8" in self.name
+
+
+@dataclass(frozen=True)
+class PieceSet:
+    name: str
+    directory: str
+    files: Dict[str, str]  # kode piece ('wK', 'bP', ...) -> path SVG
+
+
+class ThemeRegistry:
+    def __init__(self, boards_dir: str, pieces_root: str):
+        self.boards: Dict[str, BoardTheme] = {}
+        self.piece_sets: Dict[str, PieceSet] = {}
+        self._index_boards(boards_dir)
+        self._index_piece_sets(pieces_root)
+
+    def _index_boards(self, boards_dir: str) -> None:
+        if not os.path.isdir(boards_dir):
+            return
+        for filename in sorted(os.listdir(boards_dir)):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() == ".svg":
+                self.boards[stem] = BoardTheme(stem, os.path.join(boards_dir, filename))
+
+    def _index_piece_sets(self, pieces_root: str) -> None:
+        """Piece set = subfolder yang punya lengkap 12 SVG '<nama>-<w|b>.svg'."""
+        if not os.path.isdir(pieces_root):
+            return
+        for name in sorted(os.listdir(pieces_root)):
+            directory = os.path.join(pieces_root, name)
+            if not os.path.isdir(directory):
+                continue
+
+            files = {}
+            for code in PIECE_CODES:
+                path = os.path.join(directory, f"{PIECE_NAMES[code[1]]}-{code[0]}.svg")
+                if os.path.exists(path):
+                    files[code] = path
+            if len(files) == len(PIECE_CODES):
+                self.piece_sets[name] = PieceSet(name, directory, files)
+
+    def playable_boards(self) -> List[str]:
+        return [name for name, theme in self.boards.items() if theme.playable]
+
+    def next_board(self, current: str) -> str:
+        """Board playable berikutnya (muter) setelah `current`."""
+        names = self.playable_boards()
+        if not names:
+            return current
+        if current not in names:
+            return names[0]
+        return names[(names.index(current) + 1) % len(names)]
@@ -0,0 +1,128 @@
+"""
+Tracing span game loop (opt-in), export ke format Chrome trace-event JSON.
+
+    QLC_TRACE=trace.json python main.py     # F12 = dump buffer sekarang, juga ditulis waktu keluar
+
+Buka file-nya di chrome://tracing atau https://ui.perfetto.dev: tiap span jadi
+blok di timeline (nested sesuai waktu), jadi satu frame yang nge-lag kelihatan
+habis di mana (input, get_valid_moves, bot, render.board, ...).
+
+Span disimpan di ring buffer ukuran tetap (list yang dialokasi di depan), cuma
+nama + dua timestamp per span. Kalau tracing mati, Game pakai NULL_TRACER yang
+span-nya objek no-op bersama, jadi biayanya cuma satu method call.
+"""
+from __future__ import annotations
+
+import json
+import os
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "t0")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.t0, perf_counter())
+        return False
+
+
+class Tracer:
+    """Ring buffer span (nama, mulai, selesai); kalau penuh, span paling lama ketimpa."""
+    enabled = True
+
+    def __init__(self, capacity: int = 65536):
+        self.capacity = max(1, int(capacity))
+        self._names: List[Optional[str]] = [None] * self.capacity
+        self._t0 = [0.0] * self.capacity
+        self._t1 = [0.0] * self.capacity
+        self._next = 0
+        self._origin = perf_counter()
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def record(self, name: str, t0: float, t1: float) -> None:
+        i = self._next % self.capacity
+        self._names[i] = name
+        self._t0[i] = t0
+        self._t1[i] = t1
+        self._next += 1
+
+    def render_hook(self, phase: str, t0: float, t1: float) -> None:
+        """Dipasang ke Renderer.phase_hook: phase render jadi span "render.<phase>"."""
+        self.record("render." + phase, t0, t1)
+
+    def clear(self) -> None:
+        self._next = 0
+
+    def spans(self) -> List[tuple]:
+        """(nama, mulai, selesai) urut waktu selesai, yang paling lama dulu."""
+        n = len(self)
+        start = self._next - n
+        out = []
+        for k in range(start, self._next):
+            i = k % self.capacity
+            out.append((self._names[i], self._t0[i], self._t1[i]))
+        return out
+
+    def to_chrome(self) -> Dict[str, object]:
+        events = []
+        pid = os.getpid()
+        for name, t0, t1 in sorted(self.spans(), key=lambda s: (s[1], -s[2])):
+            events.append({
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (t0 - self._origin) * 1e6,
+                "dur": (t1 - t0) * 1e6,
+                "pid": pid,
+                "tid": 1,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTracer:
+    """Tracing mati: semua no-op."""
+    enabled = False
+    _span = _NullSpan()
+
+    def __len__(self) -> int:
+        return 0
+
+    def span(self, name: str) -> _NullSpan:
+        return self._span
+
+    def record(self, name: str, t0: float, t1: float) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
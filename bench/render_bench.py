@@ -0,0 +1,221 @@
+"""
+Benchmark frame-time Renderer.draw_game (headless, SDL dummy driver).
+
+    python -m bench.render_bench --out render.json
+    python -m bench.render_bench --baseline bench/baseline_render.json   # exit 1 kalau ada regresi
+    python -m bench.render_bench --save-baseline bench/baseline_render.json
+
+Skenario (state di-script, deterministik per seed):
+- classical    : opening biasa, 1 branch
+- branches_64  : superposisi ~64 branch
+- branches_1024: superposisi ~1024 branch
+- quantum_ui   : ~64 branch + quantum mode, piece terpilih, highlight valid move, split target A
+
+Frame muter antar state skenario (tiap frame state-nya beda, jadi jalur dirty-rect
+benar-benar kerja). Waktu per frame dipecah per phase lewat Renderer.phase_hook:
+snapshot (akses data get_piece), board, pieces, hud, log, present.
+Output: persentil (ms) per skenario, total dan per phase.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+from collections import defaultdict
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import chess
+import numpy as np
+import pygame
+
+from app.assets import AssetManager
+from app.config import Config
+from bench.states import classical_states, superposed_states
+from quantum.adapter import QuantumBoardAdapter
+from quantum.quantum_board import QuantumBoard
+from render.renderer import Renderer
+
+PHASES = ("snapshot", "board", "pieces", "hud", "log", "present")
+PERCENTILES = (50, 90, 99)
+
+
+def _view(qb: QuantumBoard, log_len: int) -> QuantumBoardAdapter:
+    view = QuantumBoardAdapter(qb=qb)
+    view.move_log = [f"PLY {i + 1}" for i in range(log_len)]
+    return view
+
+
+def _frame_args(view: QuantumBoardAdapter, quantum: bool) -> dict:
+    """kwargs draw_game; quantum=True -> piece sisi yang jalan dipilih + split target A."""
+    if not quantum:
+        return {}
+    board = view.qb.most_likely_board()
+    for sq in chess.SQUARES:
+        piece = board.piece_at(sq)
+        if piece is None or piece.color != board.turn:
+            continue
+        rc = QuantumBoard.square_to_rc(sq)
+        valid = view.get_valid_moves(*rc)
+        if len(valid) >= 2:
+            return {"quantum_mode": True, "selected": rc, "valid_moves": valid, "split_target1": valid[0]}
+    return {"quantum_mode": True}
+
+
+def build_scenarios(seed: int = 7):
+    """{nama: [(view, kwargs draw_game), ...]}"""
+    sup64 = superposed_states(64, seed)
+    scripts = {
+        "classical": (classical_states(seed), False),
+        "branches_64": (sup64, False),
+        "branches_1024": (superposed_states(1024, seed), False),
+        "quantum_ui": ([qb.copy() for qb in sup64], True),
+    }
+    out = {}
+    for name, (states, quantum) in scripts.items():
+        frames = []
+        for i, qb in enumerate(states):
+            view = _view(qb, i)
+            frames.append((view, _frame_args(view, quantum)))
+        out[name] = frames
+    return out
+
+
+def _percentiles(values) -> dict:
+    arr = np.asarray(values, dtype=np.float64)
+    out = {f"p{p}": float(np.percentile(arr, p)) for p in PERCENTILES}
+    out["mean"] = float(arr.mean())
+    out["max"] = float(arr.max())
+    return out
+
+
+def run_scenario(renderer: Renderer, frames, *, count: int, warmup: int, full: bool) -> dict:
+    phase_ms = defaultdict(float)
+
+    def hook(phase, t0, t1):
+        phase_ms[phase] += (t1 - t0) * 1000.0
+
+    totals = []
+    per_phase = {phase: [] for phase in PHASES}
+    renderer.invalidate()
+    renderer.phase_hook = hook
+    try:
+        for i in range(warmup + count):
+            view, kwargs = frames[i % len(frames)]
+            if full:
+                renderer.invalidate()
+            phase_ms.clear()
+            t0 = perf_counter()
+            renderer.draw_game(view, player_color="w", **kwargs)
+            elapsed = (perf_counter() - t0) * 1000.0
+            if i < warmup:
+                continue
+            totals.append(elapsed)
+            for phase in PHASES:
+                per_phase[phase].append(phase_ms.get(phase, 0.0))
+    finally:
+        renderer.phase_hook = None
+
+    return {
+        "branches": max(len(view.qb.branches) for view, _ in frames),
+        "states": len(frames),
+        "frame_ms": _percentiles(totals),
+        "phases_ms": {phase: _percentiles(v) for phase, v in per_phase.items()},
+    }
+
+
+def run(*, frames: int = 200, warmup: int = 10, full: bool = False, seed: int = 7, only=None) -> dict:
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+    assets = AssetManager()
+    assets.load_all()
+    renderer = Renderer(screen, assets)
+
+    scenarios = build_scenarios(seed)
+    results = {}
+    for name, script in scenarios.items():
+        if only and name not in only:
+            continue
+        results[name] = run_scenario(renderer, script, count=frames, warmup=warmup, full=full)
+    return {
+        "meta": {
+            "frames": frames,
+            "full_redraw": full,
+            "size": [Config.WIDTH, Config.HEIGHT],
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(result: dict, baseline: dict, *, tolerance: float, stat: str = "p50"):
+    """List (skenario, metrik, baseline ms, sekarang ms, rasio) yang lebih lambat dari baseline*(1+tolerance)."""
+    regressions = []
+    for name, cur in result["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        pairs = [("frame", base["frame_ms"], cur["frame_ms"])]
+        pairs += [(phase, base["phases_ms"][phase], cur["phases_ms"][phase]) for phase in PHASES if phase in base["phases_ms"]]
+        for metric, b, c in pairs:
+            # Phase yang di baseline hampir nol gak dibandingin (noise timer)
+            if b[stat] < 0.05:
+                continue
+            ratio = c[stat] / b[stat]
+            if ratio > 1.0 + tolerance:
+                regressions.append((name, metric, b[stat], c[stat], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for Renderer.draw_game")
+    parser.add_argument("--out", default="-", help="result JSON (default stdout)")
+    parser.add_argument("--frames", type=int, default=200, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--full", action="store_true", help="force a full redraw every frame")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = +25%%)")
+    parser.add_argument("--stat", default="p50", choices=[f"p{p}" for p in PERCENTILES] + ["mean"])
+    parser.add_argument("--save-baseline", help="also write the result here")
+    args = parser.parse_args(argv)
+
+    result = run(frames=args.frames, warmup=args.warmup, full=args.full, seed=args.seed, only=args.scenario)
+    text = json.dumps(result, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+
+    for name, res in result["scenarios"].items():
+        f = res["frame_ms"]
+        print(
+            f"{name:14s} branches {res['branches']:5d}  p50 {f['p50']:7.2f} ms  p90 {f['p90']:7.2f}  p99 {f['p99']:7.2f}",
+            file=sys.stderr,
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(result, baseline, tolerance=args.tolerance, stat=args.stat)
+        for name, metric, b, c, ratio in regressions:
+            print(f"REGRESSION {name}/{metric}: {args.stat} {b:.2f} -> {c:.2f} ms (x{ratio:.2f})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions vs {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
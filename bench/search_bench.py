@@ -0,0 +1,127 @@
+"""
+Benchmark search: make/unmake di tempat (QuantumBoard.push/pop) vs copy per node.
+
+    python -m bench.search_bench --depth 2 --out search.json
+
+Dua jalur jalan negamax fixed-depth yang sama persis (kandidat dari Bot._candidates,
+daun dinilai evaluate()):
+- copy    : tiap child = qb.copy() + apply_move/apply_split (salin semua chess.Board)
+- pushpop : qb.push(action) ... qb.pop() di state yang sama (Board.push/pop per branch di tempat)
+State rng ikut disalin / dibalikin, jadi skor dan jumlah node dua jalur harus identik
+(dicek). Skenario: classical (1 branch), branches_16, branches_64. Diulang --repeat kali,
+diambil median; output nodes/sec per jalur.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from time import perf_counter
+
+from ai.bot import Bot, evaluate
+from bench.states import classical_states, superposed_states
+
+MATE = 1000.0
+
+
+class _Search:
+    def __init__(self, seed: int, max_splits: int):
+        self.bot = Bot(seed=seed)
+        self.max_splits = max_splits
+        self.nodes = 0
+
+    def copy_negamax(self, qb, depth: int) -> float:
+        self.nodes += 1
+        if depth == 0 or qb.status.over:
+            return evaluate(qb, qb.turn())
+        best = -MATE
+        for action in self.bot._candidates(qb, self.max_splits):
+            child = qb.copy()
+            if action[0] == "move":
+                child.apply_move(action[1], action[2])
+            else:
+                child.apply_split(action[1], action[2], action[3])
+            best = max(best, -self.copy_negamax(child, depth - 1))
+        return best
+
+    def push_negamax(self, qb, depth: int) -> float:
+        self.nodes += 1
+        if depth == 0 or qb.status.over:
+            return evaluate(qb, qb.turn())
+        best = -MATE
+        for action in self.bot._candidates(qb, self.max_splits):
+            qb.push(action)
+            try:
+                best = max(best, -self.push_negamax(qb, depth - 1))
+            finally:
+                qb.pop()
+        return best
+
+
+def run_search(mode: str, qb, *, depth: int, seed: int, max_splits: int):
+    """(skor, node, detik) satu search dari root qb."""
+    search = _Search(seed, max_splits)
+    fn = search.copy_negamax if mode == "copy" else search.push_negamax
+    t0 = perf_counter()
+    score = fn(qb, depth)
+    return score, search.nodes, perf_counter() - t0
+
+
+def build_scenarios(seed: int):
+    return {
+        "classical": classical_states(seed)[4],
+        "branches_16": superposed_states(16, seed, extra_plies=2)[-1],
+        "branches_64": superposed_states(64, seed, extra_plies=2)[-1],
+    }
+
+
+def bench_case(qb, *, depth: int, seed: int, max_splits: int, repeat: int) -> dict:
+    results = {}
+    for mode in ("copy", "pushpop"):
+        runs = [run_search(mode, qb, depth=depth, seed=seed, max_splits=max_splits) for _ in range(repeat)]
+        seconds = statistics.median(r[2] for r in runs)
+        results[mode] = {"score": runs[0][0], "nodes": runs[0][1], "seconds": seconds}
+    if (results["copy"]["score"], results["copy"]["nodes"]) != (results["pushpop"]["score"], results["pushpop"]["nodes"]):
+        raise AssertionError("copy and push/pop searches differ")
+
+    out = {"branches": len(qb.branches), "nodes": results["copy"]["nodes"], "score": results["copy"]["score"]}
+    for mode, res in results.items():
+        out[f"{mode}_ms"] = res["seconds"] * 1000.0
+        out[f"{mode}_nps"] = res["nodes"] / res["seconds"] if res["seconds"] > 0 else None
+    out["speedup"] = results["copy"]["seconds"] / results["pushpop"]["seconds"] if results["pushpop"]["seconds"] > 0 else None
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copy-based vs push/pop search on QuantumBoard")
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--max-splits", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--out", default="-", help="result JSON (default stdout)")
+    args = parser.parse_args(argv)
+
+    cases = {}
+    for name, qb in build_scenarios(args.seed).items():
+        if args.scenario and name not in args.scenario:
+            continue
+        res = bench_case(qb, depth=args.depth, seed=args.seed, max_splits=args.max_splits, repeat=args.repeat)
+        cases[name] = res
+        print(
+            f"{name:12s} branches {res['branches']:4d}  nodes {res['nodes']:6d}  "
+            f"copy {res['copy_nps']:8.0f} n/s  push/pop {res['pushpop_nps']:8.0f} n/s  (x{res['speedup']:.2f})",
+            file=sys.stderr,
+        )
+
+    text = json.dumps({"depth": args.depth, "max_splits": args.max_splits, "cases": cases}, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
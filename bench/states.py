@@ -0,0 +1,55 @@
+"""
+State QuantumBoard hasil script (deterministik per seed) buat benchmark.
+
+Sengaja tanpa import pygame / UI, jadi transport_bench dan search_bench bisa jalan
+di mesin tanpa display atau SDL.
+"""
+from __future__ import annotations
+
+import random
+
+import chess
+
+from ai.bot import Bot
+from quantum.quantum_board import QuantumBoard
+
+OPENING = ("e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "d2d3", "f8c5")
+
+
+def _apply(qb: QuantumBoard, action) -> None:
+    if action[0] == "split":
+        qb.apply_split(*action[1:4])
+    else:
+        qb.apply_move(action[1], action[2])
+
+
+def classical_states(seed: int):
+    qb = QuantumBoard(seed=seed)
+    states = [qb.copy()]
+    for uci in OPENING:
+        mv = chess.Move.from_uci(uci)
+        qb.apply_move(mv.from_square, mv.to_square)
+        states.append(qb.copy())
+    return states
+
+
+def superposed_states(target: int, seed: int, extra_plies: int = 8):
+    """Split terus sampai jumlah branch >= target, lalu `extra_plies` move biasa (tiap ply di-snapshot)."""
+    qb = QuantumBoard(seed=seed, max_branches=target)
+    bot = Bot(seed=seed)
+    rng = random.Random(seed)
+    while len(qb.branches) < target and not qb.status.over:
+        candidates = bot._candidates(qb, 16)
+        splits = [a for a in candidates if a[0] == "split"]
+        _apply(qb, rng.choice(splits or candidates))
+
+    states = [qb.copy()]
+    for _ in range(extra_plies):
+        if qb.status.over:
+            break
+        moves = [a for a in bot._candidates(qb, 0) if a[0] == "move"]
+        if not moves:
+            break
+        _apply(qb, moves[0])
+        states.append(qb.copy())
+    return states
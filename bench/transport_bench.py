@@ -0,0 +1,133 @@
+"""
+Benchmark transport state QuantumBoard ke worker: pickle vs shared memory (quantum/shared.py).
+
+    python -m bench.transport_bench --workers 4 --out transport.json
+
+Task per state sama di dua jalur: marginal piece per kotak (12, 64) pakai
+packed.plane_marginals. Bedanya cuma cara state sampai ke worker dan hasil balik:
+- pickle: QuantumBoard dikirim lewat pool.map (pickle semua chess.Board), worker
+  pack sendiri, hasil (12, 64) di-pickle balik.
+- shm   : state di-pack sekali ke SharedStates, task cuma bawa handle + range index,
+  worker baca kolom langsung dan nulis ke buffer hasil SharedArrays.
+Pool yang sama dipakai ulang (startup gak dihitung); tiap ukuran diulang --repeat kali, diambil median.
+Selain wall time end-to-end, dicatat juga biaya serialisasi murni (pickle dumps+loads vs pack ke shm).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import statistics
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from bench.states import superposed_states
+from quantum.packed import pack_boards, plane_marginals, probabilities
+from quantum.shared import SharedStates, state_marginals, worker_pool
+
+
+def _pickle_task(qb) -> np.ndarray:
+    recs = pack_boards([br.board for br in qb.branches], [br.amp for br in qb.branches])
+    return plane_marginals(recs["pieces"], probabilities(recs))
+
+
+def run_pickle(pool, boards, chunksize: int) -> np.ndarray:
+    return np.stack(pool.map(_pickle_task, boards, chunksize=chunksize))
+
+
+def run_shm(pool, boards, chunksize: int) -> np.ndarray:
+    return state_marginals(pool, boards, chunksize=chunksize)
+
+
+def serialization_cost(boards) -> dict:
+    t0 = perf_counter()
+    blob = pickle.dumps(boards, protocol=pickle.HIGHEST_PROTOCOL)
+    t1 = perf_counter()
+    pickle.loads(blob)
+    t2 = perf_counter()
+    with SharedStates.create(boards) as states:
+        t3 = perf_counter()
+        nbytes = states.nbytes
+        attached = SharedStates.attach(states.handle)
+        attached.close()
+        t4 = perf_counter()
+    return {
+        "pickle_bytes": len(blob),
+        "pickle_dumps_ms": (t1 - t0) * 1000.0,
+        "pickle_loads_ms": (t2 - t1) * 1000.0,
+        "shm_bytes": nbytes,
+        "shm_pack_ms": (t3 - t2) * 1000.0,
+        "shm_attach_ms": (t4 - t3) * 1000.0,
+    }
+
+
+def bench_case(pool, boards, *, chunksize: int, repeat: int) -> dict:
+    expected = run_pickle(pool, boards, chunksize)
+    got = run_shm(pool, boards, chunksize)
+    if not np.allclose(expected, got):
+        raise AssertionError("pickle and shared-memory results differ")
+
+    timings = {"pickle": [], "shm": []}
+    for _ in range(repeat):
+        for name, fn in (("pickle", run_pickle), ("shm", run_shm)):
+            t0 = perf_counter()
+            fn(pool, boards, chunksize)
+            timings[name].append((perf_counter() - t0) * 1000.0)
+
+    pickle_ms = statistics.median(timings["pickle"])
+    shm_ms = statistics.median(timings["shm"])
+    return {
+        "states": len(boards),
+        "branches_per_state": round(sum(len(qb.branches) for qb in boards) / len(boards), 1),
+        "pickle_ms": pickle_ms,
+        "shm_ms": shm_ms,
+        "speedup": pickle_ms / shm_ms if shm_ms > 0 else None,
+        "serialization": serialization_cost(boards),
+    }
+
+
+def make_states(count: int, branches: int, seed: int):
+    """`count` state dengan ~`branches` branch (disalin dari beberapa lintasan split)."""
+    pool = []
+    s = seed
+    while len(pool) < count:
+        pool.extend(superposed_states(branches, s, extra_plies=4))
+        s += 1
+    return pool[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pickle vs shared-memory transport of quantum states")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    parser.add_argument("--states", type=int, default=64)
+    parser.add_argument("--branches", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--out", default="-", help="result JSON (default stdout)")
+    args = parser.parse_args(argv)
+
+    cases = {}
+    with worker_pool(args.workers) as pool:
+        for branches in args.branches:
+            boards = make_states(args.states, branches, args.seed)
+            res = bench_case(pool, boards, chunksize=args.chunksize, repeat=args.repeat)
+            cases[f"branches_{branches}"] = res
+            print(
+                f"branches ~{res['branches_per_state']:7.1f} x {res['states']} states: "
+                f"pickle {res['pickle_ms']:8.1f} ms  shm {res['shm_ms']:8.1f} ms  (x{res['speedup']:.1f})",
+                file=sys.stderr,
+            )
+
+    text = json.dumps({"workers": args.workers, "chunksize": args.chunksize, "cases": cases}, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
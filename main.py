@@ -1,5 +1,40 @@
-from app.game import Game
+import os
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+# Urutan import buat startup report (waktu per modul dihitung inkremental)
+STARTUP_MODULES = [
+    "pygame",
+    "chess",
+    "quantum.quantum_board",
+    "quantum.adapter",
+    "ai.bot",
+    "render.renderer",
+    "app.assets",
+    "app.game",
+]
+
+
+def main():
+    from app.config import Config
+    from app.startup import StartupProfiler
+
+    report = "--startup-report" in sys.argv or os.environ.get("QLC_STARTUP_REPORT") == "1"
+    startup = StartupProfiler(report=report, budget_ms=Config.STARTUP_BUDGET_MS, t0=_T0)
+    for name in STARTUP_MODULES:
+        startup.import_module(name)
+
+    from app.game import Game
+
+    game_instance = Game(startup=startup)
+    if "--replay" in sys.argv:
+        # python main.py --replay rekaman.jsonl
+        game_instance.replay(sys.argv[sys.argv.index("--replay") + 1])
+        return
+    game_instance.start()
+
 
 if __name__ == "__main__":
-    game_instance = Game()
-    game_instance.start()
\ No newline at end of file
+    main()
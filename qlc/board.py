@@ -5,6 +5,11 @@ Board state backed by python-chess.
   are delegated to python-chess.
 - Quantum "lite" behavior is modeled as a weighted set of classical branches (each
   branch is a chess.Board).
+- Branch boards are stackless (copy(stack=False)). History lives in one shared ply
+  log; each branch points at its last ply, so copy cost per move doesn't grow with
+  game length. Repetition is detected by walking parent pointers. The log is
+  compacted once it doubles: only plies a live branch can still reach within its
+  halfmove clock are kept.
 """
 from __future__ import annotations
 
@@ -13,14 +18,25 @@ from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict
 
 import chess
-from .piece import Piece
+import chess.polyglot
+from .piece import Piece, QuantumPiece
 
 RC = Tuple[int, int]
 
+# Ukuran minimum log ply sebelum dicompact (lihat Board._compact_history)
+HISTORY_COMPACT_MIN = 256
+
+@dataclass
+class _Ply:
+    parent: int                  # index ply sebelumnya di history (-1 = posisi awal)
+    move: Optional[chess.Move]   # None buat posisi awal
+    key: int                     # zobrist hash posisi SETELAH move
+
 @dataclass
 class _Branch:
     board: chess.Board
     weight: float
+    node: int = 0                # index ply terakhir branch ini di Board._history
 
 
 def rc_to_square(r: int, c: int) -> chess.Square:
@@ -49,33 +65,120 @@ class Board:
       - move_log: List[str]
       - turn_color: 'w'|'b'
       - is_game_over(), result()
+      - registry / quantum_piece(pos, piece): QuantumRegistry milik game ini
     """
     def __init__(self, setup: bool = True, seed: int | None = None):
         self.rng = random.Random(seed)
         self.move_log: List[str] = []
 
         base = chess.Board() if setup else chess.Board(None)
-        self.branches: List[_Branch] = [_Branch(base, 1.0)]
+        # Log ply bersama; branch cuma simpan index ply terakhirnya
+        self._history: List[_Ply] = [_Ply(-1, None, chess.polyglot.zobrist_hash(base))]
+        self._history_limit = HISTORY_COMPACT_MIN
+        self.branches: List[_Branch] = [_Branch(base, 1.0, 0)]
+        self._registry = None
         self._normalize()
 
+    @property
+    def registry(self):
+        """QuantumRegistry game ini (dibuat waktu pertama dipakai, numpy baru di-import di sini)."""
+        if self._registry is None:
+            from .registry import QuantumRegistry
+            self._registry = QuantumRegistry()
+        return self._registry
+
+    def quantum_piece(self, pos: RC, piece: Piece) -> QuantumPiece:
+        """QuantumPiece di registry board ini (bukan registry default yang dipakai bareng)."""
+        return QuantumPiece(pos, piece, registry=self.registry)
+
     @property
     def turn_color(self) -> str:
         # python-chess: chess.WHITE True, chess.BLACK False
         return "w" if self._root().turn == chess.WHITE else "b"
 
     def is_game_over(self) -> bool:
-        return self._root().is_game_over()
+        return self._outcome(self._root_branch()) is not None
 
     def result(self) -> str:
-        return self._root().result()
+        outcome = self._outcome(self._root_branch())
+        return outcome.result() if outcome else "*"
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """Posisi cabang paling mungkin sudah muncul >= count kali (buat klaim threefold)."""
+        return self._repetitions(self._root_branch()) >= count
+
+    def is_fifty_moves(self) -> bool:
+        """50 langkah tanpa capture/pawn move (halfmove clock ikut tersimpan di board stackless)."""
+        return self._root().halfmove_clock >= 100
 
     def _root(self) -> chess.Board:
-        return max(self.branches, key=lambda b: b.weight).board
+        return self._root_branch().board
+
+    def _root_branch(self) -> _Branch:
+        return max(self.branches, key=lambda b: b.weight)
+
+    def _outcome(self, br: _Branch) -> Optional[chess.Outcome]:
+        """
+        Sama kayak Board.outcome() python-chess, tapi fivefold repetition dicek dari
+        history bersama (board stackless gak punya move stack).
+        """
+        outcome = br.board.outcome()
+        if outcome is None and self._repetitions(br) >= 5:
+            outcome = chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+        return outcome
+
+    def _repetitions(self, br: _Branch) -> int:
+        """
+        Hitung berapa kali posisi branch muncul di path-nya. Cukup mundur sebanyak
+        halfmove_clock ply: sebelum capture/pawn move posisi gak mungkin terulang.
+        """
+        node = self._history[br.node]
+        key = node.key
+        count = 1
+        for _ in range(br.board.halfmove_clock):
+            if node.parent < 0:
+                break
+            node = self._history[node.parent]
+            if node.key == key:
+                count += 1
+        return count
+
+    def _push(self, br: _Branch, mv: chess.Move, weight: float) -> _Branch:
+        """Copy stackless + push move, catat ply-nya di history bersama."""
+        b2 = br.board.copy(stack=False)
+        b2.push(mv)
+        self._history.append(_Ply(br.node, mv, chess.polyglot.zobrist_hash(b2)))
+        return _Branch(b2, weight, len(self._history) - 1)
+
+    def _compact_history(self) -> None:
+        """
+        Buang ply yang gak bisa dicapai lagi. _repetitions cuma mundur halfmove_clock ply
+        dari node branch, jadi cukup simpan ply itu; parent di luar jendela jadi -1.
+        Dipanggil tiap kali log udah dua kali ukuran setelah compact terakhir (amortized O(1)).
+        """
+        if len(self._history) <= self._history_limit:
+            return
+        keep: Dict[int, int] = {}  # index ply -> sisa langkah mundur terbesar yang masih butuh
+        for br in self.branches:
+            i, left = br.node, br.board.halfmove_clock
+            while i >= 0 and keep.get(i, -1) < left:
+                keep[i] = left
+                i, left = self._history[i].parent, left - 1
+
+        remap = {old: new for new, old in enumerate(sorted(keep))}
+        self._history = [
+            _Ply(remap.get(self._history[old].parent, -1), self._history[old].move, self._history[old].key)
+            for old in sorted(keep)
+        ]
+        for br in self.branches:
+            br.node = remap[br.node]
+        self._history_limit = max(HISTORY_COMPACT_MIN, 2 * len(self._history))
 
     def _normalize(self) -> None:
         total = sum(b.weight for b in self.branches)
         if total <= 0:
-            self.branches = [_Branch(self._root().copy(stack=True), 1.0)] 
+            root = self._root_branch()
+            self.branches = [_Branch(root.board.copy(stack=False), 1.0, root.node)]
             return
         for b in self.branches:
             b.weight /= total
@@ -153,12 +256,11 @@ class Board:
 
         new_branches: List[_Branch] = []
         for br, mv in chosen:
-            b2 = br.board.copy(stack=True) 
-            b2.push(mv)  
-            new_branches.append(_Branch(b2, br.weight))
+            new_branches.append(self._push(br, mv, br.weight))
 
         self.branches = new_branches
         self._normalize()
+        self._compact_history()
 
         self.move_log.append(f"{chess.square_name(from_sq)}->{chess.square_name(to_sq)}")  
         return "ok"
@@ -187,17 +289,15 @@ class Board:
             if b.is_capture(mv1) or b.is_capture(mv2):  
                 continue
 
-            b1 = b.copy(stack=True); b1.push(mv1)  
-            b2 = b.copy(stack=True); b2.push(mv2)  
-
-            new_branches.append(_Branch(b1, br.weight * 0.5))
-            new_branches.append(_Branch(b2, br.weight * 0.5))
+            new_branches.append(self._push(br, mv1, br.weight * 0.5))
+            new_branches.append(self._push(br, mv2, br.weight * 0.5))
 
         if not new_branches:
             return False
 
         self.branches = new_branches
         self._normalize()
+        self._compact_history()
         self.move_log.append(
             f"SPLIT {chess.square_name(from_sq)}->{chess.square_name(to1)} | {chess.square_name(to2)}"
         )  
@@ -1,5 +1,4 @@
 # chess/piece.py
-import random
 
 class Piece:
     """Representasi bidak klasik (dan versi 'lite' untuk quantum split)."""
@@ -27,54 +26,113 @@ class Piece:
         )
 
 class QuantumPiece:
-    """Menangani logika superposisi dan entanglement"""
-    def __init__(self, pos, piece_obj):
+    """
+    Menangani logika superposisi dan entanglement.
+
+    State & entanglement disimpan di QuantumRegistry (array flat, dipakai bareng
+    semua piece satu game). Objek ini cuma view: id piece + label state ('0', '00', '01', ...).
+
+    Registry-nya dari Board pemilik (Board.quantum_piece / Board.registry), jadi tiap
+    game punya graf sendiri.
+    """
+    # Fallback kalau gak dikasih registry: satu registry buat semua game di proses ini
+    default_registry = None
+
+    def __init__(self, pos, piece_obj, registry=None):
+        from .registry import QuantumRegistry  # numpy cuma dibutuhin kalau pakai quantum piece
+
+        if registry is None:
+            if QuantumPiece.default_registry is None:
+                QuantumPiece.default_registry = QuantumRegistry()
+            registry = QuantumPiece.default_registry
+        self.registry = registry
+
         self.piece_data = piece_obj.code # Simpan kode bidak misal 'wP'
-        # states: key=state_id, value=[pos, probability]
-        self.qnum = {'0': [pos, 1.0]} 
-        self.ent = [] # Entanglement list
- 
-    def measure(self):
-        """Collapse probabilitas ke satu state"""
-        total_prob = sum(state[1] for state in self.qnum.values())
-        rand = random.random() * total_prob
-        cum = 0.0
-        chosen_state = None
-
-        for st_id, (p, prob) in self.qnum.items():
-            cum += prob
-            if rand <= cum:
-                chosen_state = st_id
-                break
-
-        # Collapse: set chosen state=1.0, others=0
-        final_pos = self.qnum[chosen_state][0]
-        for st_id in self.qnum:
-            self.qnum[st_id][1] = 1.0 if st_id == chosen_state else 0.0
-        return final_pos
+        self.pid, sid = registry.add_piece(self.piece_data, _encode_pos(pos))
+        # label state -> state id global di registry
+        self._labels = {'0': sid}
+        registry.views[self.pid] = self
 
-    def entangle_oneblock(self, other_piece, target_pos):
-        """Entanglement: handle transitions, update ent list"""
+    @property
+    def qnum(self):
+        """View lama: {label: [pos, probability]} (cuma state yang masih hidup)."""
+        reg = self.registry
+        return {
+            label: [_decode_pos(int(reg.state_pos[sid])), float(reg.state_prob[sid])]
+            for label, sid in self._labels.items()
+            if reg.state_alive[sid]
+        }
 
-        x = self.qnum['0'][1]
-        y = other_piece.qnum['0'][1]
+    @property
+    def ent(self):
+        """View lama: [(piece lain, label state piece lain, label state sendiri), ...]."""
+        reg = self.registry
+        pieces = reg.views
+        out = []
+        for label, sid in self._labels.items():
+            if not reg.state_alive[sid]:
+                continue
+            for dst in reg.neighbors(sid).tolist():
+                other = pieces.get(int(reg.state_owner[dst]))
+                if other is not None:
+                    out.append((other, other._label_of(dst), label))
+        return out
 
-        # Misal, split state jadi 2 (x,y)
+    def release(self):
+        """Piece keluar dari papan (dimakan / reset): state-nya dibebasin dari registry."""
+        self.registry.remove_piece(self.pid)
+        self._labels = {}
+
+    @classmethod
+    def reset_default_registry(cls):
+        """Game baru tanpa registry dari board: kosongin registry default."""
+        if cls.default_registry is not None:
+            cls.default_registry.clear()
+
+    def _label_of(self, sid):
+        for label, s in self._labels.items():
+            if s == sid:
+                return label
+        return None
+
+    def measure(self, rng=None):
+        """
+        Collapse probabilitas ke satu state (ikut collapse-in piece yang ter-entangle).
+        Return posisi final piece ini.
+        """
+        final = self.registry.measure(self.pid, rng)
+        return _decode_pos(final[self.pid])
+
+    def entangle_oneblock(self, other_piece, target_pos):
+        """Entanglement: handle transitions, update ent list"""
+        reg = self.registry
         my_state = '0'
         other_state = '0'
 
+        my_sid = self._labels[my_state]
+        x = float(reg.state_prob[my_sid])
+        y = float(reg.state_prob[other_piece._labels[other_state]])
+
+        # Misal, split state jadi 2 (x,y)
         a = x * y
         b = x * (1 - y)
 
         # Update probabilities
-        self.qnum[my_state + '0'] = [self.qnum[my_state][0], a]
-        self.qnum[my_state + '1'] = [target_pos, b]
-        del self.qnum[my_state]
+        stay, moved = reg.split(my_sid, [(int(reg.state_pos[my_sid]), a), (_encode_pos(target_pos), b)])
+        del self._labels[my_state]
+        self._labels[my_state + '0'] = stay
+        self._labels[my_state + '1'] = moved
 
+        # other di state '0' <-> piece ini pindah; other di state kebalikannya <-> diam
         last_state = other_state[:-1] + str(int(not int(other_state[-1])))
+        reg.entangle(other_piece._labels[other_state], moved)
+        if last_state in other_piece._labels:
+            reg.entangle(other_piece._labels[last_state], stay)
+
+
+def _encode_pos(pos):
+    r, c = pos
+    return r * 8 + c
 
-        other_piece.ent.append((self, my_state + '1', other_state))
-        other_piece.ent.append((self, my_state + '0', last_state))
-        
-        self.ent.append((other_piece, other_state, my_state + '1'))
-        self.ent.append((other_piece, last_state, my_state + '0'))
\ No newline at end of file
+def _decode_pos(code):
+    return divmod(code, 8)
@@ -0,0 +1,239 @@
+"""
+Registry array-flat buat semua QuantumPiece.
+
+- State semua piece (owner, posisi, probabilitas) disimpan di array numpy,
+  bukan dict per objek dengan key string biner yang terus memanjang.
+- Entanglement = edge berarah antar state (src terpilih => dst dipaksa),
+  disimpan sebagai array COO dan dikonversi ke CSR (indptr/indices) kalau perlu.
+- Measurement: prefix-sum + binary search (np.searchsorted) di state milik piece,
+  lalu collapse menjalar lewat edge entanglement per level secara vektor.
+- Index per owner (list state hidup per piece), jadi sample/collapse gak pernah
+  scan semua state. State yang mati (split, kalah collapse, piece dibuang) dibebasin
+  bareng edge-nya; kalau state mati sudah lebih banyak dari yang hidup, array di-compact.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class QuantumRegistry:
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, int(capacity))
+        # Per state
+        self.state_owner = np.zeros(capacity, dtype=np.int32)
+        self.state_pos = np.zeros(capacity, dtype=np.int32)
+        self.state_prob = np.zeros(capacity, dtype=np.float64)
+        self.state_alive = np.zeros(capacity, dtype=bool)
+        self.n_states = 0
+
+        # Per piece
+        self.piece_code: List[str] = []
+        self.owned: Dict[int, List[int]] = {}  # piece_id (masih di papan) -> state id hidup
+        self.n_dead = 0
+        self.views: Dict[int, object] = {}  # piece_id -> objek view (mis. QuantumPiece)
+
+        # Edge entanglement (COO), src state -> dst state
+        self.edge_src = np.zeros(capacity, dtype=np.int32)
+        self.edge_dst = np.zeros(capacity, dtype=np.int32)
+        self.n_edges = 0
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # Storage helpers
+    @staticmethod
+    def _grow(arr: np.ndarray, need: int) -> np.ndarray:
+        if need <= len(arr):
+            return arr
+        out = np.zeros(max(need, 2 * len(arr)), dtype=arr.dtype)
+        out[: len(arr)] = arr
+        return out
+
+    def _new_states(self, owner: int, states: Sequence[Tuple[int, float]]) -> List[int]:
+        start = self.n_states
+        end = start + len(states)
+        self.state_owner = self._grow(self.state_owner, end)
+        self.state_pos = self._grow(self.state_pos, end)
+        self.state_prob = self._grow(self.state_prob, end)
+        self.state_alive = self._grow(self.state_alive, end)
+
+        self.state_owner[start:end] = owner
+        self.state_pos[start:end] = [pos for pos, _ in states]
+        self.state_prob[start:end] = [prob for _, prob in states]
+        self.state_alive[start:end] = True
+        self.n_states = end
+        self._csr = None  # indptr harus ikut panjang jumlah state
+        sids = list(range(start, end))
+        self.owned[owner].extend(sids)
+        return sids
+
+    def _free_states(self, sids: Sequence[int]) -> None:
+        """Matiin state + buang edge yang nempel ke state itu."""
+        if not len(sids):
+            return
+        sids = np.asarray(sids, dtype=np.int64)
+        dead = set(sids.tolist())
+        for pid in np.unique(self.state_owner[sids]).tolist():
+            if pid in self.owned:
+                self.owned[pid] = [s for s in self.owned[pid] if s not in dead]
+        self.state_alive[sids] = False
+        self.state_prob[sids] = 0.0
+        self.n_dead += len(dead)
+
+        if self.n_edges:
+            e = self.n_edges
+            keep = ~(np.isin(self.edge_src[:e], sids) | np.isin(self.edge_dst[:e], sids))
+            kept = int(keep.sum())
+            if kept != e:
+                self.edge_src[:kept] = self.edge_src[:e][keep]
+                self.edge_dst[:kept] = self.edge_dst[:e][keep]
+                self.n_edges = kept
+                self._csr = None
+
+    def _maybe_compact(self) -> None:
+        if self.n_dead > max(64, self.n_states - self.n_dead):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Buang state mati dari array dan nomori ulang state hidup (urutan tetap).
+        Label di view (QuantumPiece._labels) ikut dipetakan ulang.
+        """
+        n = self.n_states
+        alive = self.state_alive[:n].copy()
+        new_id = np.cumsum(alive) - 1
+        for name in ("state_owner", "state_pos", "state_prob", "state_alive"):
+            arr = getattr(self, name)
+            live = arr[:n][alive]
+            arr[: len(live)] = live
+            arr[len(live):n] = 0
+        self.n_states = int(alive.sum())
+        self.n_dead = 0
+
+        e = self.n_edges
+        self.edge_src[:e] = new_id[self.edge_src[:e]]
+        self.edge_dst[:e] = new_id[self.edge_dst[:e]]
+        self._csr = None
+        self.owned = {pid: [int(new_id[s]) for s in sids] for pid, sids in self.owned.items()}
+        for view in self.views.values():
+            labels = getattr(view, "_labels", None)
+            if labels is not None:
+                view._labels = {label: int(new_id[sid]) for label, sid in labels.items() if alive[sid]}
+
+    # Pieces & states
+    def add_piece(self, code: str, pos: int, prob: float = 1.0) -> Tuple[int, int]:
+        """Daftarin piece baru dengan satu state. Return (piece_id, state_id)."""
+        pid = len(self.piece_code)
+        self.piece_code.append(code)
+        self.owned[pid] = []
+        (sid,) = self._new_states(pid, [(pos, prob)])
+        return pid, sid
+
+    def remove_piece(self, pid: int) -> None:
+        """Piece keluar (dimakan / reset): semua state + edge-nya dibebasin."""
+        self._free_states(self.owned.pop(pid, []))
+        self.views.pop(pid, None)
+        self._maybe_compact()
+
+    def clear(self) -> None:
+        """Kosongin registry (game baru)."""
+        self.__init__(len(self.state_owner))
+
+    def states_of(self, pid: int) -> np.ndarray:
+        return np.asarray(self.owned.get(pid, ()), dtype=np.int64)
+
+    def split(self, sid: int, outcomes: Sequence[Tuple[int, float]]) -> List[int]:
+        """
+        Ganti state `sid` dengan beberapa state baru [(pos, prob), ...].
+        Edge yang nempel ke `sid` ikut dibuang (state-nya sudah gak ada).
+        """
+        owner = int(self.state_owner[sid])
+        self._free_states([sid])  # compact nunggu collapse/remove (view lagi pegang sid lama)
+        return self._new_states(owner, outcomes)
+
+    def entangle(self, sid_a: int, sid_b: int) -> None:
+        """Korelasi dua arah: a terpilih => b dipaksa, dan sebaliknya."""
+        end = self.n_edges + 2
+        self.edge_src = self._grow(self.edge_src, end)
+        self.edge_dst = self._grow(self.edge_dst, end)
+        self.edge_src[self.n_edges : end] = (sid_a, sid_b)
+        self.edge_dst[self.n_edges : end] = (sid_b, sid_a)
+        self.n_edges = end
+        self._csr = None
+
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Graf entanglement versi CSR: neighbor state s = indices[indptr[s]:indptr[s+1]]."""
+        if self._csr is None:
+            src = self.edge_src[: self.n_edges]
+            order = np.argsort(src, kind="stable")
+            indices = self.edge_dst[: self.n_edges][order]
+            indptr = np.searchsorted(src[order], np.arange(self.n_states + 1))
+            self._csr = (indptr.astype(np.int64), indices)
+        return self._csr
+
+    def neighbors(self, sid: int) -> np.ndarray:
+        indptr, indices = self.adjacency()
+        return indices[indptr[sid] : indptr[sid + 1]]
+
+    # Measurement
+    def sample(self, pid: int, rng: Optional[random.Random] = None) -> int:
+        """Pilih satu state piece sesuai probabilitasnya (prefix-sum + binary search)."""
+        idx = self.states_of(pid)
+        if len(idx) == 0:
+            raise KeyError(f"piece {pid} has no live states")
+
+        cum = np.cumsum(self.state_prob[idx])
+        total = cum[-1]
+        if total <= 0:
+            return int(idx[0])
+        r = (rng or random).random() * total
+        k = int(np.searchsorted(cum, r, side="right"))
+        return int(idx[min(k, len(idx) - 1)])
+
+    def measure(self, pid: int, rng: Optional[random.Random] = None) -> Dict[int, int]:
+        """
+        Collapse piece `pid`, lalu jalarin ke semua piece yang ter-entangle.
+        Return {piece_id: posisi final} buat semua piece yang ikut collapse.
+        """
+        return self.collapse([self.sample(pid, rng)])
+
+    def collapse(self, chosen: Iterable[int]) -> Dict[int, int]:
+        """
+        Collapse ke state `chosen` (menjalar lewat entanglement). State lain milik
+        piece yang collapse dibebasin. Return {piece_id: posisi final}.
+        """
+        owner = self.state_owner
+        indptr, indices = self.adjacency()
+        losers: List[int] = []
+
+        frontier = np.unique(np.asarray(list(chosen), dtype=np.int64))
+        done: set = set()
+        result: Dict[int, int] = {}
+
+        while len(frontier):
+            # Piece yang sudah collapse gak di-collapse ulang (state pertama yang menang)
+            frontier = frontier[[int(o) not in done for o in owner[frontier]]]
+            frontier = frontier[np.unique(owner[frontier], return_index=True)[1]]
+            if not len(frontier):
+                break
+
+            pieces = owner[frontier]
+            done.update(pieces.tolist())
+            keep = set(frontier.tolist())
+            for pid in pieces.tolist():
+                losers.extend(s for s in self.owned[pid] if s not in keep)
+            self.state_prob[frontier] = 1.0
+            result.update(zip(pieces.tolist(), self.state_pos[frontier].tolist()))
+
+            # Level berikutnya: semua neighbor dari state yang barusan terpilih
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            if not counts.sum():
+                break
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            frontier = np.unique(indices[offsets])
+
+        self._free_states(losers)
+        self._maybe_compact()
+        return result
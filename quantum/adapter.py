@@ -0,0 +1,173 @@
+"""
+Adapter QuantumBoard -> API Board lama (dipakai Game/Renderer/Bot).
+Gak import pygame, jadi bisa dipakai headless.
+"""
+import chess
+
+from .quantum_board import QuantumBoard
+
+class UIPiece:
+    """
+    Piece versi UI biar Renderer & Game lama tetap jalan.
+    - symbol: 'P','p','K','k', dll (format python-chess)
+    - prob: probabilitas piece paling dominan di square itu
+    """
+    def __init__(self, symbol: str, prob: float):
+        self.symbol = symbol
+        self.prob = prob
+
+    @property
+    def color(self) -> str:
+        return "w" if self.symbol.isupper() else "b"
+
+    @property
+    def kind(self) -> str:
+        return self.symbol.upper()  # 'p' -> 'P'
+
+    @property
+    def code(self) -> str:
+        return f"{self.color}{self.kind}"
+
+
+class QuantumBoardAdapter:
+    """
+    Membuat QuantumBoard "terlihat" seperti Board lama.
+    """
+    def __init__(self, *, seed: int = 123, max_branches: int = 64, telemetry=None, merge_key: str = "fen", qb=None):
+        # qb bisa dikasih dari luar (mis. state hasil replay)
+        if qb is None:
+            qb = QuantumBoard(seed=seed, max_branches=max_branches, telemetry=telemetry, merge_key=merge_key)
+        self.qb = qb
+        self.move_log = []
+        # Versi terstruktur dari move_log (square python-chess):
+        # ("move", from_sq, to_sq) atau ("split", from_sq, to_a, to_b)
+        self.actions = []
+        # Opsional: quantum.replay.Recorder, dipanggil setelah tiap action sukses
+        self.recorder = None
+
+        # Piece UI per kotak, di-update dari BoardDelta (cuma kotak yang berubah)
+        self._pieces = {}
+        self._pieces_version = -1
+        qb.subscribe(self._on_delta, weak=True)
+
+    def detach(self) -> None:
+        """Berhenti dengar delta qb (mis. sebelum replay jalanin banyak action sekaligus)."""
+        self.qb.unsubscribe(self._on_delta)
+
+    def rebind(self, qb) -> None:
+        """Ganti QuantumBoard yang ditampilkan (mis. hasil replay seek); piece UI dibangun ulang sekali."""
+        self.detach()
+        self.qb = qb
+        self._pieces_version = -1
+        qb.subscribe(self._on_delta, weak=True)
+
+    @property
+    def turn_color(self) -> str:
+        return "w" if self.qb.turn() == chess.WHITE else "b"
+
+    @property
+    def telemetry(self):
+        return self.qb.telemetry
+
+    @property
+    def version(self) -> int:
+        """Naik tiap kali state quantum berubah (buat redraw berbasis event)."""
+        return self.qb.version
+
+    @property
+    def branches(self):
+        # biar kalo ada kode lain yg iterasi branch
+        return self.qb.branches
+
+    def iter_branches(self):
+        return self.qb.iter_branches()
+
+    def get_piece(self, r: int, c: int):
+        if self._pieces_version != self.qb.version:
+            # Belum ada delta buat versi ini (mis. qb diubah tanpa lewat move/split): bangun ulang semua
+            marginals = self.qb.marginals()
+            self._pieces = {sq: _ui_piece(dist) for sq, dist in enumerate(marginals)}
+            self._pieces_version = self.qb.version
+        return self._pieces[QuantumBoard.rc_to_square(r, c)]
+
+    def _on_delta(self, delta):
+        if self._pieces_version != delta.version - 1:
+            self._pieces_version = -1  # ada versi yang kelewat -> rebuild penuh di get_piece
+            return
+        for sq, dist in delta.squares.items():
+            self._pieces[sq] = _ui_piece(dist)
+        self._pieces_version = delta.version
+
+    def get_valid_moves(self, r: int, c: int):
+        """
+        Union legal-moves dari semua branch untuk piece di (r,c).
+        python-chess punya board.legal_moves sebagai generator move legal
+        """
+        from_sq = QuantumBoard.rc_to_square(r, c)
+        out = set()
+
+        for br in self.qb.iter_branches():
+            b = br.board
+            p = b.piece_at(from_sq)
+            if p is None or p.color != b.turn:
+                continue
+
+            for mv in b.legal_moves:
+                if mv.from_square == from_sq:
+                    rr, cc = QuantumBoard.square_to_rc(mv.to_square)
+                    out.add((rr, cc))
+
+        return list(out)
+
+    def apply_move(self, start_rc, end_rc):
+        from_sq = QuantumBoard.rc_to_square(*start_rc)
+        to_sq = QuantumBoard.rc_to_square(*end_rc)
+
+        ok = self.qb.apply_move(from_sq, to_sq)
+        if ok:
+            self.move_log.append(f"MOVE {start_rc} -> {end_rc}")
+            self._record(("move", from_sq, to_sq))
+            return "ok"
+        return "illegal"
+
+    def split_piece(self, start_rc, a_rc, b_rc):
+        from_sq = QuantumBoard.rc_to_square(*start_rc)
+        to_a = QuantumBoard.rc_to_square(*a_rc)
+        to_b = QuantumBoard.rc_to_square(*b_rc)
+
+        ok = self.qb.apply_split(from_sq, to_a, to_b)
+        if ok:
+            self.move_log.append(f"SPLIT {start_rc} -> {a_rc} | {b_rc}")
+            self._record(("split", from_sq, to_a, to_b))
+        return ok
+
+    def _record(self, action):
+        self.actions.append(action)
+        if self.recorder is not None:
+            self.recorder.record(action, self.qb, self.move_log[-1])
+
+    @property
+    def status(self):
+        """GameStatus yang di-cache QuantumBoard (dihitung ulang cuma setelah move)."""
+        return self.qb.status
+
+    def is_game_over(self):
+        return self.qb.status.over
+
+    def result(self):
+        return self.qb.status.result
+
+
+def _ui_piece(dist):
+    """Piece paling mungkin di satu kotak (None kalau kosong di semua branch)."""
+    best_sym = None
+    best_p = 0.0
+    for sym, p in dist.items():
+        if sym is None:
+            continue
+        if p > best_p:
+            best_sym, best_p = sym, p
+
+    if best_sym is None or best_p <= 0.0:
+        return None
+    return UIPiece(best_sym, best_p)
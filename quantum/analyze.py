@@ -0,0 +1,239 @@
+"""
+Analisis batch rekaman game (lihat quantum/replay.py) pakai process pool.
+
+    python -m quantum.analyze recordings/ --out stats.jsonl --workers 8
+
+Tiap game di-replay penuh dari keyframe 0 dengan Telemetry terpasang. Output
+JSONL streaming: satu baris {"type": "game", ...} per game (urutan selesai, bukan
+urutan file), lalu satu baris {"type": "aggregate", ...} di akhir. Memori tetap
+datar: hasil per game langsung ditulis, yang disimpan cuma agregat berjalan.
+
+--marginals DIR: per rekaman juga ditulis <nama>.marginals.npy, marginal piece per
+kotak tiap ply (plies + 1, 12, 64). Dihitung di worker yang sama, di replay yang sama,
+dan ditulis per ply ke .npy (memmap), jadi gak ada state yang ditumpuk di memori.
+
+Capture dihitung dari measurement move itu (QuantumBoard.last_measurements):
+measurement "capture" = attempt, success kalau hasilnya capture terjadi. Move yang
+capture di semua branch (gak ada measurement) langsung dihitung attempt + success.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from functools import partial
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .packed import plane_marginals, probabilities
+from .replay import Replay, apply_action
+from .telemetry import Telemetry
+
+
+def iter_recordings(root: str) -> Iterator[str]:
+    """Path file .jsonl di bawah root (rekursif, lazy)."""
+    if os.path.isfile(root):
+        yield root
+        return
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            if name.endswith(".jsonl"):
+                yield os.path.join(dirpath, name)
+
+
+def _opponent_mass(qb, square: int, mover: bool) -> float:
+    dist = qb.square_distribution(square)
+    return sum(p for sym, p in dist.items() if sym is not None and sym.isupper() != mover)
+
+
+def _certain_capture(qb, from_sq: int, to_sq: int) -> bool:
+    """Move ini capture legal di semua branch yang gak ketutup piece sendiri (jadi gak ada measurement capture)."""
+    seen = False
+    for br in qb.iter_branches():
+        b = br.board
+        tgt = b.piece_at(to_sq)
+        if tgt is not None and tgt.color == b.turn:
+            continue  # branch ini ikut measurement "occupied", bukan capture
+        try:
+            mv = b.find_move(from_sq, to_sq)
+        except ValueError:
+            return False
+        if not b.is_capture(mv):
+            return False
+        seen = True
+    return seen
+
+
+def _square_marginals(qb) -> np.ndarray:
+    """Marginal piece per kotak (12, 64) state sekarang."""
+    return sum(plane_marginals(recs["pieces"], probabilities(recs)) for recs in qb.packed_chunks())
+
+
+def _marginals_path(path: str, out_dir: str) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir, f"{name}.marginals.npy")
+
+
+def analyze_game(path: str, marginals_dir: Optional[str] = None) -> dict:
+    """
+    Replay satu rekaman, return statistik per game (dict JSON-able).
+    marginals_dir: sekalian tulis marginal tiap ply ke <nama>.marginals.npy di situ.
+    """
+    try:
+        replay = Replay(path)
+        qb = replay.load_keyframe(0)
+        qb.telemetry = telemetry = Telemetry(max(1, len(replay)))
+
+        marginals = None
+        if marginals_dir:
+            marginals = np.lib.format.open_memmap(
+                _marginals_path(path, marginals_dir), mode="w+", dtype="<f8", shape=(len(replay) + 1, 12, 64)
+            )
+            marginals[0] = _square_marginals(qb)
+
+        attempted = succeeded = 0
+        for ply, action in enumerate(replay.actions, 1):
+            if action[0] != "move":
+                apply_action(qb, action)
+                if marginals is not None:
+                    marginals[ply] = _square_marginals(qb)
+                continue
+            certain = _opponent_mass(qb, action[2], qb.turn()) > 0 and _certain_capture(qb, action[1], action[2])
+            apply_action(qb, action)
+            if marginals is not None:
+                marginals[ply] = _square_marginals(qb)
+            captures = [m for m in qb.last_measurements if m.kind == "capture"]
+            if captures:
+                attempted += 1
+                succeeded += captures[-1].outcome
+            elif certain and not any(m.kind == "occupied" and m.outcome for m in qb.last_measurements):
+                attempted += 1
+                succeeded += 1
+
+        if marginals is not None:
+            marginals.flush()
+            del marginals
+
+        rows = telemetry.rows()
+        latency = rows["latency_ms"]
+        game = {
+            "type": "game",
+            "file": path,
+            "plies": len(replay),
+            "result": qb.status.result,
+            "branch_curve": rows["branches_after"].tolist(),
+            "max_branches_seen": int(rows["branches_after"].max()) if len(rows) else 1,
+            "measurements": int(rows["measurements"].sum()),
+            "captures_attempted": attempted,
+            "captures_succeeded": succeeded,
+            "ms_per_ply_mean": float(latency.mean()) if len(rows) else 0.0,
+            "ms_per_ply_max": float(latency.max()) if len(rows) else 0.0,
+        }
+        if marginals_dir:
+            game["marginals"] = _marginals_path(path, marginals_dir)
+        return game
+    except Exception as exc:  # rekaman rusak gak boleh bikin seluruh batch gagal
+        return {"type": "error", "file": path, "error": f"{type(exc).__name__}: {exc}"}
+
+
+class Aggregate:
+    """Agregat berjalan; ukurannya gak tergantung jumlah game (kecuali kurva per ply)."""
+    def __init__(self):
+        self.games = 0
+        self.errors = 0
+        self.marginals_written = 0
+        self.plies = 0
+        self.results: Counter = Counter()
+        self.measurements = 0
+        self.captures_attempted = 0
+        self.captures_succeeded = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.curve_sum: List[int] = []
+        self.curve_count: List[int] = []
+
+    def add(self, game: dict) -> None:
+        if game["type"] != "game":
+            self.errors += 1
+            return
+        self.games += 1
+        self.marginals_written += "marginals" in game
+        self.plies += game["plies"]
+        self.results[game["result"]] += 1
+        self.measurements += game["measurements"]
+        self.captures_attempted += game["captures_attempted"]
+        self.captures_succeeded += game["captures_succeeded"]
+        self.latency_total_ms += game["ms_per_ply_mean"] * game["plies"]
+        self.latency_max_ms = max(self.latency_max_ms, game["ms_per_ply_max"])
+
+        curve = game["branch_curve"]
+        if len(curve) > len(self.curve_sum):
+            grow = len(curve) - len(self.curve_sum)
+            self.curve_sum.extend([0] * grow)
+            self.curve_count.extend([0] * grow)
+        for i, n in enumerate(curve):
+            self.curve_sum[i] += n
+            self.curve_count[i] += 1
+
+    def to_dict(self) -> Dict[str, object]:
+        plies = max(1, self.plies)
+        return {
+            "type": "aggregate",
+            "games": self.games,
+            "errors": self.errors,
+            "plies": self.plies,
+            "results": dict(self.results),
+            "measurements_per_ply": self.measurements / plies,
+            "captures_attempted": self.captures_attempted,
+            "capture_success_rate": (
+                self.captures_succeeded / self.captures_attempted if self.captures_attempted else None
+            ),
+            "ms_per_ply_mean": self.latency_total_ms / plies,
+            "ms_per_ply_max": self.latency_max_ms,
+            "mean_branch_curve": [s / c for s, c in zip(self.curve_sum, self.curve_count)],
+            "marginals_written": self.marginals_written,
+        }
+
+
+def run(root: str, out, *, workers=None, chunksize: int = 4, marginals_dir=None) -> dict:
+    if marginals_dir:
+        os.makedirs(marginals_dir, exist_ok=True)
+    task = partial(analyze_game, marginals_dir=marginals_dir)
+    agg = Aggregate()
+    t0 = time.perf_counter()
+    with Pool(workers) as pool:
+        for game in pool.imap_unordered(task, iter_recordings(root), chunksize=chunksize):
+            out.write(json.dumps(game) + "\n")
+            agg.add(game)
+    summary = agg.to_dict()
+    summary["wall_s"] = time.perf_counter() - t0
+    out.write(json.dumps(summary) + "\n")
+    out.flush()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded games in parallel and collect statistics")
+    parser.add_argument("root", help="recording file or directory of .jsonl recordings")
+    parser.add_argument("--out", default="-", help="output JSONL (default stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4)
+    parser.add_argument("--marginals", metavar="DIR", help="also write per-ply square marginals (.npy) here")
+    args = parser.parse_args(argv)
+
+    kwargs = {"workers": args.workers, "chunksize": args.chunksize, "marginals_dir": args.marginals}
+    if args.out == "-":
+        summary = run(args.root, sys.stdout, **kwargs)
+    else:
+        with open(args.out, "w", encoding="utf-8") as out:
+            summary = run(args.root, out, **kwargs)
+        print(f"{summary['games']} games ({summary['errors']} errors) in {summary['wall_s']:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Penyimpanan branch ter-delta terhadap satu posisi dasar (base).
+
+Kebanyakan branch QuantumBoard cuma beda beberapa kotak. Di sini placement
+disimpan sekali sebagai base (64 kode kotak), dan tiap branch cuma nyimpan:
+- diff kotak: (square, kode) buat kotak yang isinya beda dari base (2 byte per kotak)
+- state flag: turn, castling, ep, clock + amplitude (lihat STATE_DTYPE)
+
+Diff disimpan flat ala CSR (diff_ptr/diff_sq/diff_code). Kalau rata-rata diff per
+branch lewat `rebase_threshold`, base dipilih ulang otomatis: per kotak, isi yang
+paling sering muncul di semua branch (ini yang bikin total diff paling kecil).
+
+Kode kotak: 0 = kosong, 1..12 = urutan PLANE_SYMBOLS + 1 (sama dengan packed.square_codes).
+
+DeltaBranchSet juga punya interface store yang sama dengan spill.BranchStore
+(append/chunks/take/column/first/close), jadi DeltaQuantumBoard = langkah streaming
+SpillingQuantumBoard dengan DeltaBranchSet sebagai storage branch: per chunk
+record di-rebuild dari base + diff, move dijalanin, hasilnya ditulis balik jadi diff
+(rebase dicek tiap append). Array di sini gak pernah diubah di tempat (selalu diganti),
+jadi copy() cukup berbagi array.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import chess
+import numpy as np
+
+from .packed import BRANCH_DTYPE, PLANE_SYMBOLS, codes_to_pieces, pack_boards, square_codes
+from .quantum_board import Branch, QuantumBoard
+from .spill import SpillingQuantumBoard
+
+STATE_DTYPE = np.dtype([
+    ("castling", "<u8"),
+    ("amp", "<c16"),
+    ("fullmove", "<u4"),
+    ("halfmove", "<u2"),
+    ("ep", "i1"),
+    ("turn", "u1"),
+])
+
+_SYMBOL_OF_CODE = [None] + list(PLANE_SYMBOLS)
+_PIECE_OF_CODE = [None] + [chess.Piece.from_symbol(sym) for sym in PLANE_SYMBOLS]
+
+
+class DeltaBranchSet:
+    def __init__(self, base: Optional[np.ndarray] = None, *, rebase_threshold: float = 6.0, chunk_size: int = 4096):
+        # Base kosong (None) = diambil dari consensus record pertama yang masuk
+        self._base_set = base is not None
+        self.base = np.zeros(64, dtype=np.uint8) if base is None else np.asarray(base, dtype=np.uint8).copy()
+        self.rebase_threshold = float(rebase_threshold)
+        self.chunk_size = int(chunk_size)
+        self.state = np.zeros(0, dtype=STATE_DTYPE)
+        self.diff_ptr = np.zeros(1, dtype=np.int64)
+        self.diff_sq = np.zeros(0, dtype=np.uint8)
+        self.diff_code = np.zeros(0, dtype=np.uint8)
+        self.rebases = 0
+
+    # Konstruksi
+    @classmethod
+    def from_boards(cls, boards: Sequence[chess.Board], amps: Iterable[complex], **kwargs) -> "DeltaBranchSet":
+        recs = pack_boards(boards, amps)
+        codes = square_codes(recs)
+        out = cls(_consensus(codes) if len(codes) else None, **kwargs)
+        out._append(recs, codes)
+        return out
+
+    @classmethod
+    def from_branches(cls, branches: Sequence[Branch], **kwargs) -> "DeltaBranchSet":
+        return cls.from_boards([br.board for br in branches], [br.amp for br in branches], **kwargs)
+
+    def extend(self, boards: Sequence[chess.Board], amps: Iterable[complex]) -> None:
+        self.append(pack_boards(boards, amps))
+
+    def append(self, recs: np.ndarray) -> None:
+        """Tambah record BRANCH_DTYPE (interface store); rebase kalau diff rata-rata kebesaran."""
+        if not len(recs):
+            return
+        self._append(recs, square_codes(recs))
+        if self.mean_diff > self.rebase_threshold:
+            self.rebase()
+
+    def _append(self, recs: np.ndarray, codes: np.ndarray) -> None:
+        if not self._base_set and len(codes):
+            self.base = _consensus(codes)
+            self._base_set = True
+        state = np.zeros(len(recs), dtype=STATE_DTYPE)
+        for name in STATE_DTYPE.names:
+            state[name] = recs[name]
+
+        rows, squares = np.nonzero(codes != self.base)
+        counts = np.bincount(rows, minlength=len(recs))
+        self.state = np.concatenate([self.state, state])
+        self.diff_ptr = np.concatenate([self.diff_ptr, self.diff_ptr[-1] + np.cumsum(counts)])
+        self.diff_sq = np.concatenate([self.diff_sq, squares.astype(np.uint8)])
+        self.diff_code = np.concatenate([self.diff_code, codes[rows, squares]])
+
+    # Base
+    def codes(self) -> np.ndarray:
+        """Placement lengkap semua branch, (N, 64) u1 (sementara, buat rebase/debug)."""
+        out = np.repeat(self.base[None, :], len(self), axis=0)
+        out[self._diff_rows(), self.diff_sq] = self.diff_code
+        return out
+
+    def rebase(self) -> None:
+        """Pilih base baru (isi terbanyak per kotak) lalu hitung ulang semua diff."""
+        if not len(self):
+            return
+        codes = self.codes()
+        self.base = _consensus(codes)
+        rows, squares = np.nonzero(codes != self.base)
+        self.diff_ptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(self)))])
+        self.diff_sq = squares.astype(np.uint8)
+        self.diff_code = codes[rows, squares]
+        self.rebases += 1
+
+    # Info
+    def __len__(self) -> int:
+        return len(self.state)
+
+    @property
+    def mean_diff(self) -> float:
+        return len(self.diff_sq) / len(self) if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.base.nbytes + self.state.nbytes + self.diff_ptr.nbytes
+            + self.diff_sq.nbytes + self.diff_code.nbytes
+        )
+
+    def bytes_per_branch(self) -> float:
+        return self.nbytes / len(self) if len(self) else 0.0
+
+    def probabilities(self) -> np.ndarray:
+        amp = self.state["amp"]
+        return amp.real * amp.real + amp.imag * amp.imag
+
+    def _diff_rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.diff_ptr))
+
+    # Query langsung dari base + diff
+    def square_distribution(self, square: int) -> Dict[Optional[str], float]:
+        probs = self.probabilities()
+        hit = self.diff_sq == square
+        rows = self._diff_rows()[hit]
+        over = np.bincount(self.diff_code[hit], weights=probs[rows], minlength=13)
+
+        dist: Dict[Optional[str], float] = defaultdict(float)
+        dist[_SYMBOL_OF_CODE[self.base[square]]] += float(probs.sum() - over.sum())
+        for code in np.flatnonzero(over):
+            dist[_SYMBOL_OF_CODE[code]] += float(over[code])
+        return {sym: p for sym, p in dist.items() if p > 0}
+
+    def piece_probability(self, square: int) -> float:
+        return 1.0 - self.square_distribution(square).get(None, 0.0)
+
+    # Balik ke chess.Board
+    def board(self, i: int) -> chess.Board:
+        codes = self.base.copy()
+        lo, hi = self.diff_ptr[i], self.diff_ptr[i + 1]
+        codes[self.diff_sq[lo:hi]] = self.diff_code[lo:hi]
+
+        b = chess.Board(None)
+        b.set_piece_map({sq: _PIECE_OF_CODE[c] for sq, c in enumerate(codes.tolist()) if c})
+        st = self.state[i]
+        b.turn = bool(st["turn"])
+        b.castling_rights = int(st["castling"])
+        b.ep_square = int(st["ep"]) if st["ep"] >= 0 else None
+        b.halfmove_clock = int(st["halfmove"])
+        b.fullmove_number = int(st["fullmove"])
+        return b
+
+    def to_branches(self) -> List[Branch]:
+        return [Branch(self.board(i), complex(self.state["amp"][i])) for i in range(len(self))]
+
+    # Interface store (sama dengan spill.BranchStore)
+    def take(self, indices) -> np.ndarray:
+        """Record BRANCH_DTYPE (bitboard dibangun dari base + diff) buat index yang diminta."""
+        idx = np.asarray(indices, dtype=np.int64)
+        codes = np.repeat(self.base[None, :], len(idx), axis=0)
+        starts = self.diff_ptr[idx]
+        counts = self.diff_ptr[idx + 1] - starts
+        total = int(counts.sum())
+        if total:
+            pos = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            codes[np.repeat(np.arange(len(idx)), counts), self.diff_sq[pos]] = self.diff_code[pos]
+
+        out = np.zeros(len(idx), dtype=BRANCH_DTYPE)
+        out["pieces"] = codes_to_pieces(codes)
+        state = self.state[idx]
+        for name in STATE_DTYPE.names:
+            out[name] = state[name]
+        return out
+
+    def chunks(self, chunk_size: Optional[int] = None) -> Iterable[np.ndarray]:
+        size = chunk_size or self.chunk_size
+        for start in range(0, len(self), size):
+            yield self.take(np.arange(start, min(len(self), start + size)))
+
+    def column(self, fn) -> np.ndarray:
+        parts = [fn(chunk) for chunk in self.chunks()]
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    def first(self) -> np.ndarray:
+        if not len(self):
+            raise IndexError("empty branch set")
+        return self.take([0])[0]
+
+    def copy(self) -> "DeltaBranchSet":
+        other = DeltaBranchSet.__new__(DeltaBranchSet)
+        other.__dict__.update(self.__dict__)
+        return other
+
+    def close(self) -> None:
+        pass
+
+
+class DeltaQuantumBoard(SpillingQuantumBoard):
+    """
+    QuantumBoard dengan branch di DeltaBranchSet (base + diff per branch, puluhan
+    byte per branch). Semantik move/split/measurement sama; langkahnya pakai jalur
+    streaming SpillingQuantumBoard, tanpa file spill. copy() gak nyalin chess.Board.
+    """
+    def __init__(
+        self,
+        fen: Optional[str] = None,
+        *,
+        seed: Optional[int] = None,
+        max_branches: int = 64,
+        eps_amp: float = 1e-12,
+        rebase_threshold: float = 6.0,
+        chunk_size: int = 4096,
+        telemetry=None,
+        merge_key: str = "fen",
+    ):
+        self.rebase_threshold = float(rebase_threshold)
+        self.chunk_size = int(chunk_size)
+        self._owns_spill_dir = False
+        self.spill_dir = None
+        self._finalizer = None
+        self.store = self._new_store()
+        QuantumBoard.__init__(
+            self, fen, seed=seed, max_branches=max_branches, eps_amp=eps_amp, telemetry=telemetry, merge_key=merge_key
+        )
+
+    def _new_store(self) -> DeltaBranchSet:
+        return DeltaBranchSet(rebase_threshold=self.rebase_threshold, chunk_size=self.chunk_size)
+
+    def copy(self) -> "DeltaQuantumBoard":
+        other = self._copy_shell()
+        other.store = self.store.copy()
+        return other
+
+    def square_distribution(self, square: int) -> Dict[Optional[str], float]:
+        # Langsung dari base + diff, tanpa bangun bitboard
+        return self.store.square_distribution(square)
+
+    @property
+    def nbytes(self) -> int:
+        return self.store.nbytes
+
+
+def _consensus(codes: np.ndarray) -> np.ndarray:
+    """Per kotak, kode yang paling sering muncul (base dengan total diff minimum)."""
+    counts = np.zeros((64, 13), dtype=np.int64)
+    np.add.at(counts, (np.broadcast_to(np.arange(64), codes.shape), codes), 1)
+    return counts.argmax(axis=1).astype(np.uint8)
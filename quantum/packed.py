@@ -0,0 +1,167 @@
+"""
+Format posisi ter-pack (numpy structured array) buat branch QuantumBoard.
+
+Satu record = 12 bitboard piece + castling + ep + turn + clock (+ amplitude).
+Key posisi (semua field selain amp) ada di awal record tanpa padding, jadi dua
+record identik kalau byte key-nya sama; ini setara dengan bandingin board.fen()
+(ep cuma dicatat kalau en passant-nya legal, sama kayak fen()).
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+import chess
+import numpy as np
+
+# Urutan bitboard: putih P,N,B,R,Q,K lalu hitam P,N,B,R,Q,K
+PLANE_SYMBOLS = "PNBRQKpnbrqk"
+
+POSITION_DTYPE = np.dtype([
+    ("pieces", "<u8", (12,)),
+    ("castling", "<u8"),
+    ("ep", "i1"),        # -1 = gak ada ep legal
+    ("turn", "u1"),      # 1 = putih
+    ("halfmove", "<u2"),
+    ("fullmove", "<u4"),
+])
+KEY_BYTES = POSITION_DTYPE.itemsize
+# Key tanpa clock (halfmove/fullmove di akhir), setara board.epd()
+POSITION_KEY_BYTES = POSITION_DTYPE.fields["halfmove"][1]
+
+BRANCH_DTYPE = np.dtype(POSITION_DTYPE.descr + [("amp", "<c16")])
+
+
+def plane_index(piece: chess.Piece) -> int:
+    return (0 if piece.color == chess.WHITE else 6) + piece.piece_type - 1
+
+
+def pack_boards(boards: Sequence[chess.Board], amps: Iterable[complex] = None, dtype=BRANCH_DTYPE) -> np.ndarray:
+    """Pack list chess.Board (+ amplitude) jadi array record."""
+    n = len(boards)
+    out = np.zeros(n, dtype=dtype)
+    if n == 0:
+        return out
+
+    pieces = []
+    castling = []
+    ep = []
+    turn = []
+    halfmove = []
+    fullmove = []
+    for b in boards:
+        pieces.append([b.pieces_mask(pt, color) for color in (chess.WHITE, chess.BLACK) for pt in chess.PIECE_TYPES])
+        castling.append(b.castling_rights)
+        ep.append(b.ep_square if b.ep_square is not None and b.has_legal_en_passant() else -1)
+        turn.append(1 if b.turn == chess.WHITE else 0)
+        halfmove.append(b.halfmove_clock)
+        fullmove.append(b.fullmove_number)
+
+    out["pieces"] = np.array(pieces, dtype=np.uint64)
+    out["castling"] = np.array(castling, dtype=np.uint64)
+    out["ep"] = ep
+    out["turn"] = turn
+    out["halfmove"] = halfmove
+    out["fullmove"] = fullmove
+    if amps is not None and "amp" in out.dtype.names:
+        out["amp"] = list(amps)
+    return out
+
+
+def unpack_board(rec) -> chess.Board:
+    """Bangun ulang chess.Board (stackless) dari satu record."""
+    b = chess.Board(None)
+    planes = [int(x) for x in rec["pieces"]]
+    white = 0
+    black = 0
+    for i in range(6):
+        white |= planes[i]
+        black |= planes[i + 6]
+
+    b.pawns = planes[0] | planes[6]
+    b.knights = planes[1] | planes[7]
+    b.bishops = planes[2] | planes[8]
+    b.rooks = planes[3] | planes[9]
+    b.queens = planes[4] | planes[10]
+    b.kings = planes[5] | planes[11]
+    b.occupied_co[chess.WHITE] = white
+    b.occupied_co[chess.BLACK] = black
+    b.occupied = white | black
+    b.promoted = 0
+
+    b.turn = bool(rec["turn"])
+    b.castling_rights = int(rec["castling"])
+    ep = int(rec["ep"])
+    b.ep_square = ep if ep >= 0 else None
+    b.halfmove_clock = int(rec["halfmove"])
+    b.fullmove_number = int(rec["fullmove"])
+    return b
+
+
+def unpack_boards(recs: np.ndarray) -> List[chess.Board]:
+    return [unpack_board(rec) for rec in recs]
+
+
+def key_view(recs: np.ndarray, nbytes: int = KEY_BYTES) -> np.ndarray:
+    """
+    Byte key posisi per record (np.void), buat np.unique / perbandingan exact.
+    nbytes=POSITION_KEY_BYTES -> key tanpa clock.
+    """
+    raw = recs.view(np.uint8).reshape(len(recs), recs.dtype.itemsize)[:, :nbytes]
+    return np.ascontiguousarray(raw).view(np.dtype((np.void, nbytes))).ravel()
+
+
+def position_hash(recs: np.ndarray, clocks: bool = True) -> np.ndarray:
+    """
+    Hash 64-bit per record (vektor). Key sama => hash sama; tabrakan dicek ulang pakai key_view.
+    clocks=False -> halfmove/fullmove gak ikut di-hash (pasangan key_view POSITION_KEY_BYTES).
+    """
+    mul = np.uint64(0x9E3779B97F4A7C15)
+    h = np.full(len(recs), 0xCBF29CE484222325, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for i in range(12):
+            h = (h ^ recs["pieces"][:, i]) * mul
+        h = (h ^ recs["castling"]) * mul
+        extra = (
+            (recs["ep"].astype(np.int64) & 0xFF).astype(np.uint64)
+            | (recs["turn"].astype(np.uint64) << np.uint64(8))
+        )
+        if clocks:
+            extra |= (
+                (recs["halfmove"].astype(np.uint64) << np.uint64(16))
+                | (recs["fullmove"].astype(np.uint64) << np.uint64(32))
+            )
+        h = (h ^ extra) * mul
+        h ^= h >> np.uint64(29)
+    return h
+
+
+def square_codes(recs: np.ndarray) -> np.ndarray:
+    """
+    Isi tiap kotak per record: (N, 64) u1, 0 = kosong, 1..12 = plane_index + 1.
+    """
+    raw = np.ascontiguousarray(recs["pieces"]).astype("<u8").view(np.uint8)
+    bits = np.unpackbits(raw.reshape(len(recs), 12, 8), axis=-1, bitorder="little")  # (N, 12, 64)
+    planes = np.arange(1, 13, dtype=np.uint8)[None, :, None]
+    return (bits * planes).max(axis=1)
+
+
+def codes_to_pieces(codes: np.ndarray) -> np.ndarray:
+    """Kebalikan square_codes: (N, 64) kode kotak -> (N, 12) bitboard u8."""
+    planes = codes[:, None, :] == np.arange(1, 13, dtype=np.uint8)[None, :, None]  # (N, 12, 64)
+    raw = np.packbits(planes, axis=-1, bitorder="little")  # (N, 12, 8)
+    return np.ascontiguousarray(raw).view("<u8").reshape(len(codes), 12)
+
+
+def plane_marginals(pieces: np.ndarray, probs: np.ndarray) -> np.ndarray:
+    """
+    Marginal per piece per kotak, (12, 64): P(kotak sq berisi piece plane p).
+    pieces = kolom bitboard (N, 12), probs = (N,).
+    """
+    raw = np.ascontiguousarray(pieces).astype("<u8", copy=False).view(np.uint8)
+    bits = np.unpackbits(raw.reshape(len(pieces), 12, 8), axis=-1, bitorder="little")  # (N, 12, 64)
+    return np.tensordot(probs, bits, axes=(0, 0))
+
+
+def probabilities(recs: np.ndarray) -> np.ndarray:
+    amp = recs["amp"]
+    return amp.real * amp.real + amp.imag * amp.imag
@@ -1,16 +1,69 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple, Iterable
+from typing import Callable, Dict, List, Optional, Tuple, Iterable, Iterator
 import math
 import random
+import weakref
 
 import chess
 
+_UNKNOWN = object()
+
 @dataclass
 class Branch:
     board: chess.Board
     amp: complex
+    # Bitmask raja yang masih ada (bit 0 putih, bit 1 hitam), dihitung waktu branch dibuat
+    kings: int = -1
+    # Cache board.outcome() (checkmate/stalemate/dll), dihitung sekali per branch waktu diminta
+    _outcome: object = field(default=_UNKNOWN, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.kings < 0:
+            b = self.board
+            self.kings = (
+                (1 if b.kings & b.occupied_co[chess.WHITE] else 0)
+                | (2 if b.kings & b.occupied_co[chess.BLACK] else 0)
+            )
+
+    def outcome(self) -> Optional[chess.Outcome]:
+        if self._outcome is _UNKNOWN:
+            self._outcome = self.board.outcome()
+        return self._outcome
+
+
+@dataclass(frozen=True)
+class GameStatus:
+    over: bool
+    result: str          # "1-0", "0-1", "1/2-1/2", atau "*" kalau belum selesai
+    white_king: float    # total probabilitas raja putih masih ada
+    black_king: float
+
+
+@dataclass(frozen=True)
+class Measurement:
+    kind: str            # "occupied" (kotak tujuan ditempati piece sendiri) atau "capture"
+    square: int          # kotak tujuan move
+    outcome: bool        # True = hasil A (occupied / capture terjadi)
+    probability: float   # peluang hasil yang terpilih (sebelum collapse)
+
+
+@dataclass(frozen=True)
+class BoardDelta:
+    """Perubahan state setelah satu move/split (lihat QuantumBoard.subscribe)."""
+    version: int
+    action: str
+    # Kotak yang distribusinya berubah -> distribusi baru {symbol atau None: prob}
+    squares: Dict[int, Dict[Optional[str], float]]
+    branches_before: int
+    branches_after: int
+    measurements: Tuple[Measurement, ...]
+    status: Optional[GameStatus]  # status baru kalau berubah, None kalau sama
+
+
+MERGE_KEYS = ("fen", "position")
+
 
 class QuantumBoard:
     """
@@ -28,10 +81,40 @@ class QuantumBoard:
         seed: Optional[int] = None,
         max_branches: int = 64,
         eps_amp: float = 1e-12,
+        telemetry=None,
+        merge_key: str = "fen",
     ):
         self.rng = random.Random(seed)
+        # "fen": merge kalau fen() sama persis (termasuk clock)
+        # "position": merge kalau posisi sama (placement, turn, castling, ep), clock direkonsiliasi
+        if merge_key not in MERGE_KEYS:
+            raise ValueError(f"merge_key must be one of {MERGE_KEYS}, got {merge_key!r}")
+        self.merge_key = merge_key
+        # Opsional: quantum.telemetry.Telemetry, dicatat satu baris per move/split
+        self.telemetry = telemetry
         self.max_branches = int(max_branches)
         self.eps_amp = float(eps_amp)
+        # Naik tiap state berubah (move/split selesai), buat consumer yang cache tampilan
+        self.version = 0
+        self._status: Optional[GameStatus] = None
+        self._status_version = -1
+        self._marginals: Optional[List[Dict[Optional[str], float]]] = None
+        self._marginals_version = -1
+
+        # Subscriber BoardDelta (kosong -> gak ada biaya tambahan per langkah)
+        self._subscribers: List[object] = []
+        self._delta_open: Optional[Tuple[str, int]] = None
+        self._measurements: List[Measurement] = []
+        self._delta_marginals: Optional[List[Dict[Optional[str], float]]] = None
+        self._delta_status: Optional[GameStatus] = None
+        # Measurement di langkah terakhir (move/split yang terakhir selesai)
+        self.last_measurements: Tuple[Measurement, ...] = ()
+
+        # push/pop: stack undo + hasil measurement yang dipaksa (True = hasil A)
+        self._undo: List[tuple] = []
+        self._forced: Optional[List[bool]] = None
+        # Selama push(): board yang dijalanin di tempat (index branch -> board), dibalikin pop() pakai Board.pop()
+        self._pushed: Optional[Dict[int, chess.Board]] = None
 
         b = chess.Board(fen) if fen else chess.Board()
         self.branches: List[Branch] = [Branch(b, 1.0 + 0.0j)]
@@ -52,19 +135,39 @@ class QuantumBoard:
             br.amp *= scale
 
     def _merge_identical(self) -> None:
+        by_position = self.merge_key == "position"
         buckets: Dict[str, complex] = defaultdict(complex)
-        keep_board: Dict[str, chess.Board] = {}
+        keep: Dict[str, Branch] = {}
+        # Mode "position": clock hasil merge = halfmove terkecil, fullmove terbesar
+        clocks: Dict[str, Tuple[int, int]] = {}
 
+        merged_mass = 0.0
         for br in self.branches:
-            fen = br.board.fen()
-            buckets[fen] += br.amp
-            if fen not in keep_board:
-                keep_board[fen] = br.board
+            b = br.board
+            key = b.epd() if by_position else b.fen()
+            buckets[key] += br.amp
+            if key not in keep:
+                keep[key] = br
+                if by_position:
+                    clocks[key] = (b.halfmove_clock, b.fullmove_number)
+            else:
+                merged_mass += self._prob(br.amp)
+                if by_position:
+                    half, full = clocks[key]
+                    clocks[key] = (min(half, b.halfmove_clock), max(full, b.fullmove_number))
+        if self.telemetry is not None:
+            self.telemetry.add("merged_mass", merged_mass)
 
         merged: List[Branch] = []
-        for fen, amp in buckets.items():
+        for key, amp in buckets.items():
             if abs(amp) > self.eps_amp:
-                merged.append(Branch(keep_board[fen], amp))
+                kb = keep[key]
+                if by_position and clocks[key] != (kb.board.halfmove_clock, kb.board.fullmove_number):
+                    nb = self._copy_board(kb.board)
+                    nb.halfmove_clock, nb.fullmove_number = clocks[key]
+                    merged.append(Branch(nb, amp, kb.kings))  # outcome bisa beda (aturan 75 langkah)
+                    continue
+                merged.append(Branch(kb.board, amp, kb.kings, kb._outcome))
 
         self.branches = merged
         self._normalize()
@@ -73,6 +176,8 @@ class QuantumBoard:
         if len(self.branches) <= self.max_branches:
             return
         self.branches.sort(key=lambda br: self._prob(br.amp), reverse=True)
+        if self.telemetry is not None:
+            self.telemetry.add("pruned_mass", sum(self._prob(br.amp) for br in self.branches[self.max_branches:]))
         self.branches = self.branches[: self.max_branches]
         self._normalize()
 
@@ -80,15 +185,265 @@ class QuantumBoard:
         self._merge_identical()
         self._prune()
         self._merge_identical()
+        self.version += 1
+        self._telemetry_end()
+        self._emit_delta()
+
+    # Telemetry (no-op kalau self.telemetry None)
+    def _telemetry_begin(self, action: str) -> None:
+        if self.telemetry is not None:
+            self.telemetry.begin(action, self.branch_count())
+        if self._subscribers and self._delta_open is None:
+            self._delta_open = (action, self.branch_count())
+
+    def _telemetry_end(self) -> None:
+        if self.telemetry is not None:
+            from .telemetry import entropy_bits  # numpy cuma ke-load kalau telemetry dipakai
+            self.telemetry.end(self.branch_count(), entropy_bits(self._branch_probs()))
+
+    def branch_count(self) -> int:
+        return len(self.branches)
+
+    def iter_branches(self) -> Iterator[Branch]:
+        """Branch satu per satu. Pakai ini (bukan .branches) di kode yang juga nerima SpillingQuantumBoard."""
+        return iter(self.branches)
+
+    def packed_chunks(self) -> Iterator["np.ndarray"]:
+        """Branch sebagai record BRANCH_DTYPE (quantum/packed.py) per chunk; di sini satu chunk."""
+        from .packed import pack_boards
+
+        yield pack_boards([br.board for br in self.branches], [br.amp for br in self.branches])
+
+    def _branch_probs(self) -> Iterable[float]:
+        return (self._prob(br.amp) for br in self.branches)
+
+    # Delta event
+    def subscribe(self, callback: Callable[[BoardDelta], None], *, weak: bool = False):
+        """
+        callback(BoardDelta) dipanggil setelah tiap move/split selesai. weak=True (bound
+        method) -> gak nahan objeknya hidup; otomatis lepas kalau objeknya sudah hilang.
+        Return callback (buat unsubscribe).
+        """
+        if not self._subscribers:
+            # Baseline perbandingan = state sekarang
+            self._delta_marginals = self.marginals()
+            self._delta_status = self.status
+        self._subscribers.append(weakref.WeakMethod(callback) if weak else callback)
+        return callback
+
+    def unsubscribe(self, callback) -> None:
+        self._subscribers = [
+            sub for sub in self._subscribers
+            if sub != callback and not (isinstance(sub, weakref.WeakMethod) and sub() == callback)
+        ]
+
+    def _emit_delta(self) -> None:
+        action, before = self._delta_open or ("", self.branch_count())
+        measurements = tuple(self._measurements)
+        self.last_measurements = measurements
+        self._delta_open = None
+        self._measurements = []
+        if not self._subscribers:
+            return
+
+        callbacks = []
+        for sub in self._subscribers:
+            fn = sub() if isinstance(sub, weakref.WeakMethod) else sub
+            if fn is not None:
+                callbacks.append(fn)
+        if len(callbacks) != len(self._subscribers):
+            self._subscribers = [
+                sub for sub in self._subscribers if not (isinstance(sub, weakref.WeakMethod) and sub() is None)
+            ]
+            if not callbacks:
+                return
+
+        new = self.marginals()
+        old = self._delta_marginals
+        squares = {
+            sq: new[sq] for sq in range(64)
+            if old is None or not _same_distribution(old[sq], new[sq])
+        }
+        status = self.status
+        delta = BoardDelta(
+            version=self.version,
+            action=action,
+            squares=squares,
+            branches_before=before,
+            branches_after=self.branch_count(),
+            measurements=measurements,
+            status=None if _same_status(status, self._delta_status) else status,
+        )
+        self._delta_marginals, self._delta_status = new, status
+        for fn in callbacks:
+            fn(delta)
+
+    def copy(self) -> "QuantumBoard":
+        """Salinan independen (board tiap branch + state rng), buat search. Telemetry & subscriber gak ikut."""
+        other = self._copy_shell()
+        other.branches = [Branch(self._copy_board(br.board), br.amp, br.kings, br._outcome) for br in self.branches]
+        return other
+
+    def _copy_shell(self) -> "QuantumBoard":
+        """Salinan atribut + rng tanpa telemetry/subscriber/undo; branch diisi pemanggil."""
+        other = type(self).__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        other.rng = random.Random()
+        other.rng.setstate(self.rng.getstate())
+        other.telemetry = None
+        other._subscribers = []
+        other._delta_open = None
+        other._measurements = []
+        other._undo = []
+        other._pushed = None
+        return other
+
+    # Make/unmake buat search (tanpa copy state penuh per node)
+    def push(self, action, *, outcomes: Optional[Iterable[bool]] = None) -> Tuple[Measurement, ...]:
+        """
+        Jalanin action di tempat, bisa dibalikin pakai pop().
+        action: ("move", from, to[, promotion]) atau ("split", from, a, b).
+        outcomes: paksa hasil measurement berurutan (True = occupied / capture terjadi);
+        kalau habis atau None, pakai rng (state rng ikut dibalikin pop()).
+        Telemetry & subscriber gak dipanggil selama push. Return measurement yang terjadi.
+
+        Board tiap branch di-Board.push() di tempat (lihat _advance); yang di-copy cuma
+        anak kedua split. Undo = list branch lama + amp-nya + board yang di-push.
+
+        Jangan pegang Branch / chess.Board dari state ini (branches, iter_branches(),
+        most_likely_board(), ...) lintas push()/pop(): isinya ikut berubah sampai pop(),
+        dan Branch lama baru valid lagi setelah pop(). Ambil ulang setelah tiap push/pop,
+        atau copy() kalau perlu snapshot.
+        """
+        undo = (
+            self._save_branches(), self.rng.getstate(), self.version,
+            self._status, self._status_version, self._marginals, self._marginals_version,
+        )
+        telemetry, subscribers = self.telemetry, self._subscribers
+        self.telemetry, self._subscribers = None, []
+        self._forced = list(outcomes) if outcomes is not None else None
+        try:
+            if action[0] == "move":
+                self.apply_move(action[1], action[2], promotion=action[3] if len(action) > 3 else None)
+            elif action[0] == "split":
+                self.apply_split(action[1], action[2], action[3])
+            else:
+                raise ValueError(f"unknown action {action[0]!r}")
+        except Exception:
+            self._undo.append(undo)
+            self.pop()
+            raise
+        finally:
+            self.telemetry, self._subscribers = telemetry, subscribers
+            self._forced = None
+            self._pushed = None
+            self._delta_open = None
+            self._measurements = []
+        self._undo.append(undo)
+        return self.last_measurements
+
+    def pop(self) -> None:
+        """Balikin state ke sebelum push() terakhir."""
+        (saved, rng_state, self.version,
+         self._status, self._status_version, self._marginals, self._marginals_version) = self._undo.pop()
+        self._restore_branches(saved)
+        self.rng.setstate(rng_state)
+        self.last_measurements = ()
+
+    def _save_branches(self):
+        """Snapshot branch buat undo push(); mulai nyatet board yang dijalanin di tempat."""
+        self._pushed = {}
+        return list(self.branches), [br.amp for br in self.branches], self._pushed
+
+    def _restore_branches(self, saved) -> None:
+        branches, amps, pushed = saved
+        for b in pushed.values():
+            b.pop()
+        for br, amp in zip(branches, amps):
+            br.amp = amp
+        self.branches = branches
+
+    @property
+    def ply_depth(self) -> int:
+        """Jumlah push() yang belum di-pop()."""
+        return len(self._undo)
 
     # API buat UI / rendering
     def most_likely_board(self) -> chess.Board:
-        return max(self.branches, key=lambda br: self._prob(br.amp)).board
+        return self._most_likely_branch().board
+
+    def _most_likely_branch(self) -> Branch:
+        return max(self.branches, key=lambda br: self._prob(br.amp))
+
+    @property
+    def status(self) -> GameStatus:
+        """
+        Status game (selesai/hasil/massa raja). Cuma dihitung ulang sekali tiap
+        state berubah, jadi aman dibaca tiap frame oleh UI/bot.
+        """
+        if self._status_version != self.version or self._status is None:
+            self._status = self._compute_status()
+            self._status_version = self.version
+        return self._status
+
+    def _compute_status(self) -> GameStatus:
+        white_king = 0.0
+        black_king = 0.0
+        for br in self.branches:
+            p = self._prob(br.amp)
+            if br.kings & 1:
+                white_king += p
+            if br.kings & 2:
+                black_king += p
+
+        if white_king <= 0 and black_king > 0:
+            return GameStatus(True, "0-1", white_king, black_king)  # Raja putih tewas
+        if black_king <= 0 and white_king > 0:
+            return GameStatus(True, "1-0", white_king, black_king)  # Raja hitam tewas
+        if white_king <= 0 and black_king <= 0:
+            return GameStatus(True, "1/2-1/2", white_king, black_king)  # Keduanya tewas
+
+        # Fallback ke hasil standar python-chess di cabang paling mungkin
+        outcome = self._most_likely_branch().outcome()
+        if outcome is None:
+            return GameStatus(False, "*", white_king, black_king)
+        return GameStatus(True, outcome.result(), white_king, black_king)
 
     def turn(self) -> bool:
         # Pake cabang paling mungkin buat turn
         return self.most_likely_board().turn
 
+    def marginals(self) -> List[Dict[Optional[str], float]]:
+        """
+        Distribusi semua 64 kotak sekaligus (index = square), satu kali jalan per branch.
+        Di-cache per version; jangan diubah isinya.
+        """
+        if self._marginals_version != self.version or self._marginals is None:
+            self._marginals = self._compute_marginals()
+            self._marginals_version = self.version
+        return self._marginals
+
+    def _compute_marginals(self) -> List[Dict[Optional[str], float]]:
+        # Lewat bitboard ter-pack (numpy), jauh lebih cepat dari piece_map() per branch
+        import numpy as np
+        from .packed import PLANE_SYMBOLS, pack_boards, plane_marginals, probabilities
+
+        recs = pack_boards([br.board for br in self.branches], [br.amp for br in self.branches])
+        probs = probabilities(recs)
+        mass = plane_marginals(recs["pieces"], probs)                          # (12, 64)
+        occupied = plane_marginals(recs["pieces"], np.ones(len(recs))).sum(axis=0)  # branch terisi per kotak
+        total = float(probs.sum())
+
+        out = []
+        for sq in range(64):
+            dist: Dict[Optional[str], float] = {
+                sym: float(mass[i, sq]) for i, sym in enumerate(PLANE_SYMBOLS) if mass[i, sq] > 0
+            }
+            if occupied[sq] < len(recs):
+                dist[None] = max(0.0, total - sum(dist.values()))
+            out.append(dist)
+        return out
+
     def square_distribution(self, square: int) -> Dict[Optional[str], float]:
         """
         Returns {piece_symbol or None: probability}.
@@ -144,6 +499,19 @@ class QuantumBoard:
             return
         b.push(mv)
 
+    def _advance(self, i: int, b: chess.Board, mv: Optional[chess.Move]) -> chess.Board:
+        """
+        Board b (branch ke-i langkah ini) setelah mv (None = null move). Di dalam push()
+        b sendiri yang dijalanin (dicatat di _pushed buat pop), di luar itu, atau kalau
+        branch i sudah dijalanin, copy dulu.
+        """
+        if self._pushed is None or i in self._pushed:
+            b = self._copy_board(b)
+        else:
+            self._pushed[i] = b
+        self._push_or_null(b, mv)
+        return b
+
     def _collapse_to(self, keep_mask: List[bool]) -> None:
         kept = [br for br, keep in zip(self.branches, keep_mask) if keep]
         self.branches = kept if kept else self.branches  # safety
@@ -153,6 +521,9 @@ class QuantumBoard:
         self,
         mask_a: List[bool],
         mask_b: List[bool],
+        *,
+        kind: str = "",
+        square: int = -1,
     ) -> str:
         """
         Choose outcome A or B based on total probability mass.
@@ -164,13 +535,25 @@ class QuantumBoard:
         if p_a <= 0 and p_b <= 0:
             return "NONE"
 
+        if self.telemetry is not None:
+            self.telemetry.add("measurements", 1)
+        outcome = self._draw_outcome(p_a, p_b)
+        self._record_measurement(kind, square, outcome == "A", (p_a if outcome == "A" else p_b) / (p_a + p_b))
+        self._collapse_to(mask_a if outcome == "A" else mask_b)
+        return outcome
+
+    def _draw_outcome(self, p_a: float, p_b: float) -> str:
+        """Hasil measurement: dari rng, atau hasil yang dipaksa push(..., outcomes=...)."""
+        if self._forced:
+            outcome = "A" if self._forced.pop(0) else "B"
+            if (p_a if outcome == "A" else p_b) <= 0:
+                raise ValueError("forced measurement outcome has zero probability")
+            return outcome
         r = self.rng.random() * (p_a + p_b)
-        if r < p_a:
-            self._collapse_to(mask_a)
-            return "A"
-        else:
-            self._collapse_to(mask_b)
-            return "B"
+        return "A" if r < p_a else "B"
+
+    def _record_measurement(self, kind: str, square: int, outcome: bool, probability: float) -> None:
+        self._measurements.append(Measurement(kind, square, outcome, probability))
 
     # Classical move with quantum effects
     def apply_move(
@@ -190,6 +573,8 @@ class QuantumBoard:
             - Otherwise: controlled move => legal branches push(move), illegal branches push(null).
         - If capture is possible in some branches but not others => measurement on "capture happened" vs "not".
         """
+        self._telemetry_begin(f"move {chess.square_name(from_sq)}{chess.square_name(to_sq)}")
+
         # Per branch move resolution
         legal_mv: List[Optional[chess.Move]] = [None] * len(self.branches)
         illegal_own: List[bool] = [False] * len(self.branches)
@@ -219,13 +604,11 @@ class QuantumBoard:
         if any(illegal_own):
             mask_occ = illegal_own
             mask_free = [not x for x in illegal_own]
-            outcome = self._measure_two_outcomes(mask_occ, mask_free)
+            outcome = self._measure_two_outcomes(mask_occ, mask_free, kind="occupied", square=to_sq)
             if outcome == "A":
                 new_branches: List[Branch] = []
-                for br in self.branches:
-                    nb = self._copy_board(br.board)
-                    self._push_or_null(nb, None)
-                    new_branches.append(Branch(nb, br.amp))
+                for i, br in enumerate(self.branches):
+                    new_branches.append(Branch(self._advance(i, br.board, None), br.amp))
                 self.branches = new_branches
                 self._post_step_cleanup()
                 return True
@@ -237,16 +620,14 @@ class QuantumBoard:
         if any(capture_possible) and not all(capture_possible):
             mask_cap = capture_possible
             mask_nocap = [not x for x in capture_possible]
-            outcome = self._measure_two_outcomes(mask_cap, mask_nocap)
+            outcome = self._measure_two_outcomes(mask_cap, mask_nocap, kind="capture", square=to_sq)
             # after collapse, recompute to execute consistently
             return self.apply_move(from_sq, to_sq, promotion=promotion)
 
         # Controlled move: legal branches do mv, illegal branches do null
         new_branches = []
-        for br, mv in zip(self.branches, legal_mv):
-            nb = self._copy_board(br.board)
-            self._push_or_null(nb, mv) 
-            new_branches.append(Branch(nb, br.amp))
+        for i, (br, mv) in enumerate(zip(self.branches, legal_mv)):
+            new_branches.append(Branch(self._advance(i, br.board, mv), br.amp))
 
         self.branches = new_branches
         self._post_step_cleanup()
@@ -269,18 +650,36 @@ class QuantumBoard:
         - This is inspired by quantum chess split move + i-phase from iSWAP-style behavior. :contentReference[oaicite:10]{index=10}
         - Branches where split is not possible -> null move (turn still passes).
         """
+        self._telemetry_begin(
+            f"split {chess.square_name(from_sq)}{chess.square_name(to_sq_a)}|{chess.square_name(to_sq_b)}"
+        )
+        self.branches = self._split_branches(
+            self.branches, from_sq, to_sq_a, to_sq_b, promotion, phase_b, require_noncapture
+        )
+        self._post_step_cleanup()
+        return True
+
+    def _split_branches(
+        self,
+        branches: Iterable[Branch],
+        from_sq: int,
+        to_sq_a: int,
+        to_sq_b: int,
+        promotion: Optional[int],
+        phase_b: complex,
+        require_noncapture: bool,
+    ) -> List[Branch]:
+        """Branch hasil split (belum di-merge/normalize); dipisah biar bisa dipakai per chunk."""
         inv_sqrt2 = 1.0 / math.sqrt(2.0)
         out: List[Branch] = []
 
-        for br in self.branches:
+        for i, br in enumerate(branches):
             b = br.board
             # If own piece occupies either target, treat as impossible split (null)
             for t in (to_sq_a, to_sq_b):
                 tgt = b.piece_at(t)
                 if tgt is not None and tgt.color == b.turn:
-                    nb = self._copy_board(b)
-                    self._push_or_null(nb, None)
-                    out.append(Branch(nb, br.amp))
+                    out.append(Branch(self._advance(i, b, None), br.amp))
                     break
             else:
                 # Try find legal moves
@@ -294,30 +693,38 @@ class QuantumBoard:
                     mv_b = None
 
                 if mv_a is None or mv_b is None:
-                    nb = self._copy_board(b)
-                    self._push_or_null(nb, None)
-                    out.append(Branch(nb, br.amp))
+                    out.append(Branch(self._advance(i, b, None), br.amp))
                     continue
 
                 if require_noncapture:
                     try:
                         if b.is_capture(mv_a) or b.is_capture(mv_b):
-                            nb = self._copy_board(b)
-                            self._push_or_null(nb, None)
-                            out.append(Branch(nb, br.amp))
+                            out.append(Branch(self._advance(i, b, None), br.amp))
                             continue
                     except Exception:
                         pass
 
-                # Create two child branches
-                nb_a = self._copy_board(b)
+                # Create two child branches (B dari copy dulu, A boleh pakai b sendiri)
                 nb_b = self._copy_board(b)
-                self._push_or_null(nb_a, mv_a)
                 self._push_or_null(nb_b, mv_b)
+                nb_a = self._advance(i, b, mv_a)
 
                 out.append(Branch(nb_a, br.amp * inv_sqrt2))
                 out.append(Branch(nb_b, br.amp * inv_sqrt2 * phase_b))
 
-        self.branches = out
-        self._post_step_cleanup()
-        return True
\ No newline at end of file
+        return out
+
+
+def _same_status(a: Optional[GameStatus], b: Optional[GameStatus], tol: float = 1e-12) -> bool:
+    if a is None or b is None:
+        return a is b
+    return (
+        a.over == b.over and a.result == b.result
+        and abs(a.white_king - b.white_king) <= tol and abs(a.black_king - b.black_king) <= tol
+    )
+
+
+def _same_distribution(a: Dict[Optional[str], float], b: Dict[Optional[str], float], tol: float = 1e-12) -> bool:
+    if a.keys() != b.keys():
+        return False
+    return all(abs(a[k] - b[k]) <= tol for k in a)
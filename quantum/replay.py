@@ -0,0 +1,200 @@
+"""
+Rekaman game (JSONL) dengan keyframe, buat replay/seek cepat.
+
+Format, satu objek JSON per baris:
+- {"type": "header", "keyframe_every": N, "max_branches": ..., "eps_amp": ..., "merge_key": ...}
+- {"type": "keyframe", "ply": k, "version": ..., "rng": [...], "branches": [[fen, re, im], ...]}
+  = state lengkap SETELAH k action (ply 0 = posisi awal)
+- {"type": "action", "ply": k, "action": ["move", from, to] | ["split", from, a, b], "log": "..."}
+  = action ke-k (dijalankan dari state ply k, hasilnya state ply k+1)
+- {"type": "index", "keyframes": [[ply, offset byte], ...]}
+  = baris terakhir, ditulis waktu Recorder.close(). Rekaman tanpa index (game
+  yang belum ditutup) tetap bisa dibaca, cuma keyframe-nya di-parse penuh waktu load.
+
+Keyframe ditulis tiap N ply, jadi seek ke ply mana pun = load keyframe terdekat
++ jalanin maksimal N-1 action. RNG ikut disimpan, jadi measurement hasilnya sama
+persis dengan game aslinya.
+"""
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+import chess
+
+from .quantum_board import Branch, QuantumBoard
+
+
+def snapshot(qb: QuantumBoard) -> dict:
+    version, state, gauss = qb.rng.getstate()
+    return {
+        "version": qb.version,
+        "rng": [version, list(state), gauss],
+        "branches": [[br.board.fen(), br.amp.real, br.amp.imag] for br in qb.iter_branches()],
+    }
+
+
+def restore(snap: dict, *, max_branches: int = 64, eps_amp: float = 1e-12, merge_key: str = "fen") -> QuantumBoard:
+    qb = QuantumBoard(max_branches=max_branches, eps_amp=eps_amp, merge_key=merge_key)
+    qb.branches = [Branch(chess.Board(fen), complex(re, im)) for fen, re, im in snap["branches"]]
+    version, state, gauss = snap["rng"]
+    qb.rng.setstate((version, tuple(state), gauss))
+    qb.version = snap["version"]
+    return qb
+
+
+def apply_action(qb: QuantumBoard, action) -> None:
+    kind, *squares = action
+    if kind == "move":
+        qb.apply_move(*squares)
+    elif kind == "split":
+        qb.apply_split(*squares)
+    else:
+        raise ValueError(f"unknown action {kind!r}")
+
+
+class Recorder:
+    """Nulis rekaman game ke file JSONL sambil jalan (satu baris per action)."""
+    def __init__(self, path: str, qb: QuantumBoard, *, keyframe_every: int = 10):
+        self.path = path
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.ply = 0
+        self._index: List[List[int]] = []  # [ply, offset byte] tiap keyframe
+        self._f = open(path, "w", encoding="utf-8")
+        self._write({
+            "type": "header",
+            "keyframe_every": self.keyframe_every,
+            "max_branches": qb.max_branches,
+            "eps_amp": qb.eps_amp,
+            "merge_key": qb.merge_key,
+        })
+        self._keyframe(qb)
+
+    def _write(self, obj: dict) -> None:
+        self._f.write(json.dumps(obj, separators=(",", ":")))
+        self._f.write("\n")
+
+    def _keyframe(self, qb: QuantumBoard) -> None:
+        self._index.append([self.ply, self._f.tell()])
+        self._write({"type": "keyframe", "ply": self.ply, **snapshot(qb)})
+
+    def record(self, action, qb: QuantumBoard, log: str = "") -> None:
+        """Dipanggil SETELAH action dijalankan di qb."""
+        self._write({"type": "action", "ply": self.ply, "action": list(action), "log": log})
+        self.ply += 1
+        if self.ply % self.keyframe_every == 0:
+            self._keyframe(qb)
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._write({"type": "index", "keyframes": self._index})
+            self._f.close()
+
+
+def _read_index(path: str, tail_bytes: int = 1 << 20) -> Optional[List[Tuple[int, int]]]:
+    """Index keyframe dari baris terakhir file, None kalau gak ada (rekaman belum ditutup)."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - tail_bytes))
+        lines = f.read().rstrip(b"\n").rsplit(b"\n", 1)
+    try:
+        obj = json.loads(lines[-1])
+    except ValueError:
+        return None
+    if not isinstance(obj, dict) or obj.get("type") != "index":
+        return None
+    return [(int(ply), int(offset)) for ply, offset in obj["keyframes"]]
+
+
+class Replay:
+    """
+    Baca rekaman: action (kecil) disimpan di memori, keyframe cuma dicatat offset
+    file-nya dan baru di-parse waktu dibutuhkan.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.header: dict = {}
+        self.actions: List[list] = []
+        self.logs: List[str] = []
+        index = _read_index(path)
+        # Kalau ada index, baris keyframe dilewati berdasarkan offset (isinya di-parse nanti)
+        skip = {offset for _, offset in index} if index is not None else set()
+        keyframes: List[Tuple[int, int]] = []
+
+        with open(path, "rb") as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if offset in skip or not line.strip():
+                    continue
+                obj = json.loads(line)
+                if obj["type"] == "header":
+                    self.header = obj
+                elif obj["type"] == "action":
+                    self.actions.append(obj["action"])
+                    self.logs.append(obj.get("log", ""))
+                elif obj["type"] == "keyframe":
+                    keyframes.append((obj["ply"], offset))
+
+        # [(ply, offset)] urut ply
+        self._keyframes: List[Tuple[int, int]] = sorted(index if index is not None else keyframes)
+        self._kf_plies = [ply for ply, _ in self._keyframes]
+        if not self._kf_plies or self._kf_plies[0] != 0:
+            raise ValueError(f"{path}: recording has no initial keyframe")
+
+        # Cursor: state terakhir yang di-seek
+        self.ply: Optional[int] = None
+        self.board: Optional[QuantumBoard] = None
+
+    def __len__(self) -> int:
+        """Jumlah ply (action) di rekaman; seek valid untuk 0..len."""
+        return len(self.actions)
+
+    @property
+    def keyframe_every(self) -> int:
+        return int(self.header.get("keyframe_every", 1))
+
+    def _nearest_keyframe(self, ply: int) -> int:
+        return self._kf_plies[bisect_right(self._kf_plies, ply) - 1]
+
+    def load_keyframe(self, ply: int) -> QuantumBoard:
+        """State baru (objek terpisah dari cursor seek) dari keyframe di `ply`."""
+        i = bisect_left(self._kf_plies, ply)
+        if i == len(self._kf_plies) or self._kf_plies[i] != ply:
+            raise KeyError(f"no keyframe at ply {ply}")
+        offset = self._keyframes[i][1]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            snap = json.loads(f.readline())
+        return restore(
+            snap,
+            max_branches=self.header.get("max_branches", 64),
+            eps_amp=self.header.get("eps_amp", 1e-12),
+            merge_key=self.header.get("merge_key", "fen"),
+        )
+
+    def seek(self, ply: int) -> QuantumBoard:
+        """
+        State setelah `ply` action. Maju dari cursor kalau gak ada keyframe di
+        antaranya; selain itu load keyframe terdekat lalu jalanin sisa action.
+        """
+        ply = max(0, min(int(ply), len(self)))
+        if ply == self.ply:
+            return self.board
+
+        kf = self._nearest_keyframe(ply)
+        if self.board is not None and kf <= self.ply < ply:
+            start, qb = self.ply, self.board
+        else:
+            start, qb = kf, self.load_keyframe(kf)
+
+        for i in range(start, ply):
+            apply_action(qb, self.actions[i])
+
+        self.ply, self.board = ply, qb
+        return qb
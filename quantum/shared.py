@@ -0,0 +1,251 @@
+"""
+Transport state QuantumBoard antar proses lewat multiprocessing.shared_memory.
+
+Pickle QuantumBoard = pickle semua chess.Board-nya; buat task pendek (search,
+analisis, turnamen) itu yang paling mahal. Di sini banyak state sekaligus di-pack
+(packed.py) jadi kolom-kolom di satu blok shared memory:
+
+    pieces (N, 12) u8 bitboard | castling | ep | turn | halfmove | fullmove | amp c16
+    state_ptr (S + 1) i8       -> branch state i = baris state_ptr[i]:state_ptr[i + 1]
+
+N = total branch semua state. Worker cuma nerima handle kecil (nama blok + spec),
+attach, dan baca kolom langsung dari buffer (read-only, tanpa copy). Hasil ditulis
+ke buffer hasil yang dialokasi di depan (SharedArrays), index = nomor state.
+
+    states = SharedStates.create(boards)
+    results = SharedArrays.create({"marginals": ("<f8", (len(boards), 12, 64))})
+    with worker_pool(initializer=attach_worker, initargs=(states.handle, results.handle)) as pool:
+        pool.map(task, range(len(states)))        # task(i) pakai worker_states() / worker_results()
+    out = results["marginals"].copy()
+    states.release(); results.release()
+
+state_marginals(pool, boards) = pola di atas buat marginal piece per kotak. Lihat
+bench/transport_bench.py buat perbandingan dengan transport pickle.
+
+Blok cuma di-unlink pembuatnya. Python 3.13+: worker attach dengan track=False. Versi
+lama selalu daftar ke resource_tracker waktu attach, jadi pool-nya dibuat lewat
+worker_pool(): worker (fork/spawn) berbagi tracker induk, dan tracker itu baru beres-beres
+waktu induk keluar.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .packed import BRANCH_DTYPE, plane_marginals, unpack_boards
+from .quantum_board import Branch, QuantumBoard
+
+_ALIGN = 64
+
+# Kolom branch (dari BRANCH_DTYPE, satu array per field)
+BRANCH_COLUMNS = tuple(
+    (name, BRANCH_DTYPE.fields[name][0].base.str, BRANCH_DTYPE.fields[name][0].shape)
+    for name in BRANCH_DTYPE.names
+)
+
+
+def _layout(spec: Dict[str, Tuple[str, tuple]]):
+    """Offset tiap array di blok (aligned 64 byte) + ukuran total."""
+    offsets = {}
+    pos = 0
+    for name, (dtype, shape) in spec.items():
+        pos = (pos + _ALIGN - 1) // _ALIGN * _ALIGN
+        offsets[name] = pos
+        pos += int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+    return offsets, max(pos, 1)
+
+
+class SharedArrays:
+    """
+    Sekumpulan array numpy di satu blok shared memory. spec = {nama: (dtype str, shape)}.
+    Pembuat blok (create) wajib release() di akhir; yang attach cukup close().
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, spec, *, owner: bool, readonly: bool):
+        self._shm = shm
+        self.spec = {name: (str(dtype), tuple(shape)) for name, (dtype, shape) in spec.items()}
+        self.owner = owner
+        offsets, _ = _layout(self.spec)
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, (dtype, shape) in self.spec.items():
+            arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offsets[name])
+            if readonly:
+                arr.flags.writeable = False
+            self.arrays[name] = arr
+
+    @classmethod
+    def create(cls, spec, *, zero: bool = True) -> "SharedArrays":
+        _, size = _layout(spec)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        out = cls(shm, spec, owner=True, readonly=False)
+        if zero:
+            for arr in out.arrays.values():
+                arr.fill(0)
+        return out
+
+    @classmethod
+    def attach(cls, handle, *, readonly: bool = False) -> "SharedArrays":
+        name, spec = handle
+        return cls(_attach(name), spec, owner=False, readonly=readonly)
+
+    @property
+    def handle(self):
+        """Deskripsi kecil (picklable) buat attach dari proses lain."""
+        return (self._shm.name, self.spec)
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def close(self) -> None:
+        # View numpy harus dilepas dulu, kalau gak buffer-nya gak bisa ditutup
+        self.arrays = {}
+        self._shm.close()
+
+    def release(self) -> None:
+        """close() + hapus blok (cuma pembuat)."""
+        self.close()
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:  # pool bukan dari worker_pool(): tracker worker sudah unlink duluan
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.owner:
+            self.release()
+        else:
+            self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach ke blok yang sudah ada; yang unlink cuma pembuatnya (lihat docstring modul)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def worker_pool(processes: Optional[int] = None, **kwargs) -> multiprocessing.pool.Pool:
+    """
+    multiprocessing.Pool buat kerja pakai blok di modul ini. Python < 3.13: resource_tracker
+    induk dijalanin dulu, jadi worker mewarisi tracker yang sama dan attach di worker gak
+    bikin tracker sendiri (yang bakal unlink blok induk waktu worker keluar).
+    """
+    if sys.version_info < (3, 13):
+        resource_tracker.ensure_running()
+    return multiprocessing.Pool(processes, **kwargs)
+
+
+class SharedStates(SharedArrays):
+    """Batch state QuantumBoard dalam bentuk kolom (lihat docstring modul)."""
+
+    @classmethod
+    def create(cls, boards: Sequence[QuantumBoard]) -> "SharedStates":
+        counts = [qb.branch_count() for qb in boards]
+        total = sum(counts)
+        spec = {name: (dtype, (total,) + shape) for name, dtype, shape in BRANCH_COLUMNS}
+        spec["state_ptr"] = ("<i8", (len(boards) + 1,))
+
+        out = super().create(spec, zero=False)
+        out["state_ptr"][0] = 0
+        out["state_ptr"][1:] = np.cumsum(counts)
+        for i, qb in enumerate(boards):
+            lo = int(out["state_ptr"][i])
+            for recs in qb.packed_chunks():
+                for name in BRANCH_DTYPE.names:
+                    out[name][lo: lo + len(recs)] = recs[name]
+                lo += len(recs)
+        return out
+
+    @classmethod
+    def attach(cls, handle, *, readonly: bool = True) -> "SharedStates":
+        return super().attach(handle, readonly=readonly)
+
+    def __len__(self) -> int:
+        return len(self["state_ptr"]) - 1
+
+    def span(self, i: int) -> slice:
+        ptr = self["state_ptr"]
+        return slice(int(ptr[i]), int(ptr[i + 1]))
+
+    def column(self, name: str, i: Optional[int] = None) -> np.ndarray:
+        """View kolom (semua branch, atau cuma state i). Tanpa copy."""
+        return self[name] if i is None else self[name][self.span(i)]
+
+    def probabilities(self, i: int) -> np.ndarray:
+        amp = self.column("amp", i)
+        return amp.real * amp.real + amp.imag * amp.imag
+
+    def records(self, i: int) -> np.ndarray:
+        """Branch state i sebagai array BRANCH_DTYPE (copy, buat fungsi di packed.py)."""
+        sl = self.span(i)
+        recs = np.zeros(sl.stop - sl.start, dtype=BRANCH_DTYPE)
+        for name in BRANCH_DTYPE.names:
+            recs[name] = self[name][sl]
+        return recs
+
+    def quantum_board(self, i: int, **kwargs) -> QuantumBoard:
+        """Bangun QuantumBoard biasa dari state i (kwargs diterusin ke QuantumBoard)."""
+        recs = self.records(i)
+        qb = QuantumBoard(**kwargs)
+        qb.branches = [Branch(b, complex(a)) for b, a in zip(unpack_boards(recs), recs["amp"])]
+        return qb
+
+
+# Worker pool: attach sekali per proses (initializer, atau di awal task kalau pool-nya dipakai ulang)
+_WORKER: Dict[str, SharedArrays] = {}
+
+
+def attach_worker(states_handle, results_handle=None) -> None:
+    """Attach state (read-only) dan buffer hasil (writable). No-op kalau blok yang sama sudah ke-attach."""
+    for key, handle, cls in (("states", states_handle, SharedStates), ("results", results_handle, SharedArrays)):
+        if handle is None:
+            continue
+        old = _WORKER.get(key)
+        if old is not None and old.handle[0] == handle[0]:
+            continue
+        if old is not None:
+            old.close()
+        _WORKER[key] = cls.attach(handle)
+
+
+def worker_states() -> SharedStates:
+    return _WORKER["states"]
+
+
+def worker_results() -> SharedArrays:
+    return _WORKER["results"]
+
+
+def _marginals_task(args) -> int:
+    states_handle, results_handle, lo, hi = args
+    attach_worker(states_handle, results_handle)
+    states, out = worker_states(), worker_results()["marginals"]
+    for i in range(lo, hi):
+        out[i] = plane_marginals(states.column("pieces", i), states.probabilities(i))
+    return hi - lo
+
+
+def state_marginals(pool, boards: Sequence[QuantumBoard], *, chunksize: int = 8) -> np.ndarray:
+    """
+    Marginal piece per kotak (len(boards), 12, 64) dihitung di pool (dari worker_pool()).
+    State di-pack sekali ke shared memory, task cuma bawa handle + range index, hasil
+    ditulis ke buffer bersama.
+    """
+    with SharedStates.create(boards) as states, \
+            SharedArrays.create({"marginals": ("<f8", (len(boards), 12, 64))}) as results:
+        jobs = [
+            (states.handle, results.handle, lo, min(lo + chunksize, len(boards)))
+            for lo in range(0, len(boards), chunksize)
+        ]
+        pool.map(_marginals_task, jobs)
+        return results["marginals"].copy()
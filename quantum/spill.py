@@ -0,0 +1,579 @@
+"""
+Branch store dengan spill ke file memory-mapped, buat superposisi super besar.
+
+- Semua branch disimpan ter-pack (lihat quantum.packed), urut probabilitas turun.
+- Record pertama sampai batas RAM budget ada di array RAM ("hot"), sisanya
+  di-spill ke np.memmap di disk ("cold").
+- Move/split/merge/marginal diproses per chunk, jadi memori Python kepakai cuma
+  sebesar satu chunk chess.Board.
+
+SpillingQuantumBoard = QuantumBoard yang branch-nya tinggal di BranchStore.
+"""
+from __future__ import annotations
+
+import math
+import os
+import shutil
+import tempfile
+import warnings
+import weakref
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+
+import chess
+import numpy as np
+
+from .packed import (
+    BRANCH_DTYPE,
+    KEY_BYTES,
+    PLANE_SYMBOLS,
+    POSITION_KEY_BYTES,
+    key_view,
+    pack_boards,
+    plane_marginals,
+    position_hash,
+    probabilities,
+    unpack_board,
+)
+from .quantum_board import Branch, GameStatus, QuantumBoard
+
+# Kode klasifikasi per branch waktu apply_move
+_OWN, _CAPTURE, _QUIET, _NULL = 0, 1, 2, 3
+
+
+class BranchStore:
+    """
+    Kumpulan record BRANCH_DTYPE, append-only. Record masuk ke RAM selama masih
+    di bawah ram_budget_bytes; sisanya ditulis ke segment memmap di spill_dir.
+    """
+    def __init__(
+        self,
+        *,
+        ram_budget_bytes: int,
+        spill_dir: str,
+        chunk_size: int = 65536,
+        segment_records: Optional[int] = None,
+    ):
+        self.ram_budget_bytes = int(ram_budget_bytes)
+        self.spill_dir = spill_dir
+        self.chunk_size = int(chunk_size)
+        # Satu segment (RAM atau file memmap) = beberapa chunk
+        self.segment_records = int(segment_records or 4 * self.chunk_size)
+
+        self._segments: List[np.ndarray] = []  # np.ndarray (RAM) atau np.memmap (disk)
+        self._counts: List[int] = []
+        self._paths: List[Optional[str]] = []
+        self._ram_records = 0
+        # Hapus file spill juga kalau store di-drop tanpa close()
+        self._finalizer = weakref.finalize(self, _remove_files, self._paths)
+
+    @property
+    def ram_capacity(self) -> int:
+        return self.ram_budget_bytes // BRANCH_DTYPE.itemsize
+
+    def __len__(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def hot_count(self) -> int:
+        return self._ram_records
+
+    @property
+    def cold_count(self) -> int:
+        return len(self) - self._ram_records
+
+    def append(self, recs: np.ndarray) -> None:
+        pos = 0
+        while pos < len(recs):
+            seg = self._writable_segment()
+            i = len(self._segments) - 1
+            room = len(seg) - self._counts[i]
+            take = min(room, len(recs) - pos)
+            seg[self._counts[i]: self._counts[i] + take] = recs[pos: pos + take]
+            self._counts[i] += take
+            if self._paths[i] is None:
+                self._ram_records += take
+            pos += take
+
+    def _writable_segment(self) -> np.ndarray:
+        if self._segments and self._counts[-1] < len(self._segments[-1]):
+            return self._segments[-1]
+
+        ram_room = self.ram_capacity - self._ram_records
+        if ram_room > 0:
+            seg = np.zeros(min(ram_room, self.segment_records), dtype=BRANCH_DTYPE)
+            path = None
+        else:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix="branches-", suffix=".bin", dir=self.spill_dir)
+            os.close(fd)
+            seg = np.memmap(path, dtype=BRANCH_DTYPE, mode="w+", shape=(self.segment_records,))
+        self._segments.append(seg)
+        self._counts.append(0)
+        self._paths.append(path)
+        return seg
+
+    def chunks(self, chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Iterasi record per chunk (view, bukan copy), urut sesuai urutan append."""
+        size = chunk_size or self.chunk_size
+        for seg, count in zip(self._segments, self._counts):
+            for start in range(0, count, size):
+                yield seg[start: min(count, start + size)]
+
+    def column(self, fn) -> np.ndarray:
+        """Gabung hasil fn(chunk) semua chunk jadi satu array (buat kolom kecil: hash, prob)."""
+        parts = [fn(chunk) for chunk in self.chunks()]
+        return np.concatenate(parts) if parts else np.zeros(0)
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """Ambil record berdasarkan index global (copy)."""
+        out = np.empty(len(indices), dtype=BRANCH_DTYPE)
+        bounds = np.cumsum([0] + self._counts)
+        seg_of = np.searchsorted(bounds, indices, side="right") - 1
+        for s in np.unique(seg_of):
+            mask = seg_of == s
+            out[mask] = self._segments[s][indices[mask] - bounds[s]]
+        return out
+
+    def first(self) -> np.ndarray:
+        for seg, count in zip(self._segments, self._counts):
+            if count:
+                return seg[0]
+        raise IndexError("empty branch store")
+
+    def close(self) -> None:
+        """Lepas memmap & hapus file spill."""
+        for seg in self._segments:
+            if isinstance(seg, np.memmap):
+                seg.flush()
+        self._segments.clear()
+        self._finalizer()
+        self._counts.clear()
+        self._ram_records = 0
+
+
+def _remove_files(paths: List[Optional[str]]) -> None:
+    for path in paths:
+        if path is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    paths.clear()
+
+
+class SpillingQuantumBoard(QuantumBoard):
+    """
+    QuantumBoard dengan branch di BranchStore (RAM + memmap). Semantik move/split/
+    measurement sama dengan QuantumBoard; bedanya semua langkah diproses streaming.
+
+    `branches` di sini bikin list chess.Board dari SEMUA branch, jadi buat state
+    besar pakai iter_branches() / square_distribution() / status.
+
+    Pakai `with SpillingQuantumBoard(...) as qb:` atau close(); kalau board di-drop
+    tanpa close, file spill tetap dihapus lewat finalizer.
+
+    push()/pop(): tiap langkah memang nulis store baru, jadi undo cukup nyimpen store
+    lama (gak di-close sampai pop() atau close()).
+    """
+    # Store yang disimpan push() yang lagi jalan; _replace_store gak boleh nutup store ini
+    _pinned_store: Optional[BranchStore] = None
+
+    def __init__(
+        self,
+        fen: Optional[str] = None,
+        *,
+        seed: Optional[int] = None,
+        max_branches: int = 1_000_000,
+        eps_amp: float = 1e-12,
+        ram_budget_bytes: int = 256 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        chunk_size: int = 65536,
+        telemetry=None,
+        merge_key: str = "fen",
+    ):
+        self.ram_budget_bytes = int(ram_budget_bytes)
+        self.chunk_size = int(chunk_size)
+        self._owns_spill_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="qlc-spill-")
+        self._finalizer = self._spill_dir_finalizer()
+        self.store = self._new_store()
+        super().__init__(fen, seed=seed, max_branches=max_branches, eps_amp=eps_amp, telemetry=telemetry, merge_key=merge_key)
+
+    def _new_store(self) -> BranchStore:
+        return BranchStore(
+            ram_budget_bytes=self.ram_budget_bytes,
+            spill_dir=self.spill_dir,
+            chunk_size=self.chunk_size,
+        )
+
+    def _spill_dir_finalizer(self):
+        if not self._owns_spill_dir:
+            return None
+        return weakref.finalize(self, shutil.rmtree, self.spill_dir, ignore_errors=True)
+
+    def close(self) -> None:
+        for undo in self._undo:
+            undo[0].close()
+        self._undo = []
+        self.store.close()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def copy(self) -> "SpillingQuantumBoard":
+        """Salinan independen: store baru (spill dir sendiri kalau yang asli juga punya sendiri), record disalin per chunk."""
+        other = self._copy_shell()
+        if self._owns_spill_dir:
+            other.spill_dir = tempfile.mkdtemp(prefix="qlc-spill-")
+        other._finalizer = other._spill_dir_finalizer()
+        other.store = other._new_store()
+        for chunk in self.store.chunks():
+            other.store.append(chunk)
+        return other
+
+    def push(self, action, *, outcomes=None):
+        try:
+            return super().push(action, outcomes=outcomes)
+        finally:
+            self._pinned_store = None
+
+    def _save_branches(self):
+        self._pinned_store = self.store
+        return self.store
+
+    def _restore_branches(self, saved) -> None:
+        self._replace_store(saved)
+
+    # branches disimpan ter-pack di store
+    @property
+    def branches(self) -> List[Branch]:
+        """Semua branch sebagai list chess.Board; buat state yang sudah ke-spill pakai iter_branches()/packed_chunks()."""
+        cold = getattr(self.store, "cold_count", 0)
+        if cold:
+            warnings.warn(
+                f"{type(self).__name__}.branches loads all {len(self.store)} branches ({cold} spilled to disk) "
+                "into memory; use iter_branches() or packed_chunks()",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return list(self.iter_branches())
+
+    @branches.setter
+    def branches(self, value: List[Branch]) -> None:
+        store = self._new_store()
+        store.append(pack_boards([br.board for br in value], [br.amp for br in value]))
+        self._replace_store(store)
+
+    def _replace_store(self, store: BranchStore) -> None:
+        old = getattr(self, "store", None)
+        self.store = store
+        if old is not None and old is not store and old is not self._pinned_store:
+            old.close()
+
+    def iter_branches(self) -> Iterator[Branch]:
+        for chunk in self.store.chunks():
+            for rec in chunk:
+                yield Branch(unpack_board(rec), complex(rec["amp"]))
+
+    def branch_count(self) -> int:
+        return len(self.store)
+
+    def packed_chunks(self) -> Iterator[np.ndarray]:
+        return self.store.chunks()
+
+    # Cleanup: merge identik + prune + normalize, semua per chunk
+    def _normalize(self) -> None:
+        self._post_step_cleanup(bump_version=False)
+
+    def _post_step_cleanup(self, bump_version: bool = True) -> None:
+        merged = self._merged_store()
+        probs = merged.column(probabilities)
+
+        if len(probs) == 0:
+            merged.close()
+            self.branches = [Branch(chess.Board(), 1.0 + 0.0j)]
+            if bump_version:
+                self.version += 1
+                self._telemetry_end()
+                self._emit_delta()
+            return
+
+        # Prune ke max_branches paling mungkin, lalu urut probabilitas turun (hot = paling mungkin)
+        if len(probs) > self.max_branches:
+            keep = np.argpartition(-probs, self.max_branches - 1)[: self.max_branches]
+            order = keep[np.argsort(-probs[keep], kind="stable")]
+        else:
+            order = np.argsort(-probs, kind="stable")
+
+        total = float(probs[order].sum())
+        if self.telemetry is not None and len(order) < len(probs):
+            all_mass = float(probs.sum())
+            self.telemetry.add("pruned_mass", (all_mass - total) / all_mass if all_mass > 0 else 0.0)
+        scale = 1.0 / math.sqrt(total) if total > 0 else 1.0
+
+        final = self._new_store()
+        for start in range(0, len(order), self.chunk_size):
+            recs = merged.take(order[start: start + self.chunk_size])
+            recs["amp"] *= scale
+            final.append(recs)
+        merged.close()
+
+        self._replace_store(final)
+        if bump_version:
+            self.version += 1
+            self._telemetry_end()
+            self._emit_delta()
+
+    def _branch_probs(self) -> np.ndarray:
+        return self.store.column(probabilities)
+
+    def _merged_store(self) -> BranchStore:
+        """
+        Gabung branch dengan posisi identik (amplitude dijumlah = interferensi).
+        Urut berdasarkan hash 64-bit, lalu per window (batas window selalu di
+        pergantian hash) dicocokkan exact pakai byte key.
+        """
+        out = self._new_store()
+        n = len(self.store)
+        if n == 0:
+            return out
+
+        by_position = self.merge_key == "position"
+        key_bytes = POSITION_KEY_BYTES if by_position else KEY_BYTES
+        hashes = self.store.column(lambda c: position_hash(c, clocks=not by_position)).astype(np.uint64)
+        order = np.argsort(hashes, kind="stable")
+        sorted_hashes = hashes[order]
+
+        start = 0
+        while start < n:
+            end = min(n, start + self.chunk_size)
+            # Mundurin batas window ke pergantian hash biar grup gak kepotong
+            if end < n:
+                cut = int(np.searchsorted(sorted_hashes, sorted_hashes[end], side="left"))
+                end = cut if cut > start else int(np.searchsorted(sorted_hashes, sorted_hashes[end], side="right"))
+
+            recs = self.store.take(order[start:end])
+            _, first, inverse = np.unique(key_view(recs, key_bytes), return_index=True, return_inverse=True)
+            inverse = inverse.ravel()
+            amps = np.zeros(len(first), dtype=np.complex128)
+            np.add.at(amps, inverse, recs["amp"])
+
+            if self.telemetry is not None:
+                self.telemetry.add("merged_mass", float(probabilities(recs).sum() - probabilities(recs[first]).sum()))
+
+            merged = recs[first]
+            merged["amp"] = amps
+            if by_position:
+                # Clock hasil merge: halfmove terkecil, fullmove terbesar (sama dengan QuantumBoard)
+                half = np.full(len(first), np.iinfo(np.uint16).max, dtype=np.uint16)
+                full = np.zeros(len(first), dtype=np.uint32)
+                np.minimum.at(half, inverse, recs["halfmove"])
+                np.maximum.at(full, inverse, recs["fullmove"])
+                merged["halfmove"] = half
+                merged["fullmove"] = full
+            merged = merged[np.abs(amps) > self.eps_amp]
+            out.append(merged)
+            start = end
+        return out
+
+    # Operasi quantum versi streaming
+    def _map_store(self, fn) -> None:
+        """Bangun store baru: fn(chunk) -> (list board, list amp) per chunk."""
+        out = self._new_store()
+        for chunk in self.store.chunks():
+            boards, amps = fn(chunk)
+            if boards:
+                out.append(pack_boards(boards, amps))
+        self._replace_store(out)
+
+    def apply_split(
+        self,
+        from_sq: int,
+        to_sq_a: int,
+        to_sq_b: int,
+        *,
+        promotion: Optional[int] = None,
+        phase_b: complex = 1j,
+        require_noncapture: bool = True,
+    ) -> bool:
+        self._telemetry_begin(
+            f"split {chess.square_name(from_sq)}{chess.square_name(to_sq_a)}|{chess.square_name(to_sq_b)}"
+        )
+
+        def split_chunk(chunk):
+            branches = (Branch(unpack_board(rec), complex(rec["amp"])) for rec in chunk)
+            out = self._split_branches(branches, from_sq, to_sq_a, to_sq_b, promotion, phase_b, require_noncapture)
+            return [br.board for br in out], [br.amp for br in out]
+
+        self._map_store(split_chunk)
+        self._post_step_cleanup()
+        return True
+
+    def _classify(self, b: chess.Board, from_sq: int, to_sq: int, promotion: Optional[int]):
+        """(kode klasifikasi, move) buat satu branch; logikanya sama dengan QuantumBoard.apply_move."""
+        tgt = b.piece_at(to_sq)
+        if tgt is not None and tgt.color == b.turn:
+            return _OWN, None
+        try:
+            mv = b.find_move(from_sq, to_sq, promotion=promotion)
+        except Exception:
+            return _NULL, None
+        try:
+            return (_CAPTURE if b.is_capture(mv) else _QUIET), mv
+        except Exception:
+            return _QUIET, mv
+
+    def apply_move(
+        self,
+        from_sq: int,
+        to_sq: int,
+        *,
+        promotion: Optional[int] = None,
+    ) -> bool:
+        self._telemetry_begin(f"move {chess.square_name(from_sq)}{chess.square_name(to_sq)}")
+
+        # Pass 1: klasifikasi semua branch + massa probabilitas per kelas
+        codes_parts = []
+        for chunk in self.store.chunks():
+            codes_parts.append(np.array(
+                [self._classify(unpack_board(rec), from_sq, to_sq, promotion)[0] for rec in chunk],
+                dtype=np.int8,
+            ))
+        codes = np.concatenate(codes_parts) if codes_parts else np.zeros(0, dtype=np.int8)
+        probs = self.store.column(probabilities)
+
+        keep = np.ones(len(codes), dtype=bool)
+        force_null = False
+
+        # Exclusion measurement: occupied by own vs not
+        own = codes == _OWN
+        if own.any():
+            outcome = self._measure_masks(probs, own, ~own, kind="occupied", square=to_sq)
+            if outcome == "A":
+                keep, force_null = own, True
+            elif outcome == "B":
+                keep = ~own
+
+        # Capture measurement kalau capture cuma terjadi di sebagian branch
+        if not force_null:
+            cap = keep & (codes == _CAPTURE)
+            nocap = keep & (codes != _CAPTURE)
+            if cap.any() and nocap.any():
+                outcome = self._measure_masks(probs, cap, nocap, kind="capture", square=to_sq)
+                if outcome == "A":
+                    keep = cap
+                elif outcome == "B":
+                    keep = nocap
+
+        # Pass 2: controlled move di branch yang tersisa
+        offset = 0
+        out = self._new_store()
+        for chunk in self.store.chunks():
+            mask = keep[offset: offset + len(chunk)]
+            offset += len(chunk)
+            boards, amps = [], []
+            for rec in chunk[mask]:
+                b = unpack_board(rec)
+                mv = None if force_null else self._classify(b, from_sq, to_sq, promotion)[1]
+                self._push_or_null(b, mv)
+                boards.append(b)
+                amps.append(complex(rec["amp"]))
+            if boards:
+                out.append(pack_boards(boards, amps))
+        self._replace_store(out)
+
+        self._post_step_cleanup()
+        return True
+
+    def _measure_masks(
+        self, probs: np.ndarray, mask_a: np.ndarray, mask_b: np.ndarray, *, kind: str = "", square: int = -1
+    ) -> str:
+        p_a = float(probs[mask_a].sum())
+        p_b = float(probs[mask_b].sum())
+        if p_a <= 0 and p_b <= 0:
+            return "NONE"
+        if self.telemetry is not None:
+            self.telemetry.add("measurements", 1)
+        outcome = self._draw_outcome(p_a, p_b)
+        self._record_measurement(kind, square, outcome == "A", (p_a if outcome == "A" else p_b) / (p_a + p_b))
+        return outcome
+
+    # Query (vektor per chunk)
+    def most_likely_board(self) -> chess.Board:
+        # Store selalu urut probabilitas turun setelah cleanup
+        return unpack_board(self.store.first())
+
+    def _most_likely_branch(self) -> Branch:
+        rec = self.store.first()
+        return Branch(unpack_board(rec), complex(rec["amp"]))
+
+    def _compute_marginals(self) -> List[Dict[Optional[str], float]]:
+        planes = np.zeros((12, 64))
+        total = 0.0
+        for chunk in self.store.chunks():
+            probs = probabilities(chunk)
+            total += float(probs.sum())
+            planes += plane_marginals(chunk["pieces"], probs)
+
+        out = []
+        for sq in range(64):
+            dist: Dict[Optional[str], float] = {
+                sym: float(planes[i, sq]) for i, sym in enumerate(PLANE_SYMBOLS) if planes[i, sq] > 0
+            }
+            empty = total - sum(dist.values())
+            if empty > 0:
+                dist[None] = empty
+            out.append(dist)
+        return out
+
+    def square_distribution(self, square: int) -> Dict[Optional[str], float]:
+        dist: Dict[Optional[str], float] = defaultdict(float)
+        bit = np.uint64(1 << square)
+        total = 0.0
+        for chunk in self.store.chunks():
+            probs = probabilities(chunk)
+            total += float(probs.sum())
+            occupied = (chunk["pieces"] & bit) != 0
+            for i, sym in enumerate(PLANE_SYMBOLS):
+                mass = float(probs[occupied[:, i]].sum())
+                if mass > 0:
+                    dist[sym] += mass
+        empty = total - sum(dist.values())
+        if empty > 0:
+            dist[None] += empty
+        return dict(dist)
+
+    def legal_moves_distribution(self) -> Dict[str, float]:
+        moves: Dict[str, float] = defaultdict(float)
+        for chunk in self.store.chunks():
+            for rec, p in zip(chunk, probabilities(chunk).tolist()):
+                for mv in unpack_board(rec).legal_moves:
+                    moves[mv.uci()] += p
+        return dict(moves)
+
+    def _compute_status(self) -> GameStatus:
+        white_king = 0.0
+        black_king = 0.0
+        for chunk in self.store.chunks():
+            probs = probabilities(chunk)
+            white_king += float(probs[chunk["pieces"][:, 5] != 0].sum())
+            black_king += float(probs[chunk["pieces"][:, 11] != 0].sum())
+
+        if white_king <= 0 and black_king > 0:
+            return GameStatus(True, "0-1", white_king, black_king)
+        if black_king <= 0 and white_king > 0:
+            return GameStatus(True, "1-0", white_king, black_king)
+        if white_king <= 0 and black_king <= 0:
+            return GameStatus(True, "1/2-1/2", white_king, black_king)
+
+        outcome = self._most_likely_branch().outcome()
+        if outcome is None:
+            return GameStatus(False, "*", white_king, black_king)
+        return GameStatus(True, outcome.result(), white_king, black_king)
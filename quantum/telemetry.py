@@ -0,0 +1,123 @@
+"""
+Telemetry per ply dari QuantumBoard, disimpan di ring buffer ukuran tetap.
+
+Satu baris per operasi (move/split):
+- branches_before / branches_after
+- entropy       : entropi Shannon (bit) distribusi branch setelah cleanup
+- merged_mass   : massa probabilitas branch yang dilebur ke branch identik
+- pruned_mass   : massa probabilitas yang dibuang _prune (max_branches)
+- measurements  : jumlah measurement (collapse) di ply itu
+- latency_ms    : waktu operasi termasuk merge/prune
+
+Export ke CSV/JSON buat dicocokkan sama log game.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+TELEMETRY_DTYPE = np.dtype([
+    ("ply", "<i4"),
+    ("action", "U24"),
+    ("branches_before", "<i4"),
+    ("branches_after", "<i4"),
+    ("entropy", "<f8"),
+    ("merged_mass", "<f8"),
+    ("pruned_mass", "<f8"),
+    ("measurements", "<i4"),
+    ("latency_ms", "<f8"),
+])
+FIELDS = TELEMETRY_DTYPE.names
+
+
+def entropy_bits(probs: Iterable[float]) -> float:
+    total = 0.0
+    for p in probs:
+        if p > 0:
+            total -= p * math.log2(p)
+    return total
+
+
+class Telemetry:
+    """Ring buffer: kalau penuh, baris paling lama ketimpa."""
+    def __init__(self, capacity: int = 1024):
+        self.capacity = max(1, int(capacity))
+        self._rows = np.zeros(self.capacity, dtype=TELEMETRY_DTYPE)
+        self._next = 0     # total baris yang pernah dicatat (= ply berikutnya)
+        self._open: Optional[Dict[str, object]] = None
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    # Dipanggil QuantumBoard
+    def begin(self, action: str, branches: int) -> None:
+        """Mulai ply. Panggilan berulang (apply_move rekursif) diabaikan."""
+        if self._open is not None:
+            return
+        self._open = {
+            "action": action,
+            "branches_before": branches,
+            "merged_mass": 0.0,
+            "pruned_mass": 0.0,
+            "measurements": 0,
+            "t0": time.perf_counter(),
+        }
+
+    def add(self, field: str, value) -> None:
+        if self._open is not None:
+            self._open[field] += value
+
+    def end(self, branches: int, entropy: float) -> None:
+        row = self._open
+        if row is None:
+            return
+        self._open = None
+
+        rec = self._rows[self._next % self.capacity]
+        rec["ply"] = self._next
+        rec["action"] = row["action"]
+        rec["branches_before"] = row["branches_before"]
+        rec["branches_after"] = branches
+        rec["entropy"] = entropy
+        rec["merged_mass"] = row["merged_mass"]
+        rec["pruned_mass"] = row["pruned_mass"]
+        rec["measurements"] = row["measurements"]
+        rec["latency_ms"] = (time.perf_counter() - row["t0"]) * 1000.0
+        self._next += 1
+
+    # Baca / export
+    def rows(self) -> np.ndarray:
+        """Baris yang masih ada di buffer, urut dari yang paling lama."""
+        n = len(self)
+        start = self._next - n
+        idx = np.arange(start, self._next) % self.capacity
+        return self._rows[idx]
+
+    def as_dicts(self) -> List[dict]:
+        return [{name: rec[name].item() for name in FIELDS} for rec in self.rows()]
+
+    def clear(self) -> None:
+        self._next = 0
+        self._open = None
+
+    def to_csv(self, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.as_dicts())
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dicts(), f, indent=1)
+
+    def export(self, path: str) -> None:
+        """Format dipilih dari ekstensi (.csv, selain itu JSON)."""
+        if path.lower().endswith(".csv"):
+            self.to_csv(path)
+        else:
+            self.to_json(path)
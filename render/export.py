@@ -0,0 +1,201 @@
+"""
+Export rekaman game (quantum/replay.py) jadi frame tanpa buka window.
+
+    python -m render.export recordings/ --out frames/ --workers 4
+    python -m render.export game.jsonl --out frames/ --format raw   # satu file .rgb per game
+
+- Renderer jalan di SDL dummy video driver (off-screen), satu konteks per proses.
+- Tiap frame disalin (RGB bytes) lalu di-encode + ditulis thread writer (antrean
+  terbatas). PNG di-encode sendiri pakai zlib (level rendah, GIL dilepas selama
+  kompresi), jadi encode gak nahan render frame berikutnya. pygame.image.save
+  megang GIL dan jauh lebih lambat.
+- Banyak game diproses paralel pakai process pool; di akhir dilaporkan frames/sec.
+
+Format "raw" = RGB24 berurutan, bisa langsung masuk ffmpeg:
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 1024x768 -r 2 -i game.rgb game.mp4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from multiprocessing import Pool
+
+# Harus diset sebelum pygame.display.init()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from app.assets import AssetManager
+from app.config import Config
+from quantum.adapter import QuantumBoardAdapter
+from quantum.analyze import iter_recordings
+from quantum.replay import Replay
+from render.renderer import Renderer
+
+
+def encode_png(rgb: bytes, width: int, height: int, level: int = 1) -> bytes:
+    """PNG RGB8 minimal (filter None per baris) dari buffer RGB24."""
+    stride = width * 3
+    raw = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, level))
+        + chunk(b"IEND", b"")
+    )
+
+
+class FrameWriter:
+    """Thread penulis frame. put() nge-blok kalau antrean penuh (memori tetap terbatas)."""
+    def __init__(self, max_queue: int = 32, png_level: int = 1):
+        self.png_level = png_level
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self._error = None
+        self._thread.start()
+
+    def put_png(self, rgb: bytes, size, path: str) -> None:
+        self._queue.put(("png", (rgb, size), path))
+
+    def put_raw(self, data: bytes, stream) -> None:
+        self._queue.put(("raw", data, stream))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            kind, payload, target = item
+            try:
+                if kind == "png":
+                    rgb, (w, h) = payload
+                    with open(target, "wb") as fh:
+                        fh.write(encode_png(rgb, w, h, self.png_level))
+                else:
+                    target.write(payload)
+            except Exception as exc:  # simpan, dilempar ulang di close()
+                self._error = exc
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class OffscreenContext:
+    """Display dummy + aset + renderer, dibuat sekali per proses."""
+    def __init__(self, size):
+        Config.resize(*size)
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+        self.assets = AssetManager()
+        self.assets.load_all()
+        self.renderer = Renderer(self.screen, self.assets)
+
+
+_CTX = None
+
+
+def _init_worker(size) -> None:
+    global _CTX
+    _CTX = OffscreenContext(size)
+
+
+def render_game(
+    path: str, out_dir: str, *, fmt: str = "png", every: int = 1, png_level: int = 1, scrub_bar: bool = True
+) -> dict:
+    """Render semua ply (tiap `every`) satu rekaman. Return statistik (frames, detik, fps)."""
+    ctx = _CTX or OffscreenContext((Config.WIDTH, Config.HEIGHT))
+    t0 = time.perf_counter()
+    replay = Replay(path)
+    total = len(replay)
+    name = os.path.splitext(os.path.basename(path))[0]
+    os.makedirs(out_dir, exist_ok=True)
+
+    writer = FrameWriter(png_level=png_level)
+    raw = open(os.path.join(out_dir, f"{name}.rgb"), "wb") if fmt == "raw" else None
+    ctx.renderer.invalidate()
+    frames = 0
+    # Satu view per game; dilepas dari delta selama seek
+    view = QuantumBoardAdapter(qb=replay.seek(0))
+    try:
+        plies = list(range(0, total + 1, max(1, every)))
+        if plies[-1] != total:
+            plies.append(total)  # posisi akhir selalu ikut
+        for ply in plies:
+            view.rebind(replay.seek(ply))
+            view.move_log = replay.logs[:ply]
+            ctx.renderer.draw_game(view, player_color="w", hud=(f"REPLAY  {name}",))
+            if scrub_bar:
+                ctx.renderer.draw_scrub_bar(ply, total, replay.keyframe_every, f"Ply {ply}/{total}   result {view.result()}")
+
+            rgb = pygame.image.tobytes(ctx.screen, "RGB")
+            if raw is not None:
+                writer.put_raw(rgb, raw)
+            else:
+                writer.put_png(rgb, ctx.screen.get_size(), os.path.join(out_dir, f"{name}-{ply:04d}.png"))
+            frames += 1
+    finally:
+        writer.close()
+        if raw is not None:
+            raw.close()
+
+    seconds = time.perf_counter() - t0
+    return {
+        "file": path,
+        "frames": frames,
+        "seconds": seconds,
+        "fps": frames / seconds if seconds > 0 else 0.0,
+        "size": [Config.WIDTH, Config.HEIGHT],
+    }
+
+
+def _render_job(args) -> dict:
+    path, out_dir, fmt, every, png_level = args
+    try:
+        return render_game(path, out_dir, fmt=fmt, every=every, png_level=png_level)
+    except Exception as exc:
+        return {"file": path, "error": f"{type(exc).__name__}: {exc}", "frames": 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render recorded games to frames without a window")
+    parser.add_argument("root", help="recording file or directory of .jsonl recordings")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--size", default=f"{Config.WIDTH}x{Config.HEIGHT}", help="WxH, e.g. 1280x720")
+    parser.add_argument("--every", type=int, default=1, help="render every Nth ply")
+    parser.add_argument("--png-level", type=int, default=1, help="zlib level 0-9 for PNG frames")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    size = tuple(int(x) for x in args.size.lower().split("x"))
+    jobs = ((path, args.out, args.format, args.every, args.png_level) for path in iter_recordings(args.root))
+
+    t0 = time.perf_counter()
+    frames = 0
+    with Pool(args.workers, initializer=_init_worker, initargs=(size,)) as pool:
+        for res in pool.imap_unordered(_render_job, jobs):
+            frames += res["frames"]
+            print(json.dumps(res))
+            sys.stdout.flush()
+    wall = time.perf_counter() - t0
+    print(f"{frames} frames in {wall:.1f}s ({frames / wall if wall > 0 else 0.0:.1f} frames/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,71 @@
 # render/renderer.py
+from time import perf_counter
+
 import pygame
 from app.config import Config
 
 class Renderer:
+    HUD_PAD = 10
+
     def __init__(self, screen, assets):
         self.screen = screen
         self.assets = assets
 
+        # Snapshot frame terakhir, dipakai buat dirty-rect tracking
+        self._last_squares = {}
+        self._last_hud = None
+        self._last_log = None
+        self._last_thinking = False
+        self._last_overlay = None
+        self._last_view = None
+        self._hud_rect = None
+        self._thinking_rect = None
+        self._needs_full = True
+
+        # Layer statis (background + board) per orientasi, dan surface alpha yang dipakai ulang
+        self._static_layers = {}
+        self._layers_board_key = None
+        self._alpha_surfaces = {}
+
+        # Opsional: callable(phase, t_start, t_end) dipanggil tiap phase draw_game selesai
+        # (snapshot, board, pieces, hud, log, present). Dipakai bench/ dan tracing.
+        self.phase_hook = None
+
+    def invalidate(self, layers=False):
+        """
+        Paksa full redraw di frame berikutnya (misal habis menu gambar langsung ke screen).
+        layers=True juga buang layer statis (dipakai kalau background/board berubah).
+        """
+        self._needs_full = True
+        if layers:
+            self._static_layers.clear()
+
+    def resize(self, screen):
+        """Window di-resize: ganti surface target, semua cache yang tergantung ukuran dibuang."""
+        self.screen = screen
+        self._alpha_surfaces.clear()
+        self._last_squares = {}
+        self.invalidate(layers=True)
+
+    def draw_menu(self, title, instruction):
+        """Layar pilih sisi: background + overlay gelap + judul & instruksi."""
+        self.screen.blit(self.assets.background, (0, 0))
+
+        # Dark overlay
+        self.screen.blit(self._alpha_surface((Config.WIDTH, Config.HEIGHT), (0, 0, 0, 100)), (0, 0))
+
+        title_text = self.assets.render_text("title", title, (255, 255, 255))
+        instr_text = self.assets.render_text("default", instruction, (200, 200, 200))
+
+        title_rect = title_text.get_rect(center=(Config.WIDTH // 2, Config.HEIGHT // 2 - 80))
+        instr_rect = instr_text.get_rect(center=(Config.WIDTH // 2, Config.HEIGHT // 2 + 20))
+
+        self.screen.blit(title_text, title_rect)
+        self.screen.blit(instr_text, instr_rect)
+
+        pygame.display.update()
+        self._needs_full = True
+
     def draw_game(
         self,
         board_obj,
@@ -18,76 +77,286 @@ class Renderer:
         thinking=False,
         game_over=False,
         result_str=None,
+        hud=None,
     ):
+        """
+        Gambar satu frame. Cuma region yang berubah sejak frame terakhir yang
+        digambar ulang (kotak papan, HUD, log, teks thinking), lalu dikirim ke
+        display.update(rects). Full redraw kalau view/overlay berubah atau invalidate().
+        hud: kalau diisi (tuple string), dipakai menggantikan teks instruksi default.
+        """
         if valid_moves is None:
             valid_moves = []
 
-        # Background & board
-        self.screen.blit(self.assets.background, (0, 0))
+        x_off, y_off = self._board_offset()
 
-        x_off = (Config.WIDTH - Config.BOARD_SIZE) // 2
-        y_off = (Config.HEIGHT - Config.BOARD_SIZE) // 2
-        self.screen.blit(self.assets.board_image, (x_off, y_off))
+        t = perf_counter()
+        squares = self._snapshot_squares(board_obj, selected, valid_moves, quantum_mode, split_target1)
+        hud_lines = tuple(hud) if hud is not None else self._hud_lines(
+            board_obj,
+            quantum_mode=quantum_mode,
+            selected=selected,
+            split_target1=split_target1,
+            player_color=player_color,
+            thinking=thinking,
+        )
+        log_tail = tuple(str(t) for t in board_obj.move_log[-6:]) if hasattr(board_obj, "move_log") else None
+        overlay = result_str if (game_over and result_str) else None
+        t = self._phase("snapshot", t)
+
+        full = (
+            self._needs_full
+            or player_color != self._last_view
+            or overlay != self._last_overlay
+            or self.assets.board_key != self._layers_board_key
+        )
+
+        changed = []
+        if not full:
+            for rc in set(squares) | set(self._last_squares):
+                if squares.get(rc) != self._last_squares.get(rc):
+                    changed.append(rc)
+            something_changed = (
+                changed
+                or hud_lines != self._last_hud
+                or log_tail != self._last_log
+                or thinking != self._last_thinking
+            )
+            # Overlay nutup seluruh layar, jadi perubahan di bawahnya butuh full redraw
+            if overlay is not None and something_changed:
+                full = True
+            # Panel yang numpuk di atas board ketiban kotak yang digambar ulang (dan restore
+            # panel ngapus piece di bawahnya), jadi urutan layer cuma bener lewat full redraw
+            elif something_changed and self._panels_over_board(hud_lines, log_tail, thinking, x_off, y_off):
+                full = True
+
+        if full:
+            t = self._draw_full(squares, hud_lines, log_tail, thinking, overlay, x_off, y_off, player_color, t)
+            pygame.display.update()
+            self._phase("present", t)
+        else:
+            dirty = []
+            for (r, c) in changed:
+                rect = self._square_rect(r, c, x_off, y_off, player_color)
+                self._restore(rect)
+                dirty.append(rect)
+            t = self._phase("board", t)
+            for (r, c) in changed:
+                snap = squares.get((r, c))
+                if snap is not None:
+                    self._draw_square(r, c, snap, x_off, y_off, player_color)
+            t = self._phase("pieces", t)
+
+            if hud_lines != self._last_hud:
+                old = self._hud_rect
+                if old is not None:
+                    self._restore(old)
+                self._hud_rect = self._draw_hud(hud_lines)
+                dirty.extend(r for r in (old, self._hud_rect) if r is not None)
+            t = self._phase("hud", t)
+
+            if log_tail != self._last_log:
+                if log_tail is not None:
+                    dirty.append(self._draw_move_log(log_tail))
+                elif self._last_log is not None:
+                    rect = self._log_rect()
+                    self._restore(rect)
+                    dirty.append(rect)
+            t = self._phase("log", t)
+
+            if thinking != self._last_thinking:
+                old = self._thinking_rect
+                if old is not None:
+                    self._restore(old)
+                    dirty.append(old)
+                self._thinking_rect = self._draw_thinking() if thinking else None
+                if self._thinking_rect is not None:
+                    dirty.append(self._thinking_rect)
+            t = self._phase("hud", t)
+
+            if dirty:
+                pygame.display.update(dirty)
+            self._phase("present", t)
+
+        self._last_squares = squares
+        self._last_hud = hud_lines
+        self._last_log = log_tail
+        self._last_thinking = thinking
+        self._last_overlay = overlay
+        self._last_view = player_color
+        self._needs_full = False
+
+    def _draw_full(self, squares, hud_lines, log_tail, thinking, overlay, x_off, y_off, player_color, t):
+        # Background & board (sudah dikomposit jadi satu layer)
+        self.screen.blit(self._static_layer(player_color), (0, 0))
+        t = self._phase("board", t)
+
+        # Highlight + pieces per kotak
+        for (r, c), snap in squares.items():
+            self._draw_square(r, c, snap, x_off, y_off, player_color)
+        t = self._phase("pieces", t)
+
+        # HUD / instructions (thinking & overlay game over ikut dihitung di sini)
+        self._hud_rect = self._draw_hud(hud_lines)
+        t = self._phase("hud", t)
+
+        # Move log
+        if log_tail is not None:
+            self._draw_move_log(log_tail)
+        t = self._phase("log", t)
+
+        # Thinking overlay
+        self._thinking_rect = self._draw_thinking() if thinking else None
+
+        if overlay is not None:
+            self._draw_game_over(overlay)
+        return self._phase("hud", t)
+
+    def _panels_over_board(self, hud_lines, log_tail, thinking, x_off, y_off):
+        """True kalau panel HUD/log/thinking (frame lalu atau frame ini) motong area board."""
+        board = pygame.Rect(x_off, y_off, Config.BOARD_SIZE, Config.BOARD_SIZE)
+        panels = [self._hud_rect, self._thinking_rect, self._hud_panel_rect(hud_lines)]
+        if log_tail is not None or self._last_log is not None:
+            panels.append(self._log_rect())
+        if thinking:
+            panels.append(self._thinking_text_rect())
+        return any(rect is not None and rect.colliderect(board) for rect in panels)
+
+    def _phase(self, name, t_start):
+        """Lapor satu phase ke phase_hook (kalau ada). Return waktu sekarang = awal phase berikutnya."""
+        if self.phase_hook is None:
+            return t_start
+        t_end = perf_counter()
+        self.phase_hook(name, t_start, t_end)
+        return t_end
+
+    def _board_offset(self):
+        return Config.board_offset()
+
+    def _square_rect(self, r, c, x_off, y_off, player_color="w"):
+        # Flip view buat black player
+        draw_r = 7 - r if player_color == "b" else r
+        draw_c = 7 - c if player_color == "b" else c
+        x = x_off + draw_c * Config.SQUARE_SIZE
+        y = y_off + draw_r * Config.SQUARE_SIZE
+        return pygame.Rect(x, y, Config.SQUARE_SIZE, Config.SQUARE_SIZE)
+
+    def _log_rect(self):
+        """Panel log: kolom kanan board, sejajar tepi atas board (lihat Config.resize)."""
+        x_off, y_off = self._board_offset()
+        return pygame.Rect(x_off + Config.BOARD_SIZE + Config.PANEL_MARGIN, y_off, Config.LOG_WIDTH, Config.LOG_HEIGHT)
+
+    def _static_layer(self, player_color):
+        """Background + board yang dikomposit sekali per orientasi (white/black view)."""
+        # Ganti tema board -> layer lama gak valid lagi
+        if self.assets.board_key != self._layers_board_key:
+            self._static_layers.clear()
+            self._layers_board_key = self.assets.board_key
+
+        layer = self._static_layers.get(player_color)
+        if layer is None:
+            layer = pygame.Surface((Config.WIDTH, Config.HEIGHT))
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+            layer.blit(self.assets.background, (0, 0))
+
+            board = self.assets.board_image
+            if player_color == "b":
+                board = pygame.transform.rotate(board, 180)
+            layer.blit(board, self._board_offset())
+
+            self._static_layers[player_color] = layer
+        return layer
+
+    def _alpha_surface(self, size, rgba):
+        """Surface translucent (tile highlight, panel, overlay) yang dialokasi sekali per ukuran/warna."""
+        key = (tuple(size), tuple(rgba))
+        surf = self._alpha_surfaces.get(key)
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill(rgba)
+            self._alpha_surfaces[key] = surf
+        return surf
+
+    def _restore(self, rect):
+        """Timpa region dengan background + board (hapus isi frame sebelumnya)."""
+        rect = pygame.Rect(rect)
+        self.screen.blit(self._static_layer(self._last_view), rect, rect)
+
+    def _snapshot_squares(self, board_obj, selected, valid_moves, quantum_mode, split_target1):
+        """
+        State visual per kotak: (warna highlight, anchor split?, selected?, kode piece, persen prob).
+        Persen prob None kalau piece-nya klasik (prob 1.0).
+        Kotak kosong tanpa highlight gak dimasukin.
+        """
+        valid_color = Config.COLOR_HIGHLIGHT if quantum_mode else Config.COLOR_VALID_MOVE
+        valid = set(valid_moves)
+        squares = {}
+        for r in range(8):
+            for c in range(8):
+                p = board_obj.get_piece(r, c)
+                code = p.code if p else None
+                prob = getattr(p, "prob", 1.0) if p else 1.0
+                pct = int(prob * 100) if prob < 1.0 else None
+                snap = (
+                    valid_color if (r, c) in valid else None,
+                    split_target1 == (r, c),
+                    selected == (r, c),
+                    code,
+                    pct,
+                )
+                if snap != (None, False, False, None, None):
+                    squares[(r, c)] = snap
+        return squares
+
+    def _draw_square(self, r, c, snap, x_off, y_off, player_color="w"):
+        valid_color, is_anchor, is_selected, code, pct = snap
 
         # Highlight valid moves
-        for (r, c) in valid_moves:
-            color = Config.COLOR_HIGHLIGHT if quantum_mode else Config.COLOR_VALID_MOVE
-            self._draw_rect(r, c, color, alpha=100, player_color=player_color)
+        if valid_color is not None:
+            self._draw_rect(r, c, valid_color, alpha=100, player_color=player_color)
 
         # Highlight split target A (split_target1)
-        if split_target1 is not None:
-            r, c = split_target1
+        if is_anchor:
             # Outline + soft fill
             self._draw_rect(r, c, Config.COLOR_SPLIT_ANCHOR, alpha=60, player_color=player_color)
             self._draw_rect(r, c, Config.COLOR_SPLIT_ANCHOR, width=6, player_color=player_color)
             self._draw_square_label(r, c, "A", player_color=player_color)
 
         # Highlight selected square
-        if selected:
-            self._draw_rect(selected[0], selected[1], Config.COLOR_SELECTED, width=4, player_color=player_color)
+        if is_selected:
+            self._draw_rect(r, c, Config.COLOR_SELECTED, width=4, player_color=player_color)
 
-        # Draw pieces
-        self._draw_pieces(board_obj, x_off, y_off, player_color=player_color)
+        if code is None:
+            return
 
-        # HUD / instructions
-        self._draw_hud(
-            board_obj,
-            quantum_mode=quantum_mode,
-            selected=selected,
-            split_target1=split_target1,
-            player_color=player_color,
-            thinking=thinking,
-        )
+        rect = self._square_rect(r, c, x_off, y_off, player_color)
+        self.assets.blit_piece(self.screen, code, rect.topleft)
 
-        # Move log
-        if hasattr(board_obj, "move_log"):
-            self._draw_move_log(board_obj.move_log)
+        # Tampilkan probabilitas kalo quantum
+        if pct is not None:
+            self.screen.blit(self.assets.prob_label(pct), (rect.x + 5, rect.y + 5))
 
-        # Thinking overlay
-        if thinking:
-            font = self.assets.fonts.get("small") or self.assets.fonts["default"]
-            txt = font.render("Computer thinking...", True, (255, 255, 0))
-            self.screen.blit(txt, (Config.WIDTH - 250, 20))
-
-        if game_over and result_str:
-            self._draw_game_over(result_str)
+    def _draw_thinking(self):
+        txt = self.assets.render_text("small", "Computer thinking...", (255, 255, 0))
+        rect = self._thinking_text_rect()
+        self.screen.blit(txt, rect)
+        return rect
 
-        pygame.display.update()
+    def _thinking_text_rect(self):
+        txt = self.assets.render_text("small", "Computer thinking...", (255, 255, 0))
+        log = self._log_rect()
+        return txt.get_rect(topleft=(log.x, log.bottom + Config.PANEL_MARGIN))
 
     def _draw_game_over(self, result_str):
         """Menggambar overlay hitam transparan dengan teks kemenangan."""
         # Dark overlay
-        overlay = pygame.Surface((Config.WIDTH, Config.HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._alpha_surface((Config.WIDTH, Config.HEIGHT), (0, 0, 0, 180)), (0, 0))
 
         # Tentukan teks
-        title_font = self.assets.fonts.get("title") or self.assets.fonts["default"]
-        sub_font = self.assets.fonts.get("default")
-        
         msg = "GAME OVER"
         sub_msg = ""
-        
+
         if result_str == "1-0":
             sub_msg = "WHITE WINS!"
             color = (100, 255, 100) # ijo
@@ -99,22 +368,20 @@ class Renderer:
             color = (200, 200, 200) # abu
 
         # Render teks di tengah layar
-        title_surf = title_font.render(msg, True, (255, 255, 255))
-        sub_surf = title_font.render(sub_msg, True, color)
-        
+        title_surf = self.assets.render_text("title", msg, (255, 255, 255))
+        sub_surf = self.assets.render_text("title", sub_msg, color)
+
         cx, cy = Config.WIDTH // 2, Config.HEIGHT // 2
-        
+
         self.screen.blit(title_surf, (cx - title_surf.get_width() // 2, cy - 80))
         self.screen.blit(sub_surf, (cx - sub_surf.get_width() // 2, cy - 20))
-        
+
         # Instruksi keluar
-        hint = sub_font.render("Press ESC to Main Menu", True, (150, 150, 150))
+        hint = self.assets.render_text("default", "Press ESC to Main Menu", (150, 150, 150))
         self.screen.blit(hint, (cx - hint.get_width() // 2, cy + 60))
 
-    def _draw_hud(self, board_obj, *, quantum_mode: bool, selected, split_target1, player_color: str, thinking: bool):
-        """Panel instruksi kecil biar user paham kontrol split."""
-        hud_font = pygame.font.SysFont(Config.FONT_MAIN, 14)
-
+    def _hud_lines(self, board_obj, *, quantum_mode: bool, selected, split_target1, player_color: str, thinking: bool):
+        """Teks panel instruksi (dipisah dari gambar biar bisa dibandingin antar frame)."""
         # Deteksi giliran player (QuantumBoardAdapter punya turn_color)
         turn_color = getattr(board_obj, "turn_color", None)
         is_player_turn = (turn_color == player_color) if turn_color is not None else True
@@ -141,110 +408,110 @@ class Renderer:
                         lines.append("Split target A selected (cyan). Now click target B")
                         lines.append("Tip: click elsewhere to cancel A")
 
-        if not lines:
-            return
-
-        pad = 10
-        w = 0
-        h = 0
-        rendered = []
+        return tuple(lines)
 
-        for t in lines:
-            surf = hud_font.render(t, True, (255, 255, 255))
-            rendered.append(surf)
-            w = max(w, surf.get_width())
-            h += surf.get_height() + 2
-        w += pad * 2
-        h += pad * 2
+    def _draw_hud(self, lines):
+        """Panel instruksi kecil biar user paham kontrol split. Return rect panel (atau None)."""
+        rect = self._hud_panel_rect(lines)
+        if rect is None:
+            return None
 
         # Panel bg transparan
-        panel = pygame.Surface((w, h), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 170))
-        self.screen.blit(panel, (20, 20))
+        self.screen.blit(self._alpha_surface(rect.size, (0, 0, 0, 170)), rect.topleft)
 
-        y = 20 + pad
-        for surf in rendered:
-            self.screen.blit(surf, (20 + pad, y))
+        y = rect.y + self.HUD_PAD
+        for t in lines:
+            surf = self.assets.render_text("hud", t, (255, 255, 255))
+            self.screen.blit(surf, (rect.x + self.HUD_PAD, y))
             y += surf.get_height() + 2
 
+        return rect
+
+    def _hud_panel_rect(self, lines):
+        """Rect panel instruksi buat `lines` tanpa gambar apa-apa (teks diambil dari cache)."""
+        if not lines:
+            return None
+        w = h = 0
+        for t in lines:
+            surf = self.assets.render_text("hud", t, (255, 255, 255))
+            w = max(w, surf.get_width())
+            h += surf.get_height() + 2
+        return pygame.Rect(20, 20, w + self.HUD_PAD * 2, h + self.HUD_PAD * 2)
+
     def _draw_square_label(self, r, c, text: str, player_color="w"):
         """Label kecil di atas kotak (misal 'A' untuk split_target1)."""
-        font = self.assets.fonts.get("split") or self.assets.fonts.get("small") or self.assets.fonts["default"]
 
-        x_off = (Config.WIDTH - Config.BOARD_SIZE) // 2
-        y_off = (Config.HEIGHT - Config.BOARD_SIZE) // 2
-        draw_r = 7 - r if player_color == "b" else r
-        draw_c = 7 - c if player_color == "b" else c
-        x = x_off + draw_c * Config.SQUARE_SIZE
-        y = y_off + draw_r * Config.SQUARE_SIZE
+        x_off, y_off = self._board_offset()
+        rect = self._square_rect(r, c, x_off, y_off, player_color)
+        x, y = rect.topleft
 
-        surf = font.render(text, True, (0, 0, 0))
-        bg = pygame.Surface((surf.get_width() + 8, surf.get_height() + 4), pygame.SRCALPHA)
-        bg.fill((255, 255, 255, 200))
+        surf = self.assets.render_text("split", text, (0, 0, 0))
+        bg = self._alpha_surface((surf.get_width() + 8, surf.get_height() + 4), (255, 255, 255, 200))
         self.screen.blit(bg, (x + 6, y + 6))
         self.screen.blit(surf, (x + 10, y + 8))
 
-    def _draw_pieces(self, board_obj, x_off, y_off, player_color="w"):
-        font = self.assets.fonts.get("small") or self.assets.fonts["default"]
-
-        for r in range(8):
-            for c in range(8):
-                p = board_obj.get_piece(r, c)
-                if not p:
-                    continue
-
-                # Flip view buat black player
-                draw_r = 7 - r if player_color == "b" else r
-                draw_c = 7 - c if player_color == "b" else c
-
-                x = x_off + draw_c * Config.SQUARE_SIZE
-                y = y_off + draw_r * Config.SQUARE_SIZE
-
-                img = self.assets.sprites.get(p.code)
-                if img:
-                    self.screen.blit(img, (x, y))
-
-                # Tampilkan probabilitas kalo quantum
-                prob = getattr(p, "prob", 1.0)
-                if prob < 1.0:
-                    # prob_txt = font.render(f"{int(prob * 100)}%", True, (255, 255, 255))
-                    prob_txt = self.assets.fonts['split'].render("50%", True, Config.COLOR_QUANTUM_TEXT)
-                    self.screen.blit(prob_txt, (x + 5, y + 5))
-
     def _draw_rect(self, r, c, color, alpha=255, width=0, player_color="w"):
-        x_off = (Config.WIDTH - Config.BOARD_SIZE) // 2
-        y_off = (Config.HEIGHT - Config.BOARD_SIZE) // 2
+        x_off, y_off = self._board_offset()
 
         # Flip view buat black (samain dengan piece rendering)
-        draw_r = 7 - r if player_color == "b" else r
-        draw_c = 7 - c if player_color == "b" else c
-
-        x = x_off + draw_c * Config.SQUARE_SIZE
-        y = y_off + draw_r * Config.SQUARE_SIZE
-        rect = (x, y, Config.SQUARE_SIZE, Config.SQUARE_SIZE)
+        rect = self._square_rect(r, c, x_off, y_off, player_color)
 
         if alpha < 255:
-            s = pygame.Surface((Config.SQUARE_SIZE, Config.SQUARE_SIZE), pygame.SRCALPHA)
-            s.set_alpha(alpha)
-            s.fill(color)
-            self.screen.blit(s, (x, y))
+            tile = self._alpha_surface((Config.SQUARE_SIZE, Config.SQUARE_SIZE), (*color, alpha))
+            self.screen.blit(tile, rect.topleft)
         else:
             pygame.draw.rect(self.screen, color, rect, width)
 
+    def scrub_bar_rect(self):
+        """Area scrub bar replay (di bawah board): label + bar."""
+        x_off, y_off = self._board_offset()
+        return pygame.Rect(x_off - 6, y_off + Config.BOARD_SIZE + 20, Config.BOARD_SIZE + 12, 56)
+
+    def scrub_track_rect(self):
+        x_off, _ = self._board_offset()
+        area = self.scrub_bar_rect()
+        return pygame.Rect(x_off, area.bottom - 16, Config.BOARD_SIZE, 12)
+
+    def draw_scrub_bar(self, ply, total, keyframe_every, label):
+        """Scrub bar replay: posisi ply, tanda keyframe, dan label. Langsung di-update ke display."""
+        area = self.scrub_bar_rect()
+        self._restore(area)
+
+        text = self.assets.render_text("hud", label, (255, 255, 255))
+        track = self.scrub_track_rect()
+        self.screen.blit(self._alpha_surface((text.get_width() + 16, text.get_height() + 6), (0, 0, 0, 170)), (track.x, area.y))
+        self.screen.blit(text, (track.x + 8, area.y + 3))
+
+        pygame.draw.rect(self.screen, (40, 40, 40), track)
+        if total > 0:
+            for k in range(0, total + 1, max(1, keyframe_every)):
+                x = track.x + round(k * (track.width - 1) / total)
+                pygame.draw.line(self.screen, (90, 90, 90), (x, track.y), (x, track.bottom - 1))
+            filled = round(ply * track.width / total)
+            pygame.draw.rect(self.screen, Config.COLOR_QUANTUM_TEXT, (track.x, track.y, filled, track.height))
+            knob_x = track.x + round(ply * (track.width - 1) / total)
+            pygame.draw.rect(self.screen, Config.COLOR_WHITE, (knob_x - 3, track.y - 4, 7, track.height + 8))
+
+        pygame.display.update(area)
+        return area
+
     def _draw_move_log(self, log):
-        panel_width = 230  
-        panel_height = 150
-        x_start = Config.WIDTH - panel_width - 10  
-        y_start = 50
-
-        pygame.draw.rect(self.screen, (30, 30, 30), (x_start, y_start, panel_width, panel_height))
-        
-        log_font = pygame.font.SysFont(Config.FONT_MAIN, 14) 
-        
-        title = log_font.render("Log Move", True, (255, 255, 255))
+        """Gambar panel log (log = entry terakhir yang mau ditampilin). Return rect panel."""
+        rect = self._log_rect()
+        x_start, y_start = rect.topleft
+
+        pygame.draw.rect(self.screen, (30, 30, 30), rect)
+        # Clip biar teks panjang gak nyisa di luar panel waktu partial redraw
+        prev_clip = self.screen.get_clip()
+        self.screen.set_clip(rect)
+
+        title = self.assets.render_text("hud", "Log Move", (255, 255, 255))
         self.screen.blit(title, (x_start + 10, y_start + 5))
 
         # Isi log (last 6 move)
-        for i, txt in enumerate(log[-6:]): 
-            surf = log_font.render(str(txt), True, (200, 200, 200))            
-            self.screen.blit(surf, (x_start + 10, y_start + 25 + i * 20))
\ No newline at end of file
+        for i, txt in enumerate(log[-6:]):
+            surf = self.assets.render_text("hud", str(txt), (200, 200, 200))
+            self.screen.blit(surf, (x_start + 10, y_start + 25 + i * 20))
+
+        self.screen.set_clip(prev_clip)
+        return rect
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Repo gak di-install sebagai package: root repo masuk sys.path biar `quantum`, `qlc`, dst bisa di-import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,91 @@
+import random
+
+import chess
+import numpy as np
+
+from quantum.delta import DeltaBranchSet
+from quantum.packed import pack_boards
+
+
+def _boards(n, seed=0, plies=6, start=None):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        b = (start or chess.Board()).copy()
+        for _ in range(rng.randrange(plies + 1)):
+            moves = list(b.legal_moves)
+            if not moves:
+                break
+            b.push(rng.choice(moves))
+        out.append(b.copy(stack=False))
+    return out
+
+
+def _line(seed, plies):
+    """Posisi bersama yang jauh dari posisi awal (branch nanti cuma beda beberapa ply darinya)."""
+    rng = random.Random(seed)
+    b = chess.Board()
+    for _ in range(plies):
+        b.push(rng.choice(list(b.legal_moves)))
+    return b.copy(stack=False)
+
+
+def _amps(n, seed=0):
+    rng = random.Random(seed)
+    return [complex(rng.random(), rng.random()) for _ in range(n)]
+
+
+def test_take_matches_pack_boards():
+    boards, amps = _boards(40), _amps(40)
+    ds = DeltaBranchSet.from_boards(boards, amps, rebase_threshold=1e9)
+    expected = pack_boards(boards, amps)
+    idx = [5, 0, 39, 5, 17]
+    assert np.array_equal(ds.take(idx), expected[idx])
+    assert np.array_equal(np.concatenate(list(ds.chunks(7))), expected)
+    assert [b.fen() for b in map(ds.board, range(len(ds)))] == [b.fen() for b in boards]
+
+
+def test_rebase_keeps_branches_and_shrinks_diff():
+    far = _boards(30, seed=1, plies=2, start=_line(1, 24))
+    # Base dipilih dari posisi awal, lalu yang masuk belakangan jauh dari situ
+    ds = DeltaBranchSet.from_boards([chess.Board()], [1.0], rebase_threshold=1e9)
+    ds.extend(far, _amps(30, seed=1))
+    before = ds.take(np.arange(len(ds)))
+    diff_before = ds.mean_diff
+
+    ds.rebase()
+    assert ds.rebases == 1
+    assert ds.mean_diff < diff_before / 2
+    assert np.array_equal(ds.take(np.arange(len(ds))), before)
+    assert np.array_equal(ds.codes()[0] != ds.base, np.isin(np.arange(64), ds.diff_sq[ds.diff_ptr[0]:ds.diff_ptr[1]]))
+
+
+def test_append_rebases_past_threshold():
+    ds = DeltaBranchSet.from_boards([chess.Board()], [1.0], rebase_threshold=2.0)
+    far = _boards(20, seed=2, plies=2, start=_line(2, 24))
+    ds.extend(far, _amps(20, seed=2))
+    assert ds.rebases >= 1
+    assert [ds.board(i).fen() for i in range(1, len(ds))] == [b.fen() for b in far]
+
+
+def test_square_distribution_matches_boards():
+    boards, amps = _boards(25, seed=3), _amps(25, seed=3)
+    ds = DeltaBranchSet.from_boards(boards, amps)
+    probs = ds.probabilities()
+    for sq in (chess.E2, chess.E4, chess.G1, chess.F3, chess.D7):
+        expected = {}
+        for b, p in zip(boards, probs):
+            piece = b.piece_at(sq)
+            sym = piece.symbol() if piece else None
+            expected[sym] = expected.get(sym, 0.0) + float(p)
+        got = ds.square_distribution(sq)
+        assert got.keys() == {k for k, v in expected.items() if v > 0}
+        for sym, p in got.items():
+            assert np.isclose(p, expected[sym])
+
+
+def test_copy_shares_arrays_until_append():
+    ds = DeltaBranchSet.from_boards(_boards(5), _amps(5))
+    other = ds.copy()
+    other.extend(_boards(3, seed=4), _amps(3, seed=4))
+    assert len(ds) == 5 and len(other) == 8
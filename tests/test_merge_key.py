@@ -0,0 +1,70 @@
+import math
+
+import chess
+import pytest
+
+from quantum.delta import DeltaQuantumBoard
+from quantum.quantum_board import Branch, QuantumBoard
+from quantum.spill import SpillingQuantumBoard
+
+# Posisi sama, clock beda (mis. sampai lewat jalur yang beda)
+PLACEMENT = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -"
+CLOCKS = ((3, 10), (7, 12))
+
+BOARD_TYPES = {
+    "plain": QuantumBoard,
+    "spill": lambda **kw: SpillingQuantumBoard(ram_budget_bytes=0, chunk_size=1, **kw),
+    "delta": lambda **kw: DeltaQuantumBoard(chunk_size=1, **kw),
+}
+
+
+@pytest.fixture(params=sorted(BOARD_TYPES))
+def make_board(request):
+    boards = []
+
+    def make(merge_key):
+        qb = BOARD_TYPES[request.param](seed=0, merge_key=merge_key)
+        qb.branches = [
+            Branch(chess.Board(f"{PLACEMENT} {half} {full}"), complex(1 / math.sqrt(2)))
+            for half, full in CLOCKS
+        ]
+        boards.append(qb)
+        return qb
+
+    yield make
+    for qb in boards:
+        if hasattr(qb, "close"):
+            qb.close()
+
+
+def test_fen_key_keeps_clocks_apart(make_board):
+    qb = make_board("fen")
+    assert qb.apply_move(chess.G1, chess.F3)
+    branches = sorted(qb.iter_branches(), key=lambda br: br.board.halfmove_clock)
+    assert [(br.board.halfmove_clock, br.board.fullmove_number) for br in branches] == [(4, 10), (8, 12)]
+    assert sum(abs(br.amp) ** 2 for br in branches) == pytest.approx(1.0)
+
+
+def test_position_key_merges_and_reconciles_clocks(make_board):
+    qb = make_board("position")
+    assert qb.apply_move(chess.G1, chess.F3)
+    (br,) = list(qb.iter_branches())
+    # halfmove terkecil, fullmove terbesar
+    assert (br.board.halfmove_clock, br.board.fullmove_number) == (4, 12)
+    expected = chess.Board(f"{PLACEMENT} 0 1")
+    expected.push(chess.Move(chess.G1, chess.F3))
+    assert br.board.epd() == expected.epd()
+    assert abs(br.amp) ** 2 == pytest.approx(1.0)
+    assert qb.status.over is False
+
+
+def test_position_key_still_separates_different_positions(make_board):
+    qb = make_board("position")
+    assert qb.apply_split(chess.G1, chess.F3, chess.H3)
+    assert qb.branch_count() == 2
+    assert {br.board.halfmove_clock for br in qb.iter_branches()} == {4}
+
+
+def test_unknown_merge_key():
+    with pytest.raises(ValueError):
+        QuantumBoard(merge_key="zobrist")
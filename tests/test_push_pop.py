@@ -0,0 +1,133 @@
+import random
+
+import chess
+import pytest
+
+from quantum.delta import DeltaQuantumBoard
+from quantum.quantum_board import QuantumBoard
+from quantum.spill import SpillingQuantumBoard
+
+BOARD_TYPES = {
+    "plain": lambda seed: QuantumBoard(seed=seed, max_branches=4096),
+    # ram_budget 0 + chunk kecil: semua branch langsung ke segmen cold (file)
+    "spill": lambda seed: SpillingQuantumBoard(seed=seed, max_branches=4096, ram_budget_bytes=0, chunk_size=4),
+    "delta": lambda seed: DeltaQuantumBoard(seed=seed, max_branches=4096, chunk_size=4),
+}
+
+
+def _actions(seed, plies=14):
+    """Urutan action ber-seed (dipilih di QuantumBoard biasa); split kalau ada dua tujuan quiet."""
+    rng = random.Random(seed)
+    qb = QuantumBoard(seed=seed, max_branches=4096)
+    out = []
+    for _ in range(plies):
+        if qb.status.over:
+            break
+        b = rng.choice(list(qb.iter_branches())).board
+        mv = rng.choice(list(b.legal_moves))
+        quiet = [
+            m.to_square for m in b.legal_moves
+            if m.from_square == mv.from_square and m.to_square != mv.to_square
+            and not b.is_capture(m) and m.promotion is None
+        ]
+        if quiet and not b.is_capture(mv) and mv.promotion is None and rng.random() < 0.4:
+            action = ("split", mv.from_square, mv.to_square, rng.choice(quiet))
+        else:
+            action = ("move", mv.from_square, mv.to_square)
+        try:
+            qb.push(action)
+        except ValueError:
+            continue
+        out.append(action)
+    return out
+
+
+def _apply(qb, action):
+    if action[0] == "move":
+        qb.apply_move(action[1], action[2])
+    else:
+        qb.apply_split(action[1], action[2], action[3])
+
+
+def _snapshot(qb):
+    branches = sorted(
+        (br.board.fen(), round(br.amp.real, 12), round(br.amp.imag, 12)) for br in qb.iter_branches()
+    )
+    return branches, qb.version, qb.status, qb.rng.getstate()
+
+
+@pytest.fixture(params=sorted(BOARD_TYPES))
+def make_board(request):
+    boards = []
+
+    def make(seed):
+        qb = BOARD_TYPES[request.param](seed)
+        boards.append(qb)
+        return qb
+
+    yield make
+    for qb in boards:
+        if hasattr(qb, "close"):
+            qb.close()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_push_pop_restores_state(make_board, seed):
+    qb = make_board(seed)
+    stack = [_snapshot(qb)]
+    for action in _actions(seed):
+        qb.push(action)
+        stack.append(_snapshot(qb))
+    assert qb.ply_depth == len(stack) - 1
+    while qb.ply_depth:
+        qb.pop()
+        stack.pop()
+        assert _snapshot(qb) == stack[-1]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_push_matches_apply(make_board, seed):
+    qb, ref = make_board(seed), make_board(seed)
+    for action in _actions(seed):
+        qb.push(action)
+        _apply(ref, action)
+        assert _snapshot(qb)[0] == _snapshot(ref)[0]
+
+
+def test_push_pop_plain_board_stack():
+    """Board branch di-push di tempat lalu di-pop: move stack-nya balik persis."""
+    qb = QuantumBoard(seed=0)
+    qb.apply_split(chess.G1, chess.F3, chess.H3)
+    before = [(br.board.fen(), len(br.board.move_stack)) for br in qb.branches]
+    qb.push(("move", chess.E7, chess.E5))
+    qb.push(("split", chess.B8, chess.A6, chess.C6))
+    qb.pop()
+    qb.pop()
+    assert [(br.board.fen(), len(br.board.move_stack)) for br in qb.branches] == before
+
+
+def test_pop_after_failed_push():
+    qb = QuantumBoard(seed=0)
+    before = _snapshot(qb)
+    with pytest.raises(ValueError):
+        qb.push(("castle", chess.E1, chess.G1))
+    assert qb.ply_depth == 0
+    assert _snapshot(qb) == before
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("kind", ["spill", "delta"])
+def test_marginals_match_plain_board(kind, seed):
+    plain = BOARD_TYPES["plain"](seed)
+    other = BOARD_TYPES[kind](seed)
+    try:
+        for action in _actions(seed):
+            _apply(plain, action)
+            _apply(other, action)
+            assert other.branch_count() == plain.branch_count()
+            for a, b in zip(plain.marginals(), other.marginals()):
+                assert b.keys() == a.keys()
+                for sym, p in a.items():
+                    assert b[sym] == pytest.approx(p, abs=1e-12)
+    finally:
+        other.close()
@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+
+from qlc.board import Board
+from qlc.piece import Piece, QuantumPiece
+from qlc.registry import QuantumRegistry
+
+
+def _entangled_pair(reg):
+    """a: state A0 (pos 0) / A1 (pos 1); b: state B0 (pos 10) / B1 (pos 11); A0<->B1, A1<->B0."""
+    a, sa = reg.add_piece("wN", 0)
+    b, sb = reg.add_piece("bN", 10)
+    a0, a1 = reg.split(sa, [(0, 0.5), (1, 0.5)])
+    b0, b1 = reg.split(sb, [(10, 0.5), (11, 0.5)])
+    reg.entangle(a0, b1)
+    reg.entangle(a1, b0)
+    return a, b, (a0, a1), (b0, b1)
+
+
+def test_adjacency_is_csr_of_edges():
+    reg = QuantumRegistry(capacity=2)
+    _, _, (a0, a1), (b0, b1) = _entangled_pair(reg)
+    indptr, indices = reg.adjacency()
+    assert len(indptr) == reg.n_states + 1
+    for sid in range(reg.n_states):
+        assert sorted(indices[indptr[sid]:indptr[sid + 1]].tolist()) == sorted(reg.neighbors(sid).tolist())
+    assert reg.neighbors(a0).tolist() == [b1]
+    assert reg.neighbors(b0).tolist() == [a1]
+    # Edge baru: cache CSR dibuang
+    reg.entangle(a0, b0)
+    assert sorted(reg.neighbors(a0).tolist()) == sorted([b1, b0])
+
+
+def test_collapse_spreads_and_frees_losers():
+    reg = QuantumRegistry()
+    a, b, (a0, a1), (b0, b1) = _entangled_pair(reg)
+    assert reg.collapse([a1]) == {a: 1, b: 10}
+    assert reg.owned[a] == [a1] and reg.owned[b] == [b0]
+    assert not reg.state_alive[[a0, b1]].any()
+    assert reg.state_prob[a1] == reg.state_prob[b0] == 1.0
+    assert reg.n_edges == 2  # edge antar state yang kalah ikut dibuang
+
+
+def test_measure_is_consistent_with_entanglement():
+    for seed in range(20):
+        reg = QuantumRegistry()
+        a, b, _, _ = _entangled_pair(reg)
+        final = reg.measure(a, random.Random(seed))
+        assert (final[a], final[b]) in {(0, 11), (1, 10)}
+
+
+def test_compact_renumbers_states_and_views():
+    board = Board()
+    pieces = [board.quantum_piece((i // 8 % 8, i % 8), Piece("P", "w")) for i in range(200)]
+    pieces[0].entangle_oneblock(pieces[199], (5, 5))
+    before = {p.pid: p.qnum for p in pieces[:1] + pieces[150:]}
+
+    for p in pieces[1:150]:
+        p.release()
+    reg = board.registry
+    assert reg.n_states < 150  # compact jalan sendiri begitu state mati > state hidup
+    reg.compact()
+    assert reg.n_dead == 0
+    assert reg.n_states == int(reg.state_alive[:reg.n_states].sum())
+    assert sorted(int(s) for sids in reg.owned.values() for s in sids) == list(range(reg.n_states))
+    assert {p.pid: p.qnum for p in pieces[:1] + pieces[150:]} == before
+    assert [(other.pid, other_label, label) for other, other_label, label in pieces[0].ent] == [(199, "0", "01")]
+
+    indptr, _ = reg.adjacency()
+    assert len(indptr) == reg.n_states + 1
+    assert np.all(reg.state_owner[reg.edge_src[:reg.n_edges]] != reg.state_owner[reg.edge_dst[:reg.n_edges]])
+
+
+def test_boards_do_not_share_registry():
+    a, b = Board(), Board()
+    pa = a.quantum_piece((6, 0), Piece("P", "w"))
+    pb = b.quantum_piece((6, 0), Piece("P", "w"))
+    assert pa.registry is a.registry is not b.registry is pb.registry
+    assert pa.pid == pb.pid == 0
+    pa.entangle_oneblock(a.quantum_piece((1, 0), Piece("P", "b")), (5, 0))
+    assert pb.qnum == {"0": [(6, 0), 1.0]}
+    assert QuantumPiece((0, 0), Piece("K", "w")).registry is QuantumPiece.default_registry